@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { 
@@ -57,6 +57,8 @@ const TaskList = () => {
       if (dueDateFilter) params.append('due_date_before', dueDateFilter.toISOString());
       params.append('order_by', orderBy);
       params.append('order_direction', orderDirection);
+      // Apenas os campos exibidos na tabela
+      params.append('fields', 'id,title,description,due_date,priority,status');
       
       const response = await axios.get(`http://localhost:8000/tasks?${params.toString()}`);
       setTasks(response.data);
@@ -69,6 +71,38 @@ const TaskList = () => {
     }
   };
 
+  // Recarregar a lista quando o servidor avisar de alterações (em vez de polling)
+  const fetchTasksRef = useRef();
+  fetchTasksRef.current = fetchTasks;
+
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!token) return undefined;
+
+    let socket;
+    let retry;
+    let closed = false;
+    const connect = () => {
+      socket = new WebSocket(`ws://localhost:8000/tasks/live?token=${encodeURIComponent(token)}`);
+      socket.onmessage = (message) => {
+        const data = JSON.parse(message.data);
+        if (data.type === 'tasks_changed') {
+          fetchTasksRef.current();
+        }
+      };
+      socket.onclose = () => {
+        if (!closed) retry = setTimeout(connect, 5000);
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      socket.close();
+    };
+  }, []);
+
   const handleEdit = (id) => {
     navigate(`/tasks/edit/${id}`);
   };
@@ -224,6 +258,7 @@ const TaskList = () => {
                     <MenuItem value="priority">Prioridade</MenuItem>
                     <MenuItem value="created_at">Data de Criação</MenuItem>
                     <MenuItem value="status">Status</MenuItem>
+                    <MenuItem value="urgency">Urgência</MenuItem>
                   </Select>
                 </FormControl>
               </Grid>
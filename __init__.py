@@ -1,7 +1,6 @@
-from app.models import user, task
-from app.schemas import user, task, auth
-from app.routes import auth, tasks
-from app.utils import auth, deps
-from app.crud import user, task
-
 # Arquivo __init__.py para o pacote app
+#
+# Sem importações aqui: cada processo (workers do uvicorn, workers e beat do
+# Celery, comandos como `python -m app.migrations`) carrega apenas os módulos
+# de que precisa. Os modelos, rotas e utilitários são importados pelos
+# módulos que os usam.
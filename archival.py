@@ -0,0 +1,103 @@
+"""Arquivamento de tarefas concluídas.
+
+Tarefas concluídas há mais de ARCHIVE_AFTER_DAYS dias (pela última
+alteração) saem de `tasks` e vão para `tasks_archive`, a partição fria.
+A tabela principal e os seus índices ficam do tamanho do trabalho em
+andamento, e as listagens e o feed de alterações deixam de percorrer
+o histórico.
+
+O job `archive_completed_tasks` roda pelo Celery beat e move as tarefas em
+lotes de ARCHIVE_BATCH_SIZE, cada lote em uma transação curta:
+
+- incrementa a versão das tarefas dos usuários do lote (mesma ordem de
+  bloqueio das escritas da API: users, depois tasks), o que invalida ETags
+  e o cache de listagens;
+- remove as linhas de `tasks` com DELETE ... RETURNING, conferindo de novo
+  a condição (uma tarefa reaberta entre a seleção e a remoção fica);
+- grava as linhas retornadas em `tasks_archive` e um TaskTombstone para
+  cada uma; no feed de alterações, a tarefa arquivada aparece como excluída.
+
+O resumo de estatísticas (task_stats) não muda: tarefas arquivadas
+continuam contando. Elas podem ser listadas com GET /tasks?include_archived=true
+e são somente leitura.
+"""
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, func, and_
+
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.task import Task, ArchivedTask, TaskTombstone, StatusEnum
+from app.crud.task_versions import bump_tasks_version
+from app.events import record_task_changes
+
+logger = logging.getLogger(__name__)
+
+# Configuração do arquivamento
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+# Colunas copiadas de tasks para tasks_archive
+ARCHIVED_COLUMNS = [column.name for column in ArchivedTask.__table__.columns if column.name != "archived_at"]
+
+def _archivable(cutoff):
+    """Tarefas concluídas sem alterações desde `cutoff`."""
+    return and_(
+        Task.status == StatusEnum.concluida,
+        func.coalesce(Task.updated_at, Task.created_at) < cutoff,
+    )
+
+def archive_batch(db, cutoff, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move um lote de tarefas arquiváveis; retorna quantas foram movidas."""
+    candidates = db.execute(
+        select(Task.id, Task.user_id).where(_archivable(cutoff)).order_by(Task.id).limit(batch_size)
+    ).all()
+    if not candidates:
+        return 0
+
+    versions = bump_tasks_version(db.connection(), {row.user_id for row in candidates})
+    rows = db.execute(
+        delete(Task)
+        .where(Task.id.in_([row.id for row in candidates]), _archivable(cutoff))
+        .returning(*(Task.__table__.c[name] for name in ARCHIVED_COLUMNS))
+        .execution_options(synchronize_session=False)
+    ).mappings().all()
+    if not rows:
+        db.rollback()
+        return 0
+
+    archived_at = datetime.now(timezone.utc)
+    db.execute(insert(ArchivedTask), [dict(row, archived_at=archived_at) for row in rows])
+    db.execute(insert(TaskTombstone), [
+        {"task_id": row["id"], "user_id": row["user_id"], "version": versions[row["user_id"]]} for row in rows
+    ])
+    by_user = {}
+    for row in rows:
+        by_user.setdefault(row["user_id"], []).append(row["id"])
+    for user_id, ids in by_user.items():
+        record_task_changes(db, user_id, versions[user_id], deleted=ids)
+    db.commit()
+    return len(rows)
+
+@celery_app.task(name="app.archival.archive_completed_tasks")
+def archive_completed_tasks(after_days: Optional[int] = None, max_batches: Optional[int] = None):
+    """Arquiva as tarefas concluídas há mais de `after_days` dias, em lotes.
+
+    Retorna o número de tarefas movidas para tasks_archive.
+    """
+    days = ARCHIVE_AFTER_DAYS if after_days is None else after_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with SessionLocal() as db:
+            moved = archive_batch(db, cutoff)
+        if not moved:
+            break
+        archived += moved
+        batches += 1
+    logger.info("Arquivamento: %s tarefas movidas em %s lotes", archived, batches)
+    return archived
@@ -0,0 +1,198 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+
+from app.database import get_async_db
+from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.crud import task_async
+from app.crud.pagination import InvalidCursorError
+from app.crud.task_search import search_tasks
+from app.crud.task_versions import get_tasks_version_async
+from app.utils.http_cache import make_etag, list_scope, cache_headers, is_not_modified
+from app.utils.fast_json import FastJSONResponse, parse_fields, task_columns, task_rows, task_objects
+from app.utils.task_cache import task_list_cache
+from app.utils.deps import get_current_user_async, get_read_db_async
+from app.models.user import User
+
+# Rotas de tarefas do modo assíncrono (DB_ASYNC_MODE=true). Incluídas antes
+# de routes/tasks.py, substituem as rotas síncronas de mesmo caminho.
+router = APIRouter(prefix="/tasks", tags=["tarefas"])
+
+@router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_task_endpoint(
+    task: TaskCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Cria uma nova tarefa para o usuário autenticado."""
+    return await task_async.create_task(db=db, task=task, user_id=current_user.id)
+
+@router.get("/", response_model=List[TaskResponse])
+async def read_tasks(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_date_before: Optional[datetime] = None,
+    order_by: str = "created_at",
+    order_direction: str = "desc",
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db_async),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Retorna todas as tarefas do usuário com filtros opcionais."""
+    if include_archived and skip:
+        raise HTTPException(status_code=400, detail="include_archived não é suportado com skip; use cursor")
+    try:
+        selected = parse_fields(fields)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    version, modified_at = await get_tasks_version_async(db, current_user.id)
+    etag = make_etag(current_user.id, version, list_scope(request))
+    headers = cache_headers(etag, modified_at)
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    params = {
+        "skip": skip, "limit": limit, "cursor": cursor, "status": status, "priority": priority,
+        "due_date_before": due_date_before, "order_by": order_by, "order_direction": order_direction,
+        "include_archived": include_archived or None, "fields": ",".join(selected) if fields else None,
+    }
+    cached = await task_list_cache.get_async(current_user.id, version, params)
+    if cached is not None:
+        body, next_cursor = cached
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(body, media_type="application/json", headers=headers)
+
+    if cursor or not skip:
+        try:
+            rows, next_cursor = await task_async.get_tasks_page(
+                db=db,
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit,
+                status=status,
+                priority=priority,
+                due_date_before=due_date_before,
+                order_by=order_by,
+                order_direction=order_direction,
+                columns=task_columns(selected),
+                include_archived=include_archived
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        # Caminho rápido: colunas como tuplas, sem validação pelo response_model
+        page = FastJSONResponse(task_rows(rows, selected), headers=headers)
+        await task_list_cache.set_async(current_user.id, version, params, page.body, next_cursor)
+        return page
+
+    tasks = await task_async.get_tasks(
+        db=db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        status=status,
+        priority=priority,
+        due_date_before=due_date_before,
+        order_by=order_by,
+        order_direction=order_direction
+    )
+    if not task_list_cache.enabled and not fields:
+        return tasks
+    page = FastJSONResponse(task_objects(tasks, selected), headers=headers)
+    await task_list_cache.set_async(current_user.id, version, params, page.body)
+    return page
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks_endpoint(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_date_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Busca tarefas do usuário por título e descrição, ordenadas por relevância."""
+    try:
+        tasks, next_cursor = await db.run_sync(
+            search_tasks,
+            user_id=current_user.id,
+            q=q,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            priority=priority,
+            due_date_before=due_date_before
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def read_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db_async),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Retorna uma tarefa específica do usuário."""
+    version, modified_at = await get_tasks_version_async(db, current_user.id)
+    etag = make_etag(current_user.id, version, f"task/{task_id}")
+    headers = cache_headers(etag, modified_at)
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    task = await task_async.get_task(db=db, task_id=task_id, user_id=current_user.id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada"
+        )
+    return task
+
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task_endpoint(
+    task_id: int,
+    task_update: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Atualiza uma tarefa específica do usuário."""
+    task = await task_async.update_task(db=db, task_id=task_id, user_id=current_user.id, task_update=task_update)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada"
+        )
+    return task
+
+@router.delete("/{task_id}", response_model=TaskResponse)
+async def delete_task_endpoint(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Exclui uma tarefa específica do usuário."""
+    task = await task_async.delete_task(db=db, task_id=task_id, user_id=current_user.id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada"
+        )
+    return task
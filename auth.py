@@ -3,11 +3,16 @@ from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from pydantic import BaseModel
+import os
+
+from app.utils.password_pool import password_pool
 
 # Configuração de segurança
 SECRET_KEY = "sua_chave_secreta_muito_segura_e_longa"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Custo do bcrypt (2^rounds iterações)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 # Modelo para token
 class Token(BaseModel):
@@ -18,15 +23,32 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 # Contexto de criptografia para senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# Executadas nos processos do pool de senhas
+def _verify(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _hash(password):
+    return pwd_context.hash(password)
 
+# O bcrypt consome CPU: as operações rodam no pool de processos, fora da
+# thread da requisição. Com o pool saturado, PoolSaturatedError é lançada.
 def verify_password(plain_password, hashed_password):
     """Verifica se a senha em texto plano corresponde à senha hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.run(_verify, plain_password, hashed_password)
 
 def get_password_hash(password):
     """Gera um hash da senha."""
-    return pwd_context.hash(password)
+    return password_pool.run(_hash, password)
+
+async def verify_password_async(plain_password, hashed_password):
+    """Variante assíncrona de verify_password."""
+    return await password_pool.run_async(_verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """Variante assíncrona de get_password_hash."""
+    return await password_pool.run_async(_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Cria um token JWT com os dados fornecidos."""
@@ -0,0 +1,194 @@
+"""Benchmark do arquivamento: consultas do caminho quente e tamanho dos índices.
+
+Popula um banco descartável com usuários cujas tarefas são, em grande
+parte, concluídas há muito tempo, e mede antes e depois de rodar o job de
+arquivamento (app.archival):
+
+- latência p50/p95 das consultas de listagem por keyset mais comuns (primeira
+  página, filtro por status e ordenação por prazo);
+- tamanho da tabela `tasks` e dos seus índices (dbstat no SQLite,
+  pg_relation_size no PostgreSQL).
+
+Depois do arquivamento, mede também a listagem com include_archived=true.
+Com --compact (padrão), o banco é compactado antes da segunda medição
+(VACUUM no SQLite, VACUUM FULL em tasks no PostgreSQL), para que o espaço
+liberado apareça no tamanho dos índices.
+
+Uso:
+    python -m app.bench_archival --users 50 --tasks-per-user 2000 --completed-ratio 0.8
+    python -m app.bench_archival --database postgres --postgres-url postgresql://postgres@localhost/postgres
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.bench_async import percentile
+from app.bench_suite import temporary_database, git_commit
+
+QUERIES = {
+    "first_page": {},
+    "status_pendente": {"status": "pendente"},
+    "due_date_asc": {"order_by": "due_date", "order_direction": "asc"},
+}
+
+def seed(users, tasks_per_user, completed_ratio, old_days):
+    """Cria usuários e tarefas com inserções em lote; retorna os ids dos usuários."""
+    from sqlalchemy import insert, update
+    from app.database import SessionLocal
+    from app.models.task import Task, PriorityEnum, StatusEnum, urgency_rank_expression
+    from app.models.user import User
+
+    now = datetime.now(timezone.utc)
+    open_statuses = [StatusEnum.pendente, StatusEnum.em_andamento]
+    user_ids = []
+    with SessionLocal() as db:
+        for u in range(users):
+            user = User(name=f"Usuário {u}", email=f"archival_{u}@example.com", hashed_password="-")
+            db.add(user)
+            db.flush()
+            user_ids.append(user.id)
+            rows = []
+            for i in range(tasks_per_user):
+                completed = random.random() < completed_ratio
+                created_at = now - timedelta(days=random.randint(old_days, old_days * 3) if completed else random.randint(0, 30))
+                rows.append({
+                    "title": f"Tarefa {i} do usuário {u}",
+                    "description": "Tarefa criada pelo benchmark de arquivamento",
+                    "due_date": created_at + timedelta(days=random.randint(1, 30)),
+                    "priority": random.choice(list(PriorityEnum)),
+                    "status": StatusEnum.concluida if completed else random.choice(open_statuses),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "user_id": user.id,
+                })
+            db.execute(insert(Task), rows)
+        db.execute(update(Task).values(urgency_rank=urgency_rank_expression(Task.status, Task.priority, Task.due_date)))
+        db.commit()
+    return user_ids
+
+def table_sizes(engine):
+    """Tamanho em bytes de `tasks` e de cada um dos seus índices."""
+    from sqlalchemy import inspect, text
+
+    names = ["tasks"] + [index["name"] for index in inspect(engine).get_indexes("tasks")]
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            sizes = {name: connection.scalar(text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": name})
+                     for name in names}
+        else:
+            rows = connection.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all()
+            sizes = {name: size for name, size in rows if name in names}
+    index_bytes = sum(size for name, size in sizes.items() if name != "tasks")
+    return {"table_bytes": sizes.get("tasks", 0), "index_bytes": index_bytes, "indexes": sizes}
+
+def measure_queries(user_ids, runs, include_archived=False):
+    """Latência de cada consulta de listagem para usuários sorteados."""
+    from app.database import SessionLocal
+    from app.crud.pagination import build_tasks_page_query
+    from app.utils.fast_json import TASK_COLUMNS
+
+    results = {}
+    with SessionLocal() as db:
+        for name, params in QUERIES.items():
+            latencies = []
+            for _ in range(runs):
+                stmt, _, _ = build_tasks_page_query(
+                    random.choice(user_ids), limit=20, columns=TASK_COLUMNS,
+                    include_archived=include_archived, **params
+                )
+                start = time.perf_counter()
+                db.execute(stmt).all()
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            results[name] = {
+                "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            }
+    return results
+
+def compact(engine):
+    from sqlalchemy import text
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(text("VACUUM FULL ANALYZE tasks"))
+            connection.execute(text("ANALYZE tasks_archive"))
+        else:
+            connection.execute(text("VACUUM"))
+            connection.execute(text("ANALYZE"))
+
+def snapshot(engine, user_ids, runs):
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        hot_rows = connection.scalar(text("SELECT COUNT(*) FROM tasks"))
+    return {
+        "hot_rows": hot_rows,
+        "sizes": table_sizes(engine),
+        "queries": measure_queries(user_ids, runs),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--postgres-url", default="postgresql://postgres@localhost/postgres",
+                        help="Conexão administrativa usada para criar o banco temporário")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks-per-user", type=int, default=2000)
+    parser.add_argument("--completed-ratio", type=float, default=0.8, help="Fração de tarefas concluídas antigas")
+    parser.add_argument("--after-days", type=int, default=90, help="Idade mínima para arquivar (ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--runs", type=int, default=200, help="Execuções de cada consulta por medição")
+    parser.add_argument("--no-compact", dest="compact", action="store_false",
+                        help="Não compacta o banco antes das medições")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--output", help="Arquivo onde gravar o JSON (além da saída padrão)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with temporary_database(args.database, args.postgres_url) as database_url:
+        # A configuração é lida na importação da aplicação
+        os.environ["DATABASE_URL"] = database_url
+
+        from app import migrations
+        from app.database import engine
+        from app.archival import archive_completed_tasks
+
+        migrations.upgrade(bind=engine)
+        user_ids = seed(args.users, args.tasks_per_user, args.completed_ratio, args.after_days + 1)
+        if args.compact:
+            compact(engine)
+        before = snapshot(engine, user_ids, args.runs)
+
+        start = time.perf_counter()
+        archived = archive_completed_tasks(after_days=args.after_days)
+        archive_seconds = time.perf_counter() - start
+        if args.compact:
+            compact(engine)
+        after = snapshot(engine, user_ids, args.runs)
+        after["queries_include_archived"] = measure_queries(user_ids, args.runs, include_archived=True)
+
+        results = {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": args.database,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "completed_ratio": args.completed_ratio,
+            "archived": archived,
+            "archive_seconds": round(archive_seconds, 3),
+            "before": before,
+            "after": after,
+        }
+        engine.dispose()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark das rotas em lote contra o caminho tarefa a tarefa.
+
+Cria, altera o status e exclui N tarefas primeiro com uma requisição por
+tarefa e depois com as rotas /tasks/bulk, reportando tempo e tarefas/s.
+
+Uso:
+    python -m app.bench_bulk --tasks 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from app.bench_async import start_server
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def login(client):
+    user = {"name": "Bench", "email": f"bench_{uuid.uuid4().hex}@example.com", "password": "senha123"}
+    client.post("/register", json=user)
+    response = client.post("/login", data={"username": user["email"], "password": user["password"]})
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+def new_task(i):
+    return {"title": f"Tarefa {i}", "description": "Importada", "priority": "media", "status": "pendente"}
+
+def per_item(client, n):
+    ids = []
+    create = timed(lambda: ids.extend(client.post("/tasks/", json=new_task(i)).json()["id"] for i in range(n)))
+    status = timed(lambda: [client.put(f"/tasks/{task_id}", json={"status": "concluida"}) for task_id in ids])
+    remove = timed(lambda: [client.delete(f"/tasks/{task_id}") for task_id in ids])
+    return {"create_s": create, "status_s": status, "delete_s": remove}
+
+def bulk(client, n):
+    ids = []
+    create = timed(lambda: ids.extend(
+        result["id"] for result in client.post("/tasks/bulk", json={"tasks": [new_task(i) for i in range(n)]}).json()["results"]
+    ))
+    status = timed(lambda: client.post("/tasks/bulk/status", json={"ids": ids, "status": "concluida"}))
+    remove = timed(lambda: client.post("/tasks/bulk/delete", json={"ids": ids}))
+    return {"create_s": create, "status_s": status, "delete_s": remove}
+
+def summarize(timings, n):
+    return {
+        name: {"seconds": round(seconds, 4), "tasks_per_second": round(n / seconds, 1)}
+        for name, seconds in timings.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench_bulk.db")
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    subprocess.run(
+        [sys.executable, "-m", "app.migrations", "upgrade"],
+        env=dict(os.environ, DATABASE_URL=args.database_url),
+        check=True,
+    )
+    process, base_url = start_server(args.database_url, False, args.port)
+    try:
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            login(client)
+            results = {
+                "per_item": summarize(per_item(client, args.tasks), args.tasks),
+                "bulk": summarize(bulk(client, args.tasks), args.tasks),
+            }
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
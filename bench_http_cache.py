@@ -0,0 +1,73 @@
+"""Benchmark de requisições condicionais (ETag / If-None-Match).
+
+Simula um cliente que consulta GET /tasks repetidamente sem que as tarefas
+mudem, primeiro sem e depois com If-None-Match, reportando latência e bytes
+transferidos por requisição.
+
+Uso:
+    python -m app.bench_http_cache --tasks 200 --polls 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.bench_async import start_server, percentile
+from app.bench_bulk import login, new_task
+
+def poll(client, polls, conditional):
+    latencies = []
+    transferred = 0
+    not_modified = 0
+    etag = None
+    for _ in range(polls):
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        start = time.perf_counter()
+        response = client.get("/tasks/", params={"limit": 100}, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        transferred += len(response.content)
+        not_modified += response.status_code == 304
+        etag = response.headers.get("ETag", etag)
+    latencies.sort()
+    return {
+        "requests": polls,
+        "not_modified": not_modified,
+        "bytes_per_request": round(transferred / polls, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench_http_cache.db")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    subprocess.run(
+        [sys.executable, "-m", "app.migrations", "upgrade"],
+        env=dict(os.environ, DATABASE_URL=args.database_url),
+        check=True,
+    )
+    process, base_url = start_server(args.database_url, False, args.port)
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            login(client)
+            client.post("/tasks/bulk", json={"tasks": [new_task(i) for i in range(args.tasks)]})
+            results = {
+                "unconditional": poll(client, args.polls, conditional=False),
+                "if_none_match": poll(client, args.polls, conditional=True),
+            }
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark das conexões em tempo real (WebSocket /tasks/live).
+
+Abre N conexões de um mesmo usuário (como N abas abertas), cria M tarefas e
+mede quantos eventos o servidor entrega por segundo e a latência entre o
+início da requisição que altera a tarefa e a chegada do evento em cada
+conexão. Com --event-bus redis, o servidor usa o backend Redis.
+
+Uso:
+    python -m app.bench_live --connections 500 --events 200
+    python -m app.bench_live --connections 500 --events 200 --event-bus redis
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+import websockets
+
+from app.bench_async import start_server, percentile
+
+async def login(client):
+    user = {"name": "Bench", "email": f"bench_{uuid.uuid4().hex}@example.com", "password": "senha123"}
+    await client.post("/register", json=user)
+    response = await client.post("/login", data={"username": user["email"], "password": user["password"]})
+    token = response.json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    return token
+
+async def receive_events(socket, expected, sent_at, latencies, timeout):
+    received = 0
+    try:
+        while received < expected:
+            message = json.loads(await asyncio.wait_for(socket.recv(), timeout))
+            if message["type"] != "tasks_changed":
+                continue
+            latencies.append((time.perf_counter() - sent_at[received]) * 1000)
+            received += 1
+    except asyncio.TimeoutError:
+        pass
+    return received
+
+# Token dos endpoints internos do servidor do benchmark (GET /internal/events)
+INTERNAL_TOKEN = uuid.uuid4().hex
+
+async def run(base_url, connections, events, timeout):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        token = await login(client)
+        ws_url = base_url.replace("http", "ws", 1) + f"/tasks/live?token={token}"
+
+        start = time.perf_counter()
+        sockets = await asyncio.gather(*(websockets.connect(ws_url, max_queue=None) for _ in range(connections)))
+        for socket in sockets:
+            await socket.recv()  # hello
+        connect_seconds = time.perf_counter() - start
+
+        sent_at = []
+        latencies = []
+        readers = [
+            asyncio.create_task(receive_events(socket, events, sent_at, latencies, timeout))
+            for socket in sockets
+        ]
+        start = time.perf_counter()
+        for i in range(events):
+            sent_at.append(time.perf_counter())
+            await client.post("/tasks/", json={"title": f"Tarefa {i}", "priority": "media", "status": "pendente"})
+        received = sum(await asyncio.gather(*readers))
+        elapsed = time.perf_counter() - start
+
+        stats = (await client.get("/internal/events", headers={"Authorization": f"Bearer {INTERNAL_TOKEN}"})).json()
+        await asyncio.gather(*(socket.close() for socket in sockets))
+
+    return {
+        "connections": connections,
+        "connect_seconds": round(connect_seconds, 3),
+        "events_sent": events,
+        "events_delivered": received,
+        "events_expected": events * connections,
+        "deliveries_per_second": round(received / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "server": stats,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench_live.db")
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--event-bus", choices=["memory", "redis"], default="memory")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8769)
+    args = parser.parse_args()
+
+    subprocess.run(
+        [sys.executable, "-m", "app.migrations", "upgrade"],
+        env=dict(os.environ, DATABASE_URL=args.database_url),
+        check=True,
+    )
+    process, base_url = start_server(args.database_url, False, args.port, {"EVENT_BUS": args.event_bus, "INTERNAL_TOKEN": INTERNAL_TOKEN})
+    try:
+        results = asyncio.run(run(base_url, args.connections, args.events, args.timeout))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
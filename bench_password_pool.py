@@ -0,0 +1,110 @@
+"""Benchmark do hashing de senhas: vazão de login e latência de /tasks em paralelo.
+
+Para cada tamanho de pool, sobe um servidor, dispara logins concorrentes
+(bcrypt) e, ao mesmo tempo, requisições GET /tasks de outro usuário. Mostra
+logins por segundo, recusas (503) e a latência p50/p99 de /tasks.
+PASSWORD_POOL_SIZE=0 executa o bcrypt na própria thread da requisição.
+
+Uso:
+    python -m app.bench_password_pool --pool-sizes 0,2,4,8 --logins 400 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from app.bench_async import start_server, percentile
+
+async def create_user(client):
+    user = {"name": "Bench", "email": f"bench_{uuid.uuid4().hex}@example.com", "password": "senha123"}
+    for _ in range(50):
+        response = await client.post("/register", json=user)
+        if response.status_code != 503:
+            return user
+        await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+    raise RuntimeError("Não foi possível registrar o usuário de teste")
+
+async def login(client, user):
+    return await client.post("/login", data={"username": user["email"], "password": user["password"]})
+
+async def run(base_url, logins, concurrency):
+    limits = httpx.Limits(max_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        login_user = await create_user(client)
+        tasks_user = await create_user(client)
+        response = await login(client, tasks_user)
+        while response.status_code == 503:
+            await asyncio.sleep(1)
+            response = await login(client, tasks_user)
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        results = {"ok": 0, "rejected": 0}
+        remaining = [logins]
+        task_latencies = []
+        done = asyncio.Event()
+
+        async def login_worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                response = await login(client, login_user)
+                results["ok" if response.status_code == 200 else "rejected"] += 1
+
+        async def tasks_poller():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/tasks/?limit=20", headers=headers)
+                task_latencies.append(time.perf_counter() - start)
+
+        pollers = [asyncio.create_task(tasks_poller()) for _ in range(4)]
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*pollers)
+
+    return {
+        "logins_ok": results["ok"],
+        "logins_rejected": results["rejected"],
+        "logins_per_second": round(results["ok"] / elapsed, 1),
+        "tasks_p50_ms": round(percentile(task_latencies, 50) * 1000, 2),
+        "tasks_p99_ms": round(percentile(task_latencies, 99) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench_password_pool.db")
+    parser.add_argument("--pool-sizes", default=f"0,{os.cpu_count() or 1}")
+    parser.add_argument("--queue-limit", type=int, default=None, help="Padrão: 4x o tamanho do pool")
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    subprocess.run(
+        [sys.executable, "-m", "app.migrations", "upgrade"],
+        env=dict(os.environ, DATABASE_URL=args.database_url),
+        check=True,
+    )
+
+    results = {}
+    for size in (int(value) for value in args.pool_sizes.split(",")):
+        extra_env = {"PASSWORD_POOL_SIZE": str(size)}
+        if args.queue_limit is not None:
+            extra_env["PASSWORD_POOL_QUEUE_LIMIT"] = str(args.queue_limit)
+        process, base_url = start_server(args.database_url, False, args.port, extra_env)
+        try:
+            results[f"pool_size={size}"] = asyncio.run(run(base_url, args.logins, args.concurrency))
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
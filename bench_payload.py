@@ -0,0 +1,158 @@
+"""Benchmark do tamanho e da latência das páginas de GET /tasks.
+
+Sobe a API no próprio processo (transporte ASGI do httpx) contra um banco
+descartável com um usuário e tarefas de descrições de tamanhos variados, e
+mede, para páginas de 100 e 1000 tarefas:
+
+- bytes transferidos, com e sem `fields=` e para cada codificação
+  (identity, gzip e, com o pacote `brotli`, br);
+- latência p50/p95 no servidor (consulta, serialização e compressão);
+- latência de ponta a ponta estimada para um cliente com a banda e o RTT
+  informados: latência no servidor + RTT + bytes / banda.
+
+Uso:
+    python -m app.bench_payload --rows 100,1000 --iterations 50
+    python -m app.bench_payload --bandwidth-mbps 5 --rtt-ms 120 --output payload.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.bench_async import percentile
+from app.bench_suite import temporary_database, git_commit
+
+FIELD_SETS = {
+    "all": None,
+    # Campos exibidos pela tabela do TaskList.js
+    "table": "id,title,description,due_date,priority,status",
+    "compact": "id,title,status,due_date",
+}
+WORDS = (
+    "revisar relatório cliente reunião prazo entrega orçamento equipe projeto "
+    "documentação contrato ajuste validação planilha apresentação pendência"
+).split()
+
+def seed(rows):
+    """Cria um usuário com `rows` tarefas; retorna o token de acesso."""
+    from app.database import SessionLocal
+    from app.models.task import Task, PriorityEnum, StatusEnum
+    from app.models.user import User
+    from app.utils.auth import create_access_token
+
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        user = User(name="Bench", email="payload@example.com", hashed_password="-")
+        db.add(user)
+        db.flush()
+        db.add_all([
+            Task(
+                title=f"Tarefa {i}: {' '.join(random.choices(WORDS, k=4))}",
+                # Descrições de tamanho variado, de vazias a alguns parágrafos
+                description=" ".join(random.choices(WORDS, k=random.choice([0, 10, 40, 150]))) or None,
+                due_date=now + timedelta(days=random.randint(-10, 30)),
+                priority=random.choice(list(PriorityEnum)),
+                status=random.choice(list(StatusEnum)),
+                user_id=user.id,
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+        return create_access_token(data={"sub": user.email})
+
+async def measure(client, token, rows, fields, encoding, iterations):
+    params = {"limit": rows}
+    if fields:
+        params["fields"] = fields
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": encoding}
+    latencies = []
+    transferred = body_size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.get("/tasks/", params=params, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        transferred = response.num_bytes_downloaded
+        body_size = len(response.content)
+    latencies.sort()
+    return {
+        "rows": len(response.json()),
+        "bytes": transferred,
+        "uncompressed_bytes": body_size,
+        "content_encoding": response.headers.get("content-encoding", "identity"),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+def end_to_end_ms(result, bandwidth_mbps, rtt_ms):
+    transfer_ms = result["bytes"] * 8 / (bandwidth_mbps * 1_000_000) * 1000
+    return round(result["p50_ms"] + rtt_ms + transfer_ms, 2)
+
+async def run(token, row_counts, encodings, iterations, bandwidth_mbps, rtt_ms):
+    import httpx
+    from app.main import app
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for rows in row_counts:
+                for name, fields in FIELD_SETS.items():
+                    for encoding in encodings:
+                        # Primeira requisição fora da medição (aquecimento)
+                        await measure(client, token, rows, fields, encoding, 1)
+                        result = await measure(client, token, rows, fields, encoding, iterations)
+                        result.update(page=rows, fields=name, accept_encoding=encoding)
+                        result["end_to_end_ms"] = end_to_end_ms(result, bandwidth_mbps, rtt_ms)
+                        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--postgres-url", default="postgresql://postgres@localhost/postgres",
+                        help="Conexão administrativa usada para criar o banco temporário")
+    parser.add_argument("--rows", default="100,1000", help="Tamanhos de página separados por vírgula")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0, help="Banda do cliente para a estimativa")
+    parser.add_argument("--rtt-ms", type=float, default=50.0, help="RTT do cliente para a estimativa")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--output", help="Arquivo onde gravar o JSON (além da saída padrão)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    row_counts = [int(rows) for rows in args.rows.split(",")]
+    with temporary_database(args.database, args.postgres_url) as database_url:
+        # A configuração é lida na importação da aplicação
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["TASK_CACHE"] = "off"
+        os.environ["COMPRESSION"] = "true"
+
+        from app import migrations
+        from app.database import engine
+        from app.utils.compression import brotli
+
+        migrations.upgrade(bind=engine)
+        token = seed(max(row_counts))
+        encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+        results = {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": args.database,
+            "bandwidth_mbps": args.bandwidth_mbps,
+            "rtt_ms": args.rtt_ms,
+            "pages": asyncio.run(run(token, row_counts, encodings, args.iterations, args.bandwidth_mbps, args.rtt_ms)),
+        }
+        engine.dispose()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compara os planos das consultas de listagem/filtro de tarefas antes e depois
+dos índices compostos da migração 0002.
+
+Por padrão usa um banco temporário (SQLite, ou PostgreSQL com --database
+postgres), removido ao final. O banco é migrado até a última revisão; para a
+medição "antes", só os índices da 0002 são removidos, e eles são recriados
+ao final, mesmo em caso de erro. As demais migrações e os dados não são
+tocados, mas o script insere dados de teste: com --database-url, use um
+banco descartável.
+
+Uso:
+    python -m app.bench_query_plans --users 20 --tasks-per-user 5000
+    python -m app.bench_query_plans --database postgres --postgres-url postgresql://postgres@localhost/postgres
+"""
+import argparse
+import os
+import random
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.bench_suite import temporary_database
+
+# Consultas representativas de GET /tasks e da busca de prazos próximos
+QUERIES = {
+    "listar por created_at": """
+        SELECT * FROM tasks WHERE user_id = :user_id
+        ORDER BY created_at DESC, id DESC LIMIT 100
+    """,
+    "filtrar status + ordenar por due_date": """
+        SELECT * FROM tasks WHERE user_id = :user_id AND status = 'pendente'
+        ORDER BY due_date ASC LIMIT 100
+    """,
+    "filtrar status + due_date_before": """
+        SELECT * FROM tasks WHERE user_id = :user_id AND status = 'em_andamento'
+        AND due_date <= :due_date_before ORDER BY due_date LIMIT 100
+    """,
+    "tarefas em aberto com prazo": """
+        SELECT * FROM tasks WHERE user_id = :user_id AND status <> 'concluida'
+        AND due_date IS NOT NULL AND due_date <= :due_date_before ORDER BY due_date
+    """,
+}
+
+def seed(connection, users, tasks_per_user):
+    """Insere usuários e tarefas aleatórias."""
+    now = datetime.now(timezone.utc)
+    for u in range(users):
+        user_id = connection.execute(
+            text("INSERT INTO users (name, email, hashed_password) VALUES (:name, :email, 'x') RETURNING id"),
+            {"name": f"Bench {u}", "email": f"bench{u}_{time.time_ns()}@example.com"},
+        ).scalar_one()
+        rows = [
+            {
+                "title": f"Tarefa {i}",
+                "description": "Tarefa gerada para benchmark",
+                "due_date": now + timedelta(hours=random.randint(-24 * 30, 24 * 30)) if random.random() < 0.8 else None,
+                "priority": random.choice(["baixa", "media", "alta"]),
+                "status": random.choice(["pendente", "em_andamento", "concluida", "concluida"]),
+                "created_at": now - timedelta(minutes=i),
+                "user_id": user_id,
+            }
+            for i in range(tasks_per_user)
+        ]
+        connection.execute(
+            text(
+                "INSERT INTO tasks (title, description, due_date, priority, status, created_at, user_id) "
+                "VALUES (:title, :description, :due_date, :priority, :status, :created_at, :user_id)"
+            ),
+            rows,
+        )
+    return user_id
+
+def explain(connection, sql, params):
+    """Retorna o plano (e o tempo) de execução da consulta."""
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql), params)
+        return "\n".join(row[0] for row in rows)
+    rows = connection.execute(text("EXPLAIN QUERY PLAN " + sql), params)
+    plan = "\n".join(str(row[-1]) for row in rows)
+    start = time.perf_counter()
+    connection.execute(text(sql), params).fetchall()
+    return f"{plan}\nTempo: {(time.perf_counter() - start) * 1000:.3f} ms"
+
+def report(engine, label, user_id):
+    params = {"user_id": user_id, "due_date_before": datetime.now(timezone.utc) + timedelta(days=1)}
+    print(f"\n===== {label} =====")
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("ANALYZE tasks"))
+        for name, sql in QUERIES.items():
+            print(f"\n--- {name}\n{explain(connection, sql, params)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--postgres-url", default="postgresql://postgres@localhost/postgres",
+                        help="Conexão administrativa usada para criar o banco temporário")
+    parser.add_argument("--database-url", default=None,
+                        help="Banco descartável já existente, no lugar do banco temporário")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=2000)
+    args = parser.parse_args()
+
+    database = nullcontext(args.database_url) if args.database_url else temporary_database(args.database, args.postgres_url)
+    with database as database_url:
+        # A configuração é lida na importação da aplicação
+        os.environ["DATABASE_URL"] = database_url
+
+        from app import migrations
+        from app.database import engine
+
+        migrations.upgrade(bind=engine)
+        with engine.begin() as connection:
+            # Somente os índices da 0002; o restante do esquema continua na última revisão
+            migrations._task_indexes_downgrade(connection)
+        try:
+            with engine.begin() as connection:
+                user_id = seed(connection, args.users, args.tasks_per_user)
+            report(engine, "ANTES (sem índices compostos)", user_id)
+        finally:
+            with engine.begin() as connection:
+                migrations._task_indexes_upgrade(connection)
+        report(engine, "DEPOIS (migração 0002)", user_id)
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
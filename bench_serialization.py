@@ -0,0 +1,106 @@
+"""Micro-benchmark da serialização das listagens de tarefas (µs por linha).
+
+Compara, para uma página de N tarefas lidas de um SQLite temporário:
+
+- `pydantic`: select(Task) -> objetos ORM -> validação e serialização por
+  List[TaskResponse] -> json.dumps (o caminho do response_model)
+- `fast`: select(colunas) -> tuplas -> dicionários -> orjson (FastJSONResponse)
+
+Reporta o tempo só de serialização e o tempo de consulta + serialização, e
+confere que os dois caminhos produzem o mesmo JSON.
+
+Uso:
+    python -m app.bench_serialization --rows 100 --iterations 200
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+# Banco SQLite temporário, definido antes de importar a aplicação
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_serialization.db')}"
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app import migrations
+from app.database import SessionLocal, engine
+from app.models.task import Task, PriorityEnum, StatusEnum
+from app.models.user import User
+from app.schemas.task import TaskResponse
+from app.utils.fast_json import TASK_COLUMNS, dumps, task_rows
+
+adapter = TypeAdapter(List[TaskResponse])
+
+def pydantic_render(tasks):
+    value = adapter.validate_python(tasks, from_attributes=True)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+def fast_render(rows):
+    return dumps(task_rows(rows))
+
+def seed(rows):
+    migrations.upgrade(bind=engine)
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        user = User(name="Bench", email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all([
+            Task(
+                title=f"Tarefa {i}",
+                description="Descrição da tarefa de benchmark " * 3,
+                due_date=now + timedelta(days=i % 30),
+                priority=list(PriorityEnum)[i % 3],
+                status=list(StatusEnum)[i % 3],
+                user_id=user.id,
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+        return user.id
+
+def per_row_us(fn, iterations, rows):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round((time.perf_counter() - start) / iterations / rows * 1_000_000, 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    user_id = seed(args.rows)
+    with SessionLocal() as db:
+        orm_query = select(Task).where(Task.user_id == user_id).order_by(Task.id)
+        column_query = select(*TASK_COLUMNS).where(Task.user_id == user_id).order_by(Task.id)
+        tasks = db.scalars(orm_query).all()
+        rows = db.execute(column_query).all()
+
+        def query_pydantic():
+            db.expunge_all()
+            return pydantic_render(db.scalars(orm_query).all())
+
+        results = {
+            "rows": args.rows,
+            "same_output": json.loads(pydantic_render(tasks)) == json.loads(fast_render(rows)),
+            "serialize_us_per_row": {
+                "pydantic": per_row_us(lambda: pydantic_render(tasks), args.iterations, args.rows),
+                "fast": per_row_us(lambda: fast_render(rows), args.iterations, args.rows),
+            },
+            "query_and_serialize_us_per_row": {
+                "pydantic": per_row_us(query_pydantic, args.iterations, args.rows),
+                "fast": per_row_us(lambda: fast_render(db.execute(column_query).all()), args.iterations, args.rows),
+            },
+        }
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
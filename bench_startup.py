@@ -0,0 +1,132 @@
+"""Benchmark do tempo de inicialização (cold start) da API e do Celery.
+
+Cada medição roda em um interpretador novo, como um pod recém-criado:
+
+- `api`: importar app.main e responder a primeira requisição (GET /),
+  com o lifespan, pelo transporte ASGI do httpx; informa também quantas
+  conexões com o banco estavam abertas ao final (0 na inicialização
+  preguiçosa)
+- `celery`: importar app.celery_app (o que `celery -A app.celery_app` carrega)
+- `worker`: importar também os módulos de jobs do worker (app.reminders)
+
+Com --profile, executa `python -X importtime` para cada alvo e lista os
+módulos com maior tempo de importação (acumulado e próprio).
+
+Uso:
+    python -m app.bench_startup --runs 5
+    python -m app.bench_startup --targets api --profile --top 25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TARGETS = {
+    "api": """
+import asyncio, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def first_request():
+    import httpx
+    async with app.main.app.router.lifespan_context(app.main.app):
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            (await client.get("/")).raise_for_status()
+
+asyncio.run(first_request())
+from app.database import engine
+pool = engine.pool
+connections = pool.checkedin() + pool.checkedout() if hasattr(pool, "checkedin") else None
+print(json.dumps({"import": imported - start, "first_request": time.perf_counter() - start, "db_connections": connections}))
+""",
+    "celery": """
+import time
+start = time.perf_counter()
+import app.celery_app
+print(json.dumps({"import": time.perf_counter() - start}))
+""",
+    "worker": """
+import time
+start = time.perf_counter()
+import app.celery_app
+import app.reminders
+print(json.dumps({"import": time.perf_counter() - start}))
+""",
+}
+
+def _environment(database_url):
+    return dict(os.environ, DATABASE_URL=database_url)
+
+def measure(target, database_url, cwd):
+    """Executa o alvo em um processo novo; retorna os tempos e o tempo total do processo."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", "import json\n" + TARGETS[target]],
+        capture_output=True, text=True, env=_environment(database_url), cwd=cwd, check=True,
+    )
+    total = time.perf_counter() - start
+    return dict(json.loads(result.stdout.strip().splitlines()[-1]), process=total)
+
+def profile_imports(target, database_url, cwd, top):
+    """Módulos mais lentos de importar, pela saída de `python -X importtime`."""
+    code = "import app.main" if target == "api" else "import app.celery_app" + ("; import app.reminders" if target == "worker" else "")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=_environment(database_url), cwd=cwd, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append({"module": module.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    by_cumulative = sorted(entries, key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]
+    by_self = sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:top]
+    return {"modules": len(entries), "by_cumulative": by_cumulative, "by_self": by_self}
+
+def _summary(samples):
+    summary = {}
+    for key in samples[0]:
+        values = [sample[key] for sample in samples if sample[key] is not None]
+        if not values:
+            continue
+        if key == "db_connections":
+            summary[key] = max(values)
+        else:
+            summary[f"{key}_ms"] = {
+                "median": round(statistics.median(values) * 1000, 1),
+                "min": round(min(values) * 1000, 1),
+            }
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", default="api,celery,worker", help="Alvos separados por vírgula (api, celery, worker)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="Inclui o perfil de importação (python -X importtime)")
+    parser.add_argument("--top", type=int, default=15, help="Módulos listados no perfil")
+    args = parser.parse_args()
+
+    # Diretório que contém o pacote `app`, para importar como nos workers
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_startup.db')}"
+
+    results = {}
+    for target in args.targets.split(","):
+        # A primeira execução compila os .pyc; não entra na medição
+        measure(target, database_url, cwd)
+        samples = [measure(target, database_url, cwd) for _ in range(args.runs)]
+        results[target] = _summary(samples)
+        if args.profile:
+            results[target]["imports"] = profile_imports(target, database_url, cwd, args.top)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Suíte de benchmark da API, com a aplicação em processo e banco descartável.
+
+Sobe a aplicação FastAPI no próprio processo (transporte ASGI do httpx, sem
+servidor HTTP) contra um SQLite temporário ou um banco PostgreSQL criado
+para a execução, popula usuários e tarefas e dispara uma mistura de
+operações (register, login, list, filter, create, update, delete) em cada
+nível de concorrência. O resultado sai em JSON, com vazão e latências
+p50/p95/p99 por operação, para comparar execuções entre commits.
+
+Uso:
+    python -m app.bench_suite --users 50 --tasks-per-user 200 --concurrency 1,10,50 --requests 2000
+    python -m app.bench_suite --database postgres --postgres-url postgresql://postgres@localhost/postgres
+    python -m app.bench_suite --mix list=60,create=20,update=15,delete=5 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.bench_async import percentile
+
+DEFAULT_MIX = "list=45,filter=20,create=12,update=12,delete=5,login=4,register=2"
+PASSWORD = "senha123"
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Operação desconhecida: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+@contextmanager
+def temporary_database(kind, postgres_url):
+    """URL de um banco vazio, removido ao final."""
+    if kind == "sqlite":
+        directory = tempfile.mkdtemp()
+        yield f"sqlite:///{os.path.join(directory, 'bench_suite.db')}"
+        return
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+
+    name = f"bench_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(postgres_url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f'CREATE DATABASE "{name}"'))
+    try:
+        yield make_url(postgres_url).set(database=name).render_as_string(hide_password=False)
+    finally:
+        with admin.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        admin.dispose()
+
+def seed(users, tasks_per_user):
+    """Cria usuários e tarefas direto no banco; retorna as contas (email, token e ids das tarefas)."""
+    from app.database import SessionLocal
+    from app.models.task import Task, PriorityEnum, StatusEnum
+    from app.models.user import User
+    from app.utils.auth import get_password_hash, create_access_token
+
+    hashed = get_password_hash(PASSWORD)
+    now = datetime.now(timezone.utc)
+    accounts = []
+    with SessionLocal() as db:
+        for u in range(users):
+            user = User(name=f"Usuário {u}", email=f"bench_{u}_{uuid.uuid4().hex[:8]}@example.com", hashed_password=hashed)
+            db.add(user)
+            db.flush()
+            tasks = [
+                Task(
+                    title=f"Tarefa {i} do usuário {u}",
+                    description="Tarefa criada pela suíte de benchmark",
+                    due_date=now + timedelta(days=random.randint(-10, 30)),
+                    priority=random.choice(list(PriorityEnum)),
+                    status=random.choice(list(StatusEnum)),
+                    user_id=user.id,
+                )
+                for i in range(tasks_per_user)
+            ]
+            db.add_all(tasks)
+            db.flush()
+            accounts.append({
+                "email": user.email,
+                "token": create_access_token(data={"sub": user.email}),
+                "task_ids": [task.id for task in tasks],
+            })
+            db.commit()
+    return accounts
+
+# Operações: cada uma recebe (client, conta) e retorna a resposta
+
+async def op_list(client, account):
+    return await client.get("/tasks/", params={"limit": 20}, headers=account["headers"])
+
+async def op_filter(client, account):
+    params = {
+        "limit": 20,
+        "status": random.choice(["pendente", "em_andamento", "concluida"]),
+        "order_by": "due_date",
+        "order_direction": "asc",
+    }
+    return await client.get("/tasks/", params=params, headers=account["headers"])
+
+async def op_create(client, account):
+    response = await client.post(
+        "/tasks/",
+        json={"title": "Nova tarefa", "description": "Criada no benchmark", "priority": "media", "status": "pendente"},
+        headers=account["headers"],
+    )
+    if response.status_code == 201:
+        account["task_ids"].append(response.json()["id"])
+    return response
+
+async def op_update(client, account):
+    if not account["task_ids"]:
+        return await op_create(client, account)
+    task_id = random.choice(account["task_ids"])
+    return await client.put(
+        f"/tasks/{task_id}",
+        json={"status": random.choice(["pendente", "em_andamento", "concluida"])},
+        headers=account["headers"],
+    )
+
+async def op_delete(client, account):
+    if not account["task_ids"]:
+        return await op_create(client, account)
+    task_id = account["task_ids"].pop(random.randrange(len(account["task_ids"])))
+    return await client.delete(f"/tasks/{task_id}", headers=account["headers"])
+
+async def op_login(client, account):
+    return await client.post("/login", data={"username": account["email"], "password": PASSWORD})
+
+async def op_register(client, account):
+    user = {"name": "Novo usuário", "email": f"novo_{uuid.uuid4().hex}@example.com", "password": PASSWORD}
+    return await client.post("/register", json=user)
+
+OPERATIONS = {
+    "list": op_list,
+    "filter": op_filter,
+    "create": op_create,
+    "update": op_update,
+    "delete": op_delete,
+    "login": op_login,
+    "register": op_register,
+}
+
+def summarize(latencies, errors, elapsed):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+    }
+
+async def run_level(client, accounts, mix, concurrency, total):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            name = random.choices(names, weights)[0]
+            account = random.choice(accounts)
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](client, account)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "operations": {name: summarize(latencies[name], errors[name], elapsed) for name in names if latencies[name]},
+    }
+
+async def run(accounts, mix, levels, total):
+    import httpx
+    from app.main import app
+
+    for account in accounts:
+        account["headers"] = {"Authorization": f"Bearer {account['token']}"}
+
+    from app.database import ASYNC_MODE
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            results = [await run_level(client, accounts, mix, concurrency, total) for concurrency in levels]
+    if ASYNC_MODE:
+        from app.database import async_engine
+        await async_engine.dispose()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--postgres-url", default="postgresql://postgres@localhost/postgres",
+                        help="Conexão administrativa usada para criar o banco temporário")
+    parser.add_argument("--async-mode", action="store_true", help="Usa as rotas assíncronas (DB_ASYNC_MODE=true)")
+    parser.add_argument("--task-cache", choices=["off", "memory", "redis"], default="off",
+                        help="Cache das listagens de tarefas (TASK_CACHE)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,10,50", help="Níveis de concorrência separados por vírgula")
+    parser.add_argument("--requests", type=int, default=1000, help="Requisições por nível de concorrência")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--output", help="Arquivo onde gravar o JSON (além da saída padrão)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    with temporary_database(args.database, args.postgres_url) as database_url:
+        # A configuração é lida na importação da aplicação
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DB_ASYNC_MODE"] = "true" if args.async_mode else "false"
+        os.environ["TASK_CACHE"] = args.task_cache
+
+        from app import migrations
+        from app.database import engine
+
+        migrations.upgrade(bind=engine)
+        start = time.perf_counter()
+        accounts = seed(args.users, args.tasks_per_user)
+        seed_seconds = time.perf_counter() - start
+
+        results = {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": args.database,
+            "async_mode": args.async_mode,
+            "task_cache": args.task_cache,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "seed_seconds": round(seed_seconds, 3),
+            "mix": args.mix,
+            "levels": asyncio.run(run(accounts, args.mix, levels, args.requests)),
+        }
+        engine.dispose()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.models.task import StatusEnum, PriorityEnum
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+
+# Máximo de itens aceitos por requisição em lote
+BULK_MAX_ITEMS = 1000
+
+class TaskFilter(BaseModel):
+    """Mesmos filtros de GET /tasks; um filtro vazio seleciona todas as tarefas."""
+    status: Optional[StatusEnum] = None
+    priority: Optional[PriorityEnum] = None
+    due_date_before: Optional[datetime] = None
+
+class BulkTaskCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkTaskUpdateItem(TaskUpdate):
+    id: int
+
+class BulkTaskUpdate(BaseModel):
+    items: List[BulkTaskUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkTaskSelection(BaseModel):
+    """Seleção de tarefas por lista de ids e/ou por filtro."""
+    ids: Optional[List[int]] = Field(None, max_length=BULK_MAX_ITEMS)
+    filter: Optional[TaskFilter] = None
+
+class BulkStatusUpdate(BulkTaskSelection):
+    status: StatusEnum
+
+class BulkItemResult(BaseModel):
+    id: Optional[int] = None
+    ok: bool
+    task: Optional[TaskResponse] = None
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    affected: int
+    results: List[BulkItemResult]
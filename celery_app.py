@@ -2,23 +2,40 @@ from celery import Celery
 from celery.schedules import crontab
 import os
 
+from app.utils.instrumentation import instrument_celery
+
 # Configuração do Celery
 celery_app = Celery(
     'task_manager',
     broker='redis://localhost:6379/0',
     backend='redis://localhost:6379/0',
-    include=['app.tasks']
+    include=['app.tasks', 'app.reminders', 'app.archival']
 )
 
+# Intervalo entre execuções do pipeline de lembretes
+REMINDER_INTERVAL_MINUTES = int(os.getenv("REMINDER_INTERVAL_MINUTES", "15"))
+# Hora do arquivamento diário de tarefas concluídas
+ARCHIVE_HOUR = int(os.getenv("ARCHIVE_HOUR", "3"))
+
 # Configuração para executar tarefas periódicas
 celery_app.conf.beat_schedule = {
-    'check-task-deadlines': {
-        'task': 'app.tasks.check_task_deadlines',
-        'schedule': crontab(hour=8, minute=0),  # Executa todos os dias às 8h
+    # Executado ao longo do dia: cada tarefa recebe o lembrete ao entrar na
+    # janela de 24h, em vez de todos os envios concentrados às 8h
+    'dispatch-reminders': {
+        'task': 'app.reminders.dispatch_reminders',
+        'schedule': crontab(minute=f'*/{REMINDER_INTERVAL_MINUTES}'),
+    },
+    # Move tarefas concluídas antigas para tasks_archive, fora do horário de pico
+    'archive-completed-tasks': {
+        'task': 'app.archival.archive_completed_tasks',
+        'schedule': crontab(minute=0, hour=ARCHIVE_HOUR),
     },
 }
 
 celery_app.conf.timezone = 'America/Sao_Paulo'
 
+# Duração de cada job, exposta pelo /metrics da API
+instrument_celery()
+
 if __name__ == '__main__':
     celery_app.start()
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.crud.task_sync import get_changes
+from app.schemas.sync import TaskChanges
+from app.schemas.task import TaskResponse
+from app.utils.deps import get_current_user
+from app.models.user import User
+
+# Incluído antes dos routers com /tasks/{task_id}
+router = APIRouter(prefix="/tasks", tags=["tarefas"])
+
+@router.get("/changes", response_model=TaskChanges)
+def read_task_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Retorna as tarefas criadas, alteradas ou excluídas desde a versão `since`.
+
+    Na primeira sincronização use `since=0`; nas seguintes, a `version` da
+    resposta anterior.
+    """
+    tasks, deleted, version, has_more = get_changes(db=db, user_id=current_user.id, since=since, limit=limit)
+    return TaskChanges(
+        version=version,
+        changes=[TaskResponse.model_validate(task) for task in tasks],
+        deleted=deleted,
+        has_more=has_more
+    )
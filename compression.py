@@ -0,0 +1,192 @@
+"""Compressão negociada das respostas (brotli ou gzip).
+
+O middleware escolhe a codificação pelo Accept-Encoding do cliente (com os
+pesos q), preferindo brotli quando o pacote `brotli` está instalado. Respostas
+menores que COMPRESSION_MIN_SIZE, de tipos que não comprimem bem (imagens,
+arquivos já compactados) ou que já têm Content-Encoding passam sem mudança.
+Respostas em streaming (ex.: exportação) são comprimidas em partes, sem
+esperar o corpo completo.
+"""
+import gzip
+import os
+import zlib
+from typing import Optional
+
+from app.utils.metrics import CounterVec
+from app.utils.instrumentation import phase
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só gzip
+    brotli = None
+
+# Configuração
+COMPRESSION = os.getenv("COMPRESSION", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Qualidade 4-5: boa taxa com custo de CPU próximo ao do gzip 6, adequada a respostas dinâmicas
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml", "text/",
+)
+
+# Bytes antes (`in`) e depois (`out`) da compressão, por codificação
+COMPRESSION_BYTES = CounterVec(("encoding", "direction"))
+
+def _accepted(header: str) -> dict:
+    """Codificações do Accept-Encoding com o respectivo peso q."""
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        accepted[name.strip().lower()] = weight
+    return accepted
+
+def negotiate(header: Optional[str]) -> Optional[str]:
+    """Codificação a usar ("br", "gzip") ou None para a resposta sem compressão."""
+    if not header:
+        return None
+    accepted = _accepted(header)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_weight = None, 0.0
+    for encoding in candidates:
+        weight = accepted.get(encoding, accepted.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+class _Compressor:
+    """Compressor incremental com a mesma interface para gzip e brotli."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16 + MAX_WBITS: formato gzip (cabeçalho e CRC)
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Comprime um corpo completo."""
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+def _header(headers, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+def _compressible(headers) -> bool:
+    if _header(headers, b"content-encoding") is not None:
+        return False
+    content_type = (_header(headers, b"content-type") or "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+def _with_vary(headers):
+    """Acrescenta Accept-Encoding ao Vary: a resposta depende do cabeçalho."""
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if "accept-encoding" in vary.lower():
+        return headers
+    return [(key, value) for key, value in headers if key != b"vary"] + [
+        (b"vary", f"{vary}, Accept-Encoding".encode("latin-1"))
+    ]
+
+def _with_encoding(headers, encoding: str, length: Optional[int]):
+    headers = _with_vary([(key, value) for key, value in headers if key != b"content-length"])
+    headers.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode()))
+    return headers
+
+class CompressionMiddleware:
+    """Middleware ASGI de compressão das respostas HTTP."""
+
+    def __init__(self, app, enabled: bool = COMPRESSION, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.enabled = enabled
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(_header(scope["headers"], b"accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                # Adiado até o primeiro corpo: o tamanho decide se comprime
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = list(start.get("headers", []))
+                status = start["status"]
+                eligible = status not in (204, 304) and status >= 200 and _compressible(headers)
+                if not eligible or (not more_body and len(body) < self.min_size):
+                    await send(dict(start, headers=_with_vary(headers)) if eligible else start)
+                    start = None
+                    await send(message)
+                    return
+                COMPRESSION_BYTES.labels(encoding, "in").inc(len(body))
+                if not more_body:
+                    with phase("compress"):
+                        body = compress(body, encoding)
+                    COMPRESSION_BYTES.labels(encoding, "out").inc(len(body))
+                    await send(dict(start, headers=_with_encoding(headers, encoding, len(body))))
+                    start = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = _Compressor(encoding)
+                await send(dict(start, headers=_with_encoding(headers, encoding, None)))
+                start = None
+            elif compressor is None:
+                await send(message)
+                return
+            else:
+                COMPRESSION_BYTES.labels(encoding, "in").inc(len(body))
+
+            with phase("compress"):
+                chunk = compressor.compress(body) if body else b""
+                if not more_body:
+                    chunk += compressor.finish()
+            COMPRESSION_BYTES.labels(encoding, "out").inc(len(chunk))
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,37 +1,142 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+import os
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import exc
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db, replica_router
 from app.utils.auth import SECRET_KEY, ALGORITHM, TokenData
 from app.crud.user import get_user_by_email
+from app.crud import user_async
+from app.utils.user_cache import token_cache
+from app.utils.instrumentation import phase
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
-):
-    """Obtém o usuário atual a partir do token JWT."""
-    credentials_exception = HTTPException(
+# Token dos endpoints internos (/internal/*); sem ele, esses endpoints respondem 404
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _decode_token(token: str):
+    """Verifica o token JWT, retornando os dados do token e o `exp`."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
+            raise _credentials_exception()
+        return TokenData(email=email), payload.get("exp")
     except JWTError:
-        raise credentials_exception
-    
-    user = get_user_by_email(db, email=token_data.email)
+        raise _credentials_exception()
+
+def require_internal_token(authorization: Optional[str] = Header(None)):
+    """Exige `Authorization: Bearer <INTERNAL_TOKEN>` nos endpoints internos."""
+    if not INTERNAL_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {INTERNAL_TOKEN}"
+    if authorization is None or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token interno inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def get_read_db(primary: Session = Depends(get_db)):
+    """Sessão para rotas somente leitura: uma réplica saudável, se houver.
+
+    Sem réplica (ou quando a requisição deve ler as próprias escritas), é a
+    mesma sessão de get_db na requisição, que só conecta se for usada.
+    """
+    replica = replica_router.choose()
+    if replica is None:
+        yield primary
+        return
+    db = replica.SessionLocal()
+    try:
+        yield db
+    except exc.OperationalError:
+        replica_router.mark_down(replica)
+        raise
+    finally:
+        db.close()
+
+async def get_read_db_async(primary=Depends(get_async_db)):
+    """Variante assíncrona de get_read_db."""
+    replica = replica_router.choose()
+    if replica is None:
+        yield primary
+        return
+    async with replica.AsyncSessionLocal() as db:
+        try:
+            yield db
+        except exc.OperationalError:
+            replica_router.mark_down(replica)
+            raise
+
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
+    """Obtém o usuário atual a partir do token JWT.
+
+    Tokens já verificados ficam em cache junto com o usuário, evitando
+    decodificar o JWT e consultar a tabela users a cada requisição.
+    A busca do usuário usa a réplica de leitura, se houver.
+    """
+    return authenticate_token(token, db, primary)
+
+def authenticate_token(token: str, db: Session, primary: Optional[Session] = None):
+    """Valida o token e retorna o usuário; fora das rotas HTTP (ex.: WebSocket).
+
+    Usuário não encontrado em `db` (uma réplica atrasada, logo após o
+    cadastro) é buscado de novo em `primary`.
+    """
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
+    with phase("jwt"):
+        token_data, exp = _decode_token(token)
+
+    with phase("user_lookup"):
+        user = get_user_by_email(db, email=token_data.email)
+        if user is None and primary is not None and primary is not db:
+            user = get_user_by_email(primary, email=token_data.email)
+    if user is None:
+        raise _credentials_exception()
+
+    token_cache.set(token, token_data.email, user, exp)
+    return user
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db=Depends(get_read_db_async),
+    primary=Depends(get_async_db)
+):
+    """Variante assíncrona de get_current_user, usada no modo assíncrono."""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
+    with phase("jwt"):
+        token_data, exp = _decode_token(token)
+
+    with phase("user_lookup"):
+        user = await user_async.get_user_by_email(db, email=token_data.email)
+        if user is None and primary is not db:
+            user = await user_async.get_user_by_email(primary, email=token_data.email)
     if user is None:
-        raise credentials_exception
-    
+        raise _credentials_exception()
+
+    token_cache.set(token, token_data.email, user, exp)
     return user
@@ -0,0 +1,212 @@
+"""Barramento de eventos de alteração de tarefas (push em tempo real).
+
+Cada commit que cria, altera ou exclui tarefas gera, por usuário, um evento
+`tasks_changed` com a nova versão das tarefas e os ids afetados. Os eventos
+são registrados na sessão durante o flush (ou pelas operações em lote) e só
+publicados após o commit; um rollback os descarta.
+
+Backends (EVENT_BUS):
+- `memory`: entrega apenas às conexões do próprio processo
+- `redis`: publica em um canal pub/sub do Redis; cada worker do uvicorn assina
+  o canal e repassa às suas conexões locais, então funciona com vários workers
+  e com eventos gerados por workers do Celery
+
+Os eventos são avisos: o cliente busca o conteúdo em GET /tasks/changes a
+partir da sua última versão. Por isso um assinante lento perde os eventos
+mais antigos em vez de bloquear a publicação.
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Configuração do barramento
+EVENT_BUS = os.getenv("EVENT_BUS", "memory")
+EVENT_REDIS_URL = os.getenv("EVENT_REDIS_URL", "redis://localhost:6379/1")
+EVENT_CHANNEL = os.getenv("EVENT_CHANNEL", "task-events")
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+def task_event(version, created=(), updated=(), deleted=()):
+    return {
+        "type": "tasks_changed",
+        "version": version,
+        "created": list(created),
+        "updated": list(updated),
+        "deleted": list(deleted),
+    }
+
+class EventBus:
+    """Distribui eventos às filas dos assinantes conectados a este processo."""
+
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._loop = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self):
+        """Vincula o barramento ao event loop que atende as conexões."""
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        self._loop = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        subscription = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: int, subscription: asyncio.Queue):
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: int, payload: dict):
+        """Publica um evento; pode ser chamado de qualquer thread."""
+        self.published += 1
+        self._dispatch(user_id, payload)
+
+    def _dispatch(self, user_id: int, payload: dict):
+        loop = self._loop
+        if loop is None or user_id not in self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, user_id, payload)
+        except RuntimeError:
+            # Event loop encerrado
+            pass
+
+    def _deliver(self, user_id: int, payload: dict):
+        for subscription in list(self._subscribers.get(user_id, ())):
+            if subscription.full():
+                subscription.get_nowait()
+                self.dropped += 1
+            subscription.put_nowait(payload)
+            self.delivered += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "users": len(self._subscribers),
+            "connections": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+class RedisEventBus(EventBus):
+    """Publica no Redis; a entrega local acontece ao receber do canal."""
+
+    def __init__(self, url=EVENT_REDIS_URL, channel=EVENT_CHANNEL, queue_size=EVENT_QUEUE_SIZE):
+        super().__init__(queue_size)
+        import redis
+
+        self.url = url
+        self.channel = channel
+        self._redis = redis.Redis.from_url(url)
+        # A publicação sai de uma thread própria para não bloquear quem faz o commit
+        self._outbox = queue.SimpleQueue()
+        self._publisher = threading.Thread(target=self._publish_loop, name="event-bus-publisher", daemon=True)
+        self._publisher.start()
+        self._listener = None
+
+    def publish(self, user_id: int, payload: dict):
+        self.published += 1
+        self._outbox.put(json.dumps({"user_id": user_id, "event": payload}))
+
+    def _publish_loop(self):
+        while True:
+            message = self._outbox.get()
+            try:
+                self._redis.publish(self.channel, message)
+            except Exception:
+                logger.exception("Falha ao publicar evento no Redis")
+
+    async def start(self):
+        await super().start()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await super().stop()
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.Redis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        self._deliver(data["user_id"], data["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Conexão com o Redis perdida; reconectando")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+    def stats(self) -> dict:
+        return dict(super().stats(), backend="redis")
+
+BUSES = {
+    "memory": EventBus,
+    "redis": RedisEventBus,
+}
+
+_bus = None
+
+def get_event_bus() -> EventBus:
+    """Barramento do processo, criado no primeiro uso."""
+    global _bus
+    if _bus is None:
+        _bus = BUSES[EVENT_BUS]()
+    return _bus
+
+# Eventos pendentes da transação, guardados em session.info até o commit
+
+def record_task_changes(session: Session, user_id: int, version: int, created=(), updated=(), deleted=()):
+    """Registra alterações de tarefas de um usuário para publicação após o commit."""
+    pending = session.info.setdefault("task_events", {})
+    entry = pending.setdefault(user_id, {"version": version, "created": [], "updated": [], "deleted": []})
+    entry["version"] = max(entry["version"], version)
+    entry["created"].extend(created)
+    entry["updated"].extend(updated)
+    entry["deleted"].extend(deleted)
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    pending = session.info.pop("task_events", None)
+    if not pending:
+        return
+    bus = get_event_bus()
+    for user_id, entry in pending.items():
+        created = set(entry["created"])
+        deleted = set(entry["deleted"])
+        # Criada e alterada na mesma transação: só "created"; excluída: só "deleted"
+        updated = [task_id for task_id in dict.fromkeys(entry["updated"]) if task_id not in created | deleted]
+        created = [task_id for task_id in dict.fromkeys(entry["created"]) if task_id not in deleted]
+        bus.publish(user_id, task_event(entry["version"], created, updated, sorted(deleted)))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("task_events", None)
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.task import Task
+from app.models.user import User
+from app.crud.pagination import SORT_COLUMNS, filter_tasks
+from app.utils.deps import get_current_user
+
+# Linhas lidas do cursor do servidor a cada lote
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.due_date, Task.priority,
+    Task.status, Task.created_at, Task.updated_at, Task.user_id,
+)
+FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+router = APIRouter(prefix="/tasks", tags=["tarefas"])
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def _ndjson(rows):
+    return "".join(
+        json.dumps(dict(zip(FIELD_NAMES, map(_plain, row))), ensure_ascii=False) + "\n" for row in rows
+    )
+
+def _csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([["" if value is None else _plain(value) for value in row] for row in rows])
+    return buffer.getvalue()
+
+def stream_tasks(user_id: int, fmt: str, status: Optional[str], priority: Optional[str],
+                 due_date_before: Optional[datetime], order_by: str, order_direction: str):
+    """Gera o arquivo exportado em blocos, lendo as tarefas por um cursor do servidor.
+
+    Usa uma sessão própria, pois o corpo é enviado depois que as dependências
+    da requisição já foram finalizadas. A memória usada é limitada ao lote atual.
+    """
+    column = SORT_COLUMNS.get(order_by, SORT_COLUMNS["created_at"])[0]
+    if order_direction == "asc":
+        ordering = (column.asc().nulls_last(), Task.id.asc())
+    else:
+        ordering = (column.desc().nulls_first(), Task.id.desc())
+    stmt = filter_tasks(select(*EXPORT_COLUMNS), user_id, status, priority, due_date_before).order_by(*ordering)
+
+    encode = _ndjson if fmt == "ndjson" else _csv
+    if fmt == "csv":
+        yield ",".join(FIELD_NAMES) + "\r\n"
+
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield encode(rows)
+
+@router.get("/export")
+def export_tasks(
+    format: str = "ndjson",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_date_before: Optional[datetime] = None,
+    order_by: str = "created_at",
+    order_direction: str = "desc",
+    current_user: User = Depends(get_current_user)
+):
+    """Exporta todas as tarefas do usuário em NDJSON ou CSV, com os mesmos filtros de GET /tasks."""
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Formato inválido: use ndjson ou csv")
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        stream_tasks(current_user.id, format, status, priority, due_date_before, order_by, order_direction),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tarefas.{format}"'},
+    )
@@ -0,0 +1,79 @@
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.responses import JSONResponse
+
+from app.models.task import Task
+from app.utils.instrumentation import phase
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o json da biblioteca padrão
+    orjson = None
+
+# Caminho rápido das listagens: seleciona só as colunas de TaskResponse como
+# tuplas e serializa direto, sem criar objetos ORM nem validar com Pydantic.
+# A saída é idêntica à de response_model=List[TaskResponse]; as rotas mantêm
+# o response_model para que o esquema OpenAPI não mude.
+
+TASK_FIELDS = (
+    "id", "title", "description", "due_date", "priority",
+    "status", "created_at", "updated_at", "user_id",
+)
+TASK_COLUMNS = tuple(getattr(Task, field) for field in TASK_FIELDS)
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """Campos pedidos em `fields=` (separados por vírgula), na ordem de TASK_FIELDS.
+
+    `id` é sempre incluído (identifica a tarefa e gera o cursor). Sem valor,
+    retorna todos os campos. Campos desconhecidos geram ValueError.
+    """
+    if not value:
+        return TASK_FIELDS
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos inválidos: {', '.join(sorted(unknown))}")
+    return tuple(field for field in TASK_FIELDS if field == "id" or field in requested)
+
+def task_columns(fields: Sequence[str] = TASK_FIELDS) -> tuple:
+    """Colunas de Task correspondentes aos campos, para o SELECT."""
+    if tuple(fields) == TASK_FIELDS:
+        return TASK_COLUMNS
+    return tuple(getattr(Task, field) for field in fields)
+
+def _default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # Mesmo formato do Pydantic para UTC
+        return text[:-6] + "Z" if value.utcoffset() == timezone.utc.utcoffset(None) else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def task_rows(rows: Iterable, fields: Sequence[str] = TASK_FIELDS) -> List[dict]:
+    """Converte linhas com task_columns(fields) em dicionários na ordem de TaskResponse.
+
+    Colunas extras ao final da linha (ex.: a chave de ordenação) são ignoradas.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+def task_objects(tasks: Iterable[Task], fields: Sequence[str] = TASK_FIELDS) -> List[dict]:
+    """Mesmo formato de task_rows, a partir de objetos ORM já carregados."""
+    return [{field: getattr(task, field) for field in fields} for task in tasks]
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson (ou json, se orjson não estiver instalado)."""
+
+    def render(self, content) -> bytes:
+        with phase("serialize"):
+            return dumps(content)
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+
+# Respostas privadas por usuário: o cliente guarda, mas sempre revalida
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(user_id: int, version: int, scope: str) -> str:
+    """ETag fraco derivado da versão das tarefas do usuário e do escopo da resposta."""
+    digest = hashlib.sha1(scope.encode()).hexdigest()[:16]
+    return f'W/"{user_id}-{version}-{digest}"'
+
+def list_scope(request: Request) -> str:
+    """Escopo de uma listagem: os parâmetros de consulta normalizados."""
+    return "list?" + "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Avalia If-None-Match (prioritário) e If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {value.strip() for value in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
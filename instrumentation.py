@@ -0,0 +1,241 @@
+"""Instrumentação das requisições, das consultas SQL e dos jobs do Celery.
+
+- `MetricsMiddleware` mede cada requisição HTTP por rota (o template, ex.:
+  /tasks/{task_id}, para não criar uma série por id) e, com os eventos do
+  engine instalados por `instrument_engine`, quantas consultas SQL ela fez
+  e quanto tempo passou no banco.
+- `phase("jwt")` cronometra trechos da requisição (decodificação do JWT,
+  busca do usuário, serialização), para separar o custo de cada etapa.
+- Com SLOW_REQUEST_MS > 0, requisições mais lentas que o limite são
+  registradas no log com as consultas executadas; consultas repetidas
+  aparecem agrupadas, o que denuncia padrões N+1.
+- Os jobs do Celery rodam em outro processo: as durações são agregadas no
+  Redis pelo worker e lidas pelo /metrics da API.
+"""
+import logging
+import os
+import time
+from collections import Counter as TallyCounter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.utils.metrics import DEFAULT_BUCKETS, Counter, CounterVec, Gauge, Histogram, HistogramVec
+
+logger = logging.getLogger(__name__)
+
+# Configuração
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 desativa o log de requisições lentas
+SLOW_REQUEST_MAX_STATEMENTS = int(os.getenv("SLOW_REQUEST_MAX_STATEMENTS", "50"))
+TASK_METRICS_REDIS_URL = os.getenv("TASK_METRICS_REDIS_URL", "redis://localhost:6379/0")
+TASK_METRICS_PREFIX = "metrics:celery:"
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Métricas do processo
+REQUEST_LATENCY = HistogramVec(("method", "route", "status"))
+REQUEST_QUERIES = HistogramVec(("method", "route"), buckets=QUERY_COUNT_BUCKETS)
+REQUEST_SQL_TIME = HistogramVec(("method", "route"))
+REQUEST_PHASE_TIME = HistogramVec(("route", "phase"))
+REQUESTS_IN_PROGRESS = Gauge()
+SLOW_REQUESTS = CounterVec(("method", "route"))
+SQL_QUERIES = Counter()
+SQL_TIME = Histogram()
+
+class RequestStats:
+    """Contadores de uma requisição em andamento."""
+
+    __slots__ = ("queries", "sql_time", "phases", "statements")
+
+    def __init__(self, capture: bool = False):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.phases = defaultdict(float)
+        self.statements = [] if capture else None
+
+_current = ContextVar("request_stats", default=None)
+
+def current_request_stats():
+    """Estatísticas da requisição atual, ou None fora de uma requisição HTTP."""
+    return _current.get()
+
+@contextmanager
+def phase(name: str):
+    """Soma o tempo do bloco à etapa `name` da requisição atual."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name] += time.perf_counter() - start
+
+# Consultas SQL (eventos do engine)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    SQL_QUERIES.inc()
+    SQL_TIME.observe(elapsed)
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.sql_time += elapsed
+    if stats.statements is not None and len(stats.statements) < SLOW_REQUEST_MAX_STATEMENTS:
+        stats.statements.append((statement, elapsed))
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+def instrument_engine(engine):
+    """Registra os eventos de contagem de consultas no engine (síncrono ou assíncrono)."""
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+
+# Middleware HTTP
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+def _log_slow_request(scope, route, status, elapsed, stats):
+    repeated = TallyCounter(statement for statement, _ in stats.statements)
+    lines = [
+        f"  {elapsed * 1000:8.2f} ms  {' '.join(statement.split())}"
+        for statement, elapsed in stats.statements
+    ]
+    duplicates = [
+        f"  {count}x {' '.join(statement.split())}"
+        for statement, count in repeated.most_common() if count > 1
+    ]
+    logger.warning(
+        "Requisição lenta: %s %s (%s) -> %s em %.1f ms; %s consultas em %.1f ms; etapas: %s\n%s%s",
+        scope["method"], scope["path"], route, status, elapsed * 1000,
+        stats.queries, stats.sql_time * 1000,
+        ", ".join(f"{name}={value * 1000:.1f} ms" for name, value in stats.phases.items()) or "-",
+        "\n".join(lines),
+        ("\nConsultas repetidas (possível N+1):\n" + "\n".join(duplicates)) if duplicates else "",
+    )
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede latência, consultas SQL e etapas de cada requisição."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(capture=SLOW_REQUEST_MS > 0)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            _current.reset(token)
+
+            method, route = scope["method"], _route_template(scope)
+            REQUEST_LATENCY.labels(method, route, status).observe(elapsed)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_SQL_TIME.labels(method, route).observe(stats.sql_time)
+            for name, value in stats.phases.items():
+                REQUEST_PHASE_TIME.labels(route, name).observe(value)
+            if SLOW_REQUEST_MS > 0 and elapsed * 1000 >= SLOW_REQUEST_MS:
+                SLOW_REQUESTS.labels(method, route).inc()
+                _log_slow_request(scope, route, status, elapsed, stats)
+
+# Jobs do Celery: durações agregadas no Redis (buckets não cumulativos por job)
+
+_task_starts = {}
+_redis = None
+
+def _task_metrics_redis():
+    global _redis
+    if _redis is None:
+        import redis
+
+        _redis = redis.Redis.from_url(TASK_METRICS_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _redis
+
+def _bucket_field(value: float) -> str:
+    for bound in DEFAULT_BUCKETS:
+        if value <= bound:
+            return f"b:{bound}"
+    return "b:+Inf"
+
+def record_task_duration(name: str, seconds: float, failed: bool = False):
+    """Soma a duração de uma execução de job às métricas compartilhadas no Redis."""
+    key = TASK_METRICS_PREFIX + name
+    try:
+        pipeline = _task_metrics_redis().pipeline(transaction=False)
+        pipeline.hincrby(key, "count", 1)
+        pipeline.hincrbyfloat(key, "sum", seconds)
+        pipeline.hincrby(key, _bucket_field(seconds), 1)
+        if failed:
+            pipeline.hincrby(key, "failures", 1)
+        pipeline.execute()
+    except Exception:
+        logger.warning("Não foi possível registrar a duração do job %s", name, exc_info=True)
+
+def read_task_durations():
+    """[(rótulos, snapshot, falhas)] por job, no formato de Histogram.snapshot()."""
+    try:
+        client = _task_metrics_redis()
+        keys = sorted(client.scan_iter(match=TASK_METRICS_PREFIX + "*"))
+        values = [client.hgetall(key) for key in keys]
+    except Exception:
+        logger.debug("Métricas dos jobs indisponíveis", exc_info=True)
+        return []
+
+    series = []
+    for key, fields in zip(keys, values):
+        fields = {field.decode(): value.decode() for field, value in fields.items()}
+        running = 0
+        buckets = []
+        for bound in DEFAULT_BUCKETS + ("+Inf",):
+            running += int(fields.get(f"b:{bound}", 0))
+            buckets.append((bound, running))
+        snapshot = {"buckets": buckets, "sum": float(fields.get("sum", 0)), "count": int(fields.get("count", 0))}
+        labels = {"task": key.decode()[len(TASK_METRICS_PREFIX):]}
+        series.append((labels, snapshot, int(fields.get("failures", 0))))
+    return series
+
+def instrument_celery():
+    """Mede a duração de cada job nos workers (sinais task_prerun/task_postrun)."""
+    from celery.signals import task_prerun, task_postrun
+
+    @task_prerun.connect(weak=False)
+    def _task_started(task_id=None, **kwargs):
+        _task_starts[task_id] = time.perf_counter()
+
+    @task_postrun.connect(weak=False)
+    def _task_finished(task_id=None, task=None, state=None, **kwargs):
+        start = _task_starts.pop(task_id, None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        logger.info("Job %s concluído em %.3fs (%s)", task.name, elapsed, state)
+        record_task_duration(task.name, elapsed, failed=state == "FAILURE")
@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.crud.task_versions import get_tasks_version
+from app.events import get_event_bus
+from app.utils.deps import authenticate_token
+
+# Intervalo entre pings enviados a conexões ociosas (segundos)
+LIVE_PING_INTERVAL = float(os.getenv("LIVE_PING_INTERVAL", "30"))
+
+router = APIRouter(prefix="/tasks", tags=["tarefas"])
+
+def _authenticate(token: str):
+    with SessionLocal() as db:
+        user = authenticate_token(token, db)
+        version, _ = get_tasks_version(db, user.id)
+        return user.id, version
+
+def _token(websocket: WebSocket):
+    """Token do parâmetro `token` (navegadores) ou do cabeçalho Authorization."""
+    token = websocket.query_params.get("token")
+    if token:
+        return token
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    return credentials if scheme.lower() == "bearer" else None
+
+@router.websocket("/live")
+async def task_events(websocket: WebSocket):
+    """Envia um evento `tasks_changed` a cada alteração nas tarefas do usuário.
+
+    Ao conectar, o cliente recebe `{"type": "hello", "version": ...}`; depois,
+    a cada evento, busca GET /tasks/changes a partir da sua última versão.
+    """
+    token = _token(websocket)
+    if not token:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        user_id, version = await run_in_threadpool(_authenticate, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    bus = get_event_bus()
+    subscription = bus.subscribe(user_id)
+    await websocket.accept()
+    receiver = asyncio.create_task(_drain(websocket))
+    try:
+        await websocket.send_json({"type": "hello", "version": version})
+        while not receiver.done():
+            getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({getter, receiver}, timeout=LIVE_PING_INTERVAL,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await websocket.send_json(getter.result())
+            else:
+                getter.cancel()
+                if not done:
+                    await websocket.send_json({"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        bus.unsubscribe(user_id, subscription)
+
+async def _drain(websocket: WebSocket):
+    """Lê (e descarta) as mensagens do cliente até a desconexão."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
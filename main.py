@@ -1,19 +1,57 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import auth, tasks
-from app.database import engine, Base
-from app.celery_app import celery_app
+from fastapi.concurrency import run_in_threadpool
+from app.routes import auth, tasks, export, changes, live, stats
+from app.database import ASYNC_MODE, pool_stats, warm_up_pool, replica_router
+from app.utils.password_pool import PoolSaturatedError, password_pool
+from app.utils.user_cache import token_cache
+from app.utils.task_cache import task_list_cache
+from app.utils.deps import require_internal_token
+from app.utils.metrics import PrometheusWriter
+from app.utils import compression, instrumentation, rate_limit, read_routing
+from app.events import get_event_bus
+
+# O esquema do banco é criado/atualizado pelas migrações, em um comando
+# separado (nada é feito no banco ao importar a aplicação):
+#   python -m app.migrations upgrade
+
+# Por padrão a inicialização é preguiçosa: conexões com o banco e processos
+# do pool de senhas são abertos no primeiro uso. Com STARTUP_WARMUP=true,
+# são abertos antes de o worker aceitar requisições.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
 
-# Criar tabelas no banco de dados
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Barramento de eventos das conexões em tempo real (/tasks/live)
+    bus = get_event_bus()
+    await bus.start()
+    if STARTUP_WARMUP:
+        await run_in_threadpool(warm_up_pool)
+        await run_in_threadpool(password_pool.warm_up)
+    yield
+    await bus.stop()
 
 # Inicializar aplicação FastAPI
 app = FastAPI(
     title="Gerenciador de Tarefas API",
     description="API REST para gerenciamento de tarefas com autenticação JWT",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Leituras do primário após as escritas do próprio usuário (DATABASE_REPLICA_URLS)
+app.add_middleware(read_routing.ReadRoutingMiddleware)
+
+# Limite de requisições por usuário/IP e descarte de carga (RATE_LIMIT,
+# LOAD_SHED_MAX_IN_FLIGHT). Ficam dentro do CORS, para que as respostas 429
+# e 503 também levem os cabeçalhos CORS
+app.add_middleware(rate_limit.RateLimitMiddleware)
+app.add_middleware(rate_limit.LoadSheddingMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,17 +59,123 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining"],
 )
 
+# Compressão gzip/brotli negociada pelo Accept-Encoding (COMPRESSION, COMPRESSION_MIN_SIZE)
+app.add_middleware(compression.CompressionMiddleware)
+
+# Latência por rota, consultas SQL por requisição e log de requisições lentas
+app.add_middleware(instrumentation.MetricsMiddleware)
+
+# Pool de hashing de senhas saturado: recusar com 503 e Retry-After
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servidor ocupado. Tente novamente em instantes."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # Incluir rotas
+# Rotas com caminho fixo em /tasks vêm antes de /tasks/{task_id}
+app.include_router(export.router)
+app.include_router(changes.router)
+app.include_router(stats.router)
+app.include_router(live.router)
+
+# No modo assíncrono as rotas async são registradas primeiro e têm precedência
+if ASYNC_MODE:
+    from app.routes import async_auth, async_tasks
+    app.include_router(async_auth.router)
+    app.include_router(async_tasks.router)
+
 app.include_router(auth.router)
 app.include_router(tasks.router)
 
-# Disponibilizar o app Celery
-app.celery_app = celery_app
-
 @app.get("/")
 def read_root():
     return {"message": "Bem-vindo à API do Gerenciador de Tarefas"}
 
+@app.get("/internal/pool", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def read_pool_stats():
+    """Estatísticas do pool de conexões (uso interno; requer INTERNAL_TOKEN)."""
+    return pool_stats()
+
+@app.get("/internal/replicas", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def read_replica_stats():
+    """Réplicas de leitura, saúde e leituras roteadas (uso interno; requer INTERNAL_TOKEN)."""
+    return replica_router.stats()
+
+@app.get("/internal/events", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def read_event_stats():
+    """Conexões em tempo real e eventos publicados (uso interno; requer INTERNAL_TOKEN)."""
+    return get_event_bus().stats()
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def read_metrics():
+    """Métricas no formato do Prometheus (uso interno; requer INTERNAL_TOKEN)."""
+    writer = PrometheusWriter()
+    writer.histogram_vec("http_request_duration_seconds", "Latência das requisições HTTP por rota", instrumentation.REQUEST_LATENCY)
+    writer.gauge("http_requests_in_progress", "Requisições HTTP em andamento", instrumentation.REQUESTS_IN_PROGRESS.value)
+    writer.histogram_vec("http_request_sql_queries", "Consultas SQL por requisição", instrumentation.REQUEST_QUERIES)
+    writer.histogram_vec("http_request_sql_seconds", "Tempo em consultas SQL por requisição", instrumentation.REQUEST_SQL_TIME)
+    writer.histogram_vec("http_request_phase_seconds", "Tempo por etapa da requisição (jwt, user_lookup, serialize, compress)", instrumentation.REQUEST_PHASE_TIME)
+    writer.counter_vec("http_slow_requests_total", "Requisições acima de SLOW_REQUEST_MS", instrumentation.SLOW_REQUESTS)
+    writer.counter("db_queries_total", "Consultas SQL executadas pelo processo", instrumentation.SQL_QUERIES.value)
+    writer.histogram("db_query_duration_seconds", "Duração das consultas SQL", [({}, instrumentation.SQL_TIME.snapshot())])
+
+    writer.counter_vec("http_compression_bytes_total", "Bytes antes (in) e depois (out) da compressão", compression.COMPRESSION_BYTES)
+    writer.counter_vec("http_rate_limited_total", "Requisições recusadas com 429 por regra", rate_limit.RATE_LIMITED)
+    writer.counter("http_shed_total", "Requisições recusadas com 503 por excesso de carga", rate_limit.SHED.value)
+
+    pool = pool_stats()
+    if "size" in pool:
+        writer.gauge("db_pool_size", "Tamanho do pool de conexões", pool["size"])
+        writer.gauge("db_pool_checked_out", "Conexões em uso", pool["checked_out"])
+        writer.gauge("db_pool_overflow", "Conexões além do pool_size", pool["overflow"])
+    replicas = replica_router.stats()
+    if replicas["replicas"]:
+        writer.counter("db_reads_total", "Sessões de leitura por destino", [({"target": "primary"}, replicas["primary_reads"])] + [
+            ({"target": replica["name"]}, replica["reads"]) for replica in replicas["replicas"]
+        ])
+        writer.gauge("db_replica_healthy", "Réplica em uso (1) ou fora de uso (0)", [
+            ({"replica": replica["name"]}, int(replica["healthy"])) for replica in replicas["replicas"]
+        ])
+        writer.gauge("db_replica_lag_seconds", "Atraso da replicação na última verificação", [
+            ({"replica": replica["name"]}, replica["lag_seconds"]) for replica in replicas["replicas"]
+        ])
+    if "timeouts" in pool:
+        writer.counter("db_pool_timeouts_total", "Esperas por conexão que estouraram o timeout", pool["timeouts"])
+        writer.histogram("db_pool_wait_seconds", "Espera por uma conexão livre", [({}, pool["wait_time_seconds"])])
+
+    cache = token_cache.stats()
+    writer.gauge("token_cache_size", "Tokens no cache de autenticação", cache["size"])
+    writer.counter("token_cache_hits_total", "Acertos do cache de tokens", cache["hits"])
+    writer.counter("token_cache_misses_total", "Falhas do cache de tokens", cache["misses"])
+
+    tasks_cache = task_list_cache.stats()
+    writer.counter("task_cache_hits_total", "Acertos do cache de listagens por camada", [
+        ({"layer": "l1"}, tasks_cache["l1_hits"]), ({"layer": "l2"}, tasks_cache["l2_hits"]),
+    ])
+    writer.counter("task_cache_misses_total", "Falhas do cache de listagens", tasks_cache["misses"])
+    writer.counter("task_cache_errors_total", "Erros de acesso ao backend do cache de listagens", tasks_cache["errors"])
+    writer.gauge("task_cache_hit_ratio", "Proporção de acertos do cache de listagens", tasks_cache["hit_ratio"])
+
+    hashing = password_pool.stats()
+    writer.gauge("password_pool_in_flight", "Hashes de senha em execução ou na fila", hashing["in_flight"])
+    writer.counter("password_pool_rejected_total", "Hashes recusados com o pool saturado", hashing["rejected"])
+
+    events = get_event_bus().stats()
+    writer.gauge("live_connections", "Conexões WebSocket em /tasks/live", events["connections"])
+    writer.counter("live_events_published_total", "Eventos de alteração publicados", events["published"])
+    writer.counter("live_events_dropped_total", "Eventos descartados por assinantes lentos", events["dropped"])
+
+    jobs = instrumentation.read_task_durations()
+    if jobs:
+        writer.histogram("celery_task_duration_seconds", "Duração dos jobs do Celery", [(labels, snapshot) for labels, snapshot, _ in jobs])
+        writer.counter("celery_task_failures_total", "Jobs do Celery que falharam", [(labels, failures) for labels, _, failures in jobs])
+
+    return PlainTextResponse(writer.render(), media_type="text/plain; version=0.0.4")
+
 # Para iniciar o servidor: uvicorn main:app --reload
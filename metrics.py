@@ -0,0 +1,144 @@
+import threading
+from bisect import bisect_left
+
+# Limites padrão dos buckets (em segundos) dos histogramas de latência
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Histograma de buckets fixos, seguro entre threads."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # último bucket: +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Contagens cumulativas por bucket, soma e total de observações."""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+                running += count
+                cumulative.append(("+Inf" if bound == float("inf") else bound, running))
+            return {"buckets": cumulative, "sum": self._sum, "count": self._count}
+
+class Counter:
+    """Contador monotônico, seguro entre threads."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+class Gauge:
+    """Valor que sobe e desce (ex.: requisições em andamento), seguro entre threads."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+class _Family:
+    """Conjunto de métricas do mesmo nome, uma por combinação de rótulos."""
+
+    def __init__(self, label_names, factory):
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def items(self):
+        with self._lock:
+            children = list(self._children.items())
+        return [(dict(zip(self.label_names, key)), child) for key, child in children]
+
+class HistogramVec(_Family):
+    def __init__(self, label_names, buckets=DEFAULT_BUCKETS):
+        super().__init__(label_names, lambda: Histogram(buckets))
+
+class CounterVec(_Family):
+    def __init__(self, label_names):
+        super().__init__(label_names, Counter)
+
+# Formato de exposição de texto do Prometheus
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class PrometheusWriter:
+    """Monta a página de métricas no formato de texto do Prometheus."""
+
+    def __init__(self):
+        self._lines = []
+
+    def _header(self, name, kind, help_text):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name, help_text, samples):
+        """samples: lista de (rótulos, valor) ou um único valor."""
+        self._samples(name, "gauge", help_text, samples)
+
+    def counter(self, name, help_text, samples):
+        self._samples(name, "counter", help_text, samples)
+
+    def _samples(self, name, kind, help_text, samples):
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        self._header(name, kind, help_text)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name, help_text, series):
+        """series: lista de (rótulos, Histogram.snapshot())."""
+        self._header(name, "histogram", help_text)
+        for labels, snapshot in series:
+            for bound, count in snapshot["buckets"]:
+                self._lines.append(f"{name}_bucket{_labels(dict(labels, le=_number(bound)))} {count}")
+            self._lines.append(f"{name}_sum{_labels(labels)} {_number(float(snapshot['sum']))}")
+            self._lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+
+    def histogram_vec(self, name, help_text, family: HistogramVec):
+        self.histogram(name, help_text, [(labels, child.snapshot()) for labels, child in family.items()])
+
+    def counter_vec(self, name, help_text, family: CounterVec):
+        self.counter(name, help_text, [(labels, child.value) for labels, child in family.items()])
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
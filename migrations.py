@@ -0,0 +1,427 @@
+"""Migrações versionadas do esquema do banco de dados.
+
+Cada migração tem uma revisão sequencial, uma descrição e as funções de
+upgrade/downgrade, que recebem uma conexão já dentro de uma transação.
+As revisões aplicadas ficam registradas na tabela `schema_migrations`.
+
+Uso:
+    python -m app.migrations upgrade            # aplica todas as pendentes
+    python -m app.migrations upgrade --to 0001  # aplica até uma revisão
+    python -m app.migrations downgrade --to 0001
+    python -m app.migrations current
+    python -m app.migrations history
+"""
+import argparse
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, BigInteger, String, DateTime, ForeignKey, ForeignKeyConstraint, Enum, Index,
+    insert, update, delete, select, text, inspect
+)
+from sqlalchemy.sql import func
+
+from app.database import engine
+from app.models.task import PriorityEnum, StatusEnum, urgency_rank_expression
+from app.crud.task_versions import bump_tasks_version
+
+VERSION_TABLE = "schema_migrations"
+
+version_metadata = MetaData()
+schema_migrations = Table(
+    VERSION_TABLE,
+    version_metadata,
+    Column("revision", String(32), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def _reflect(connection, name):
+    return Table(name, MetaData(), autoload_with=connection)
+
+# 0001 - esquema inicial, equivalente ao antigo create_all
+def _baseline_upgrade(connection):
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String, index=True),
+        Column("email", String, unique=True, index=True),
+        Column("hashed_password", String),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True)),
+    )
+    Table(
+        "tasks",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("title", String, index=True),
+        Column("description", String),
+        Column("due_date", DateTime(timezone=True)),
+        Column("priority", Enum(PriorityEnum)),
+        Column("status", Enum(StatusEnum)),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True)),
+        Column("user_id", Integer, ForeignKey("users.id")),
+    )
+    # Bancos criados pelo antigo create_all já possuem as tabelas
+    metadata.create_all(connection, checkfirst=True)
+
+def _baseline_downgrade(connection):
+    _reflect(connection, "tasks").drop(connection)
+    _reflect(connection, "users").drop(connection)
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("DROP TYPE IF EXISTS priorityenum"))
+        connection.execute(text("DROP TYPE IF EXISTS statusenum"))
+
+# 0002 - índices compostos por usuário
+OPEN_TASKS_WITH_DUE_DATE = "status <> 'concluida' AND due_date IS NOT NULL"
+
+def _task_indexes(tasks):
+    c = tasks.c
+    return [
+        Index("ix_tasks_user_created_at_id", c.user_id, c.created_at, c.id),
+        Index("ix_tasks_user_due_date_id", c.user_id, c.due_date, c.id),
+        Index("ix_tasks_user_priority_id", c.user_id, c.priority, c.id),
+        Index("ix_tasks_user_status_id", c.user_id, c.status, c.id),
+        Index("ix_tasks_user_status_due_date", c.user_id, c.status, c.due_date),
+        Index(
+            "ix_tasks_open_due_date",
+            c.user_id,
+            c.due_date,
+            postgresql_where=text(OPEN_TASKS_WITH_DUE_DATE),
+            sqlite_where=text(OPEN_TASKS_WITH_DUE_DATE),
+        ),
+    ]
+
+def _task_indexes_upgrade(connection):
+    for index in _task_indexes(_reflect(connection, "tasks")):
+        index.create(connection, checkfirst=True)
+
+def _task_indexes_downgrade(connection):
+    for index in _task_indexes(_reflect(connection, "tasks")):
+        index.drop(connection, checkfirst=True)
+
+# 0003 - controle de lembretes enviados
+REMINDER_PENDING = "reminder_sent_at IS NULL AND status <> 'concluida' AND due_date IS NOT NULL"
+
+def _add_column(connection, table_name, column):
+    """ALTER TABLE ... ADD COLUMN, ignorando colunas já existentes."""
+    if column.name in {c["name"] for c in inspect(connection).get_columns(table_name)}:
+        return
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column.type.compile(dialect=connection.dialect)}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    connection.execute(text(ddl))
+
+def _drop_column(connection, table_name, column_name):
+    connection.execute(text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}"))
+
+def _reminder_index(tasks):
+    c = tasks.c
+    return Index(
+        "ix_tasks_reminder_pending",
+        c.due_date,
+        c.user_id,
+        c.id,
+        postgresql_where=text(REMINDER_PENDING),
+        sqlite_where=text(REMINDER_PENDING),
+    )
+
+def _reminders_upgrade(connection):
+    _add_column(connection, "tasks", Column("reminder_sent_at", DateTime(timezone=True)))
+    _reminder_index(_reflect(connection, "tasks")).create(connection, checkfirst=True)
+
+def _reminders_downgrade(connection):
+    _reminder_index(_reflect(connection, "tasks")).drop(connection, checkfirst=True)
+    _drop_column(connection, "tasks", "reminder_sent_at")
+
+# 0004 - versão das tarefas de cada usuário (ETag / Last-Modified)
+def _tasks_version_upgrade(connection):
+    _add_column(connection, "users", Column("tasks_version", Integer, nullable=False, server_default="0"))
+    _add_column(connection, "users", Column("tasks_modified_at", DateTime(timezone=True)))
+
+def _tasks_version_downgrade(connection):
+    _drop_column(connection, "users", "tasks_modified_at")
+    _drop_column(connection, "users", "tasks_version")
+
+# 0005 - feed de alterações: versão de sincronização por tarefa e exclusões registradas
+def _sync_index(tasks):
+    c = tasks.c
+    return Index("ix_tasks_user_sync_version", c.user_id, c.sync_version, c.id)
+
+def _task_sync_upgrade(connection):
+    _add_column(connection, "tasks", Column("sync_version", Integer, nullable=False, server_default="0"))
+    # Tarefas existentes entram na primeira sincronização (since=0) com uma versão nova
+    connection.execute(text(
+        "UPDATE users SET tasks_version = tasks_version + 1 "
+        "WHERE id IN (SELECT DISTINCT user_id FROM tasks)"
+    ))
+    connection.execute(text(
+        "UPDATE tasks SET sync_version = "
+        "(SELECT tasks_version FROM users WHERE users.id = tasks.user_id) "
+        "WHERE user_id IS NOT NULL"
+    ))
+    _sync_index(_reflect(connection, "tasks")).create(connection, checkfirst=True)
+
+    metadata = MetaData()
+    # `users` refletida na mesma metadata: alvo da chave estrangeira no CREATE TABLE
+    Table("users", metadata, autoload_with=connection)
+    Table(
+        "task_tombstones",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("task_id", Integer, nullable=False),
+        Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("version", Integer, nullable=False),
+        Column("deleted_at", DateTime(timezone=True), server_default=func.now()),
+        Index("ix_task_tombstones_user_version", "user_id", "version"),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+def _task_sync_downgrade(connection):
+    _reflect(connection, "task_tombstones").drop(connection)
+    _sync_index(_reflect(connection, "tasks")).drop(connection, checkfirst=True)
+    _drop_column(connection, "tasks", "sync_version")
+
+# 0006 - resumo de tarefas por usuário, status e prioridade (estatísticas)
+def _task_stats_upgrade(connection):
+    metadata = MetaData()
+    # `users` refletida na mesma metadata: alvo da chave estrangeira no CREATE TABLE
+    Table("users", metadata, autoload_with=connection)
+    Table(
+        "task_stats",
+        metadata,
+        Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        Column("status", String(20), primary_key=True),
+        Column("priority", String(20), primary_key=True),
+        Column("count", Integer, nullable=False, server_default="0"),
+    )
+    metadata.create_all(connection, checkfirst=True)
+    connection.execute(text("DELETE FROM task_stats"))
+    connection.execute(text(
+        "INSERT INTO task_stats (user_id, status, priority, count) "
+        "SELECT user_id, COALESCE(CAST(status AS VARCHAR(20)), 'pendente'), "
+        "COALESCE(CAST(priority AS VARCHAR(20)), 'media'), COUNT(*) "
+        "FROM tasks WHERE user_id IS NOT NULL "
+        "GROUP BY user_id, COALESCE(CAST(status AS VARCHAR(20)), 'pendente'), "
+        "COALESCE(CAST(priority AS VARCHAR(20)), 'media')"
+    ))
+
+def _task_stats_downgrade(connection):
+    _reflect(connection, "task_stats").drop(connection)
+
+# 0007 - busca textual (apenas PostgreSQL; no SQLite a busca usa um índice em memória)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+)
+SEARCH_DOCUMENT_SQL = "(coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+def _search_upgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    connection.execute(text(
+        f"ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    ))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)"
+    ))
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_tasks_search_trgm ON tasks USING gin ({SEARCH_DOCUMENT_SQL} gin_trgm_ops)"
+    ))
+
+def _search_downgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("DROP INDEX IF EXISTS ix_tasks_search_trgm"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_tasks_search_vector"))
+    connection.execute(text("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector"))
+
+# 0008 - chave de urgência armazenada (order_by=urgency)
+def _urgency_index(tasks):
+    c = tasks.c
+    return Index("ix_tasks_user_urgency_id", c.user_id, c.urgency_rank, c.id)
+
+def _urgency_upgrade(connection):
+    _add_column(connection, "tasks", Column("urgency_rank", BigInteger, nullable=False, server_default="0"))
+    tasks = _reflect(connection, "tasks")
+    c = tasks.c
+    connection.execute(update(tasks).values(urgency_rank=urgency_rank_expression(c.status, c.priority, c.due_date)))
+    _urgency_index(tasks).create(connection, checkfirst=True)
+
+def _urgency_downgrade(connection):
+    _urgency_index(_reflect(connection, "tasks")).drop(connection, checkfirst=True)
+    _drop_column(connection, "tasks", "urgency_rank")
+
+# 0009 - partição fria de tarefas concluídas (arquivamento)
+def _archive_upgrade(connection):
+    metadata = MetaData()
+    # `users` refletida na mesma metadata: alvo da chave estrangeira no CREATE TABLE
+    Table("users", metadata, autoload_with=connection)
+    Table(
+        "tasks_archive",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=False),
+        Column("title", String),
+        Column("description", String),
+        Column("due_date", DateTime(timezone=True)),
+        Column("priority", Enum(PriorityEnum)),
+        Column("status", Enum(StatusEnum)),
+        Column("created_at", DateTime(timezone=True)),
+        Column("updated_at", DateTime(timezone=True)),
+        Column("urgency_rank", BigInteger, nullable=False, server_default="0"),
+        Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("archived_at", DateTime(timezone=True), server_default=func.now()),
+        Index("ix_tasks_archive_user_created_at_id", "user_id", "created_at", "id"),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+def _archive_downgrade(connection):
+    # As tarefas arquivadas voltam para a tabela principal antes da remoção.
+    # No feed de alterações elas constavam como excluídas: com uma versão nova
+    # e sem os tombstones, voltam aos clientes sincronizados como alteradas.
+    user_ids = connection.scalars(text("SELECT DISTINCT user_id FROM tasks_archive")).all()
+    bump_tasks_version(connection, user_ids)
+    connection.execute(text(
+        "INSERT INTO tasks (id, title, description, due_date, priority, status, created_at, "
+        "updated_at, urgency_rank, user_id, sync_version) "
+        "SELECT a.id, a.title, a.description, a.due_date, a.priority, a.status, a.created_at, "
+        "a.updated_at, a.urgency_rank, a.user_id, u.tasks_version "
+        "FROM tasks_archive a JOIN users u ON u.id = a.user_id"
+    ))
+    connection.execute(text(
+        "DELETE FROM task_tombstones WHERE task_id IN (SELECT id FROM tasks_archive)"
+    ))
+    _reflect(connection, "tasks_archive").drop(connection)
+
+# 0010 - SQLite: ids de tarefas sem reaproveitamento (AUTOINCREMENT)
+#
+# Sem AUTOINCREMENT, o SQLite dá à nova tarefa o maior id em `tasks` + 1, que
+# pode ser o de uma tarefa arquivada. O SQLite não altera a chave primária de
+# uma tabela existente: `tasks` é recriada com os mesmos dados e índices. No
+# PostgreSQL a sequência nunca reaproveita ids e nada muda.
+def _task_ids_upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    index_sql = connection.scalars(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks' AND sql IS NOT NULL"
+    )).all()
+    old = _reflect(connection, "tasks")
+    columns = [column.name for column in old.columns]
+    connection.execute(text("ALTER TABLE tasks RENAME TO tasks_old"))
+    metadata = MetaData()
+    Table("users", metadata, autoload_with=connection)
+    Table(
+        "tasks",
+        metadata,
+        *[column._copy() for column in old.columns],
+        *[
+            ForeignKeyConstraint(fk.column_keys, [element.target_fullname for element in fk.elements])
+            for fk in old.foreign_key_constraints
+        ],
+        sqlite_autoincrement=True,
+    ).create(connection)
+    column_list = ", ".join(columns)
+    connection.execute(text(f"INSERT INTO tasks ({column_list}) SELECT {column_list} FROM tasks_old"))
+    connection.execute(text("DROP TABLE tasks_old"))
+    for sql in index_sql:
+        connection.execute(text(sql))
+    # O próximo id fica acima também dos ids já arquivados
+    connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+    connection.execute(text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', MAX("
+        "COALESCE((SELECT MAX(id) FROM tasks), 0), COALESCE((SELECT MAX(id) FROM tasks_archive), 0))"
+    ))
+
+def _task_ids_downgrade(connection):
+    # AUTOINCREMENT não muda o esquema visto pela aplicação: a tabela é mantida
+    pass
+
+# Lista ordenada de migrações: (revisão, descrição, upgrade, downgrade)
+MIGRATIONS = [
+    ("0001", "Esquema inicial (users, tasks)", _baseline_upgrade, _baseline_downgrade),
+    ("0002", "Índices compostos por usuário em tasks", _task_indexes_upgrade, _task_indexes_downgrade),
+    ("0003", "Coluna reminder_sent_at e índice de lembretes pendentes", _reminders_upgrade, _reminders_downgrade),
+    ("0004", "Versão das tarefas por usuário (users.tasks_version)", _tasks_version_upgrade, _tasks_version_downgrade),
+    ("0005", "Feed de alterações (tasks.sync_version, task_tombstones)", _task_sync_upgrade, _task_sync_downgrade),
+    ("0006", "Resumo de tarefas por usuário (task_stats)", _task_stats_upgrade, _task_stats_downgrade),
+    ("0007", "Busca textual em tasks (tsvector/GIN e trigramas)", _search_upgrade, _search_downgrade),
+    ("0008", "Chave de urgência em tasks (urgency_rank)", _urgency_upgrade, _urgency_downgrade),
+    ("0009", "Arquivo de tarefas concluídas (tasks_archive)", _archive_upgrade, _archive_downgrade),
+    ("0010", "Ids de tarefas sem reaproveitamento no SQLite (AUTOINCREMENT)", _task_ids_upgrade, _task_ids_downgrade),
+]
+
+def applied_revisions(bind=None):
+    """Retorna o conjunto de revisões já aplicadas."""
+    bind = bind or engine
+    with bind.begin() as connection:
+        version_metadata.create_all(connection, checkfirst=True)
+        return set(connection.scalars(select(schema_migrations.c.revision)))
+
+def current_revision(bind=None):
+    """Retorna a revisão mais recente aplicada, ou None."""
+    applied = applied_revisions(bind)
+    return max(applied) if applied else None
+
+def upgrade(target=None, bind=None):
+    """Aplica, em ordem, as migrações pendentes até `target` (inclusive)."""
+    bind = bind or engine
+    applied = applied_revisions(bind)
+    done = []
+    for revision, description, up, _ in MIGRATIONS:
+        if target is not None and revision > target:
+            break
+        if revision in applied:
+            continue
+        with bind.begin() as connection:
+            up(connection)
+            connection.execute(insert(schema_migrations).values(revision=revision))
+        done.append((revision, description))
+    return done
+
+def downgrade(target, bind=None):
+    """Reverte as migrações aplicadas posteriores a `target`."""
+    bind = bind or engine
+    applied = applied_revisions(bind)
+    done = []
+    for revision, description, _, down in reversed(MIGRATIONS):
+        if revision <= target:
+            break
+        if revision not in applied:
+            continue
+        with bind.begin() as connection:
+            down(connection)
+            connection.execute(delete(schema_migrations).where(schema_migrations.c.revision == revision))
+        done.append((revision, description))
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrações do banco de dados do Gerenciador de Tarefas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="Aplica migrações pendentes")
+    upgrade_parser.add_argument("--to", dest="target", default=None, help="Revisão final (padrão: a mais recente)")
+    downgrade_parser = subparsers.add_parser("downgrade", help="Reverte migrações")
+    downgrade_parser.add_argument("--to", dest="target", required=True, help="Revisão que deve permanecer aplicada (0000 reverte tudo)")
+    subparsers.add_parser("current", help="Mostra a revisão atual")
+    subparsers.add_parser("history", help="Lista as migrações conhecidas")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        for revision, description in upgrade(args.target):
+            print(f"Aplicada {revision}: {description}")
+    elif args.command == "downgrade":
+        for revision, description in downgrade(args.target):
+            print(f"Revertida {revision}: {description}")
+    elif args.command == "current":
+        print(current_revision() or "nenhuma")
+    else:
+        applied = applied_revisions()
+        for revision, description, _, _ in MIGRATIONS:
+            marker = "*" if revision in applied else " "
+            print(f"[{marker}] {revision}  {description}")
+
+if __name__ == "__main__":
+    main()
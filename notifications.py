@@ -0,0 +1,242 @@
+"""Camada de entrega de e-mails das notificações.
+
+O envio passa por um `Mailer`, que aplica limite de taxa (token bucket) e
+novas tentativas com backoff exponencial sobre um transporte plugável:
+
+- `sendgrid`: API HTTP do SendGrid, com uma sessão HTTP reaproveitada entre envios
+- `smtp`: servidor SMTP (ex.: um servidor local em desenvolvimento), com conexão reaproveitada
+- `file`: grava as mensagens em um arquivo JSON Lines
+- `memory`: guarda as mensagens em memória (testes)
+"""
+import json
+import logging
+import os
+import smtplib
+import threading
+import time
+from dataclasses import dataclass, asdict
+from email.message import EmailMessage as MIMEMessage
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Configuração da entrega
+NOTIFICATION_TRANSPORT = os.getenv("NOTIFICATION_TRANSPORT", "sendgrid")
+SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY", "SUA_CHAVE_API_SENDGRID")
+FROM_EMAIL = os.getenv("FROM_EMAIL", "notificacoes@gerenciador-tarefas.com")
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+NOTIFICATION_FILE = os.getenv("NOTIFICATION_FILE", "notifications.jsonl")
+NOTIFICATION_RATE = float(os.getenv("NOTIFICATION_RATE", "10"))  # mensagens por segundo
+NOTIFICATION_BURST = int(os.getenv("NOTIFICATION_BURST", "20"))
+NOTIFICATION_MAX_RETRIES = int(os.getenv("NOTIFICATION_MAX_RETRIES", "3"))
+NOTIFICATION_BACKOFF = float(os.getenv("NOTIFICATION_BACKOFF", "0.5"))  # segundos
+
+@dataclass
+class EmailMessage:
+    to_email: str
+    subject: str
+    html_content: str
+
+class DeliveryError(Exception):
+    """Falha definitiva na entrega de uma mensagem."""
+
+class TransientDeliveryError(DeliveryError):
+    """Falha temporária (limite de taxa, erro do servidor, conexão): pode ser repetida."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class SendGridTransport:
+    """Envia pela API v3 do SendGrid reaproveitando a mesma sessão HTTP (keep-alive)."""
+
+    url = "https://api.sendgrid.com/v3/mail/send"
+
+    def __init__(self, api_key=SENDGRID_API_KEY, from_email=FROM_EMAIL, timeout=10):
+        self.from_email = from_email
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+
+    def send(self, message: EmailMessage):
+        payload = {
+            "personalizations": [{"to": [{"email": message.to_email}]}],
+            "from": {"email": self.from_email},
+            "subject": message.subject,
+            "content": [{"type": "text/html", "value": message.html_content}],
+        }
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise TransientDeliveryError(str(exc)) from exc
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            raise TransientDeliveryError(
+                f"SendGrid respondeu {response.status_code}",
+                retry_after=float(retry_after) if retry_after else None,
+            )
+        if response.status_code >= 400:
+            raise DeliveryError(f"SendGrid respondeu {response.status_code}: {response.text}")
+
+    def close(self):
+        self.session.close()
+
+class SMTPTransport:
+    """Envia por SMTP mantendo a conexão aberta entre mensagens."""
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, from_email=FROM_EMAIL):
+        self.host = host
+        self.port = port
+        self.from_email = from_email
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = smtplib.SMTP(self.host, self.port, timeout=10)
+        return self._connection
+
+    def send(self, message: EmailMessage):
+        mime = MIMEMessage()
+        mime["From"] = self.from_email
+        mime["To"] = message.to_email
+        mime["Subject"] = message.subject
+        mime.set_content(message.html_content, subtype="html")
+        try:
+            self._connect().send_message(mime)
+        except (smtplib.SMTPServerDisconnected, OSError) as exc:
+            self.close()
+            raise TransientDeliveryError(str(exc)) from exc
+        except smtplib.SMTPResponseException as exc:
+            if 400 <= exc.smtp_code < 500:
+                raise TransientDeliveryError(str(exc)) from exc
+            raise DeliveryError(str(exc)) from exc
+        except smtplib.SMTPException as exc:
+            raise DeliveryError(str(exc)) from exc
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.quit()
+            except smtplib.SMTPException:
+                pass
+            self._connection = None
+
+class FileTransport:
+    """Grava cada mensagem como uma linha JSON em um arquivo."""
+
+    def __init__(self, path=NOTIFICATION_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, message: EmailMessage):
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(asdict(message), ensure_ascii=False) + "\n")
+
+    def close(self):
+        pass
+
+class MemoryTransport:
+    """Guarda as mensagens em memória; `fail_for` simula falhas definitivas por destinatário."""
+
+    def __init__(self, fail_for=()):
+        self.messages = []
+        self.fail_for = set(fail_for)
+
+    def send(self, message: EmailMessage):
+        if message.to_email in self.fail_for:
+            raise DeliveryError("Falha simulada")
+        self.messages.append(message)
+
+    def close(self):
+        pass
+
+class TokenBucket:
+    """Limitador de taxa: `rate` fichas por segundo, acumulando até `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver uma ficha disponível."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class Mailer:
+    """Entrega mensagens com limite de taxa e novas tentativas."""
+
+    def __init__(self, transport, rate=NOTIFICATION_RATE, burst=NOTIFICATION_BURST,
+                 max_retries=NOTIFICATION_MAX_RETRIES, backoff=NOTIFICATION_BACKOFF):
+        self.transport = transport
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sent = 0
+        self.retries = 0
+        self.failed = 0
+
+    def send(self, message: EmailMessage):
+        """Envia uma mensagem, lançando DeliveryError se todas as tentativas falharem."""
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                self.transport.send(message)
+                self.sent += 1
+                return
+            except TransientDeliveryError as exc:
+                if attempt >= self.max_retries:
+                    self.failed += 1
+                    raise
+                delay = exc.retry_after if exc.retry_after is not None else self.backoff * 2 ** attempt
+                attempt += 1
+                self.retries += 1
+                logger.warning("Falha temporária ao enviar para %s; nova tentativa em %.1fs", message.to_email, delay)
+                time.sleep(delay)
+            except DeliveryError:
+                self.failed += 1
+                raise
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "retries": self.retries, "failed": self.failed}
+
+    def close(self):
+        self.transport.close()
+
+TRANSPORTS = {
+    "sendgrid": SendGridTransport,
+    "smtp": SMTPTransport,
+    "file": FileTransport,
+    "memory": MemoryTransport,
+}
+
+_mailer = None
+
+def get_mailer() -> Mailer:
+    """Mailer do processo, criado no primeiro uso e reaproveitado entre tarefas."""
+    global _mailer
+    if _mailer is None:
+        _mailer = Mailer(TRANSPORTS[NOTIFICATION_TRANSPORT]())
+    return _mailer
+
+def set_mailer(mailer: Mailer):
+    """Substitui o Mailer do processo (ex.: transporte em memória nos testes)."""
+    global _mailer
+    if _mailer is not None and _mailer is not mailer:
+        _mailer.close()
+    _mailer = mailer
@@ -0,0 +1,183 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_, literal, and_, or_, union_all
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, ArchivedTask, PriorityEnum, StatusEnum
+
+# Colunas aceitas em order_by: (coluna, conversor do valor salvo no cursor, aceita nulo)
+SORT_COLUMNS = {
+    "created_at": (Task.created_at, datetime.fromisoformat, False),
+    "due_date": (Task.due_date, datetime.fromisoformat, True),
+    "priority": (Task.priority, PriorityEnum, False),
+    "status": (Task.status, StatusEnum, False),
+    # Chave armazenada de urgência (maior = mais urgente); "desc" traz as mais urgentes primeiro
+    "urgency": (Task.urgency_rank, int, False),
+}
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou gerado para outra ordenação."""
+
+def _normalize_order(order_by: str, order_direction: str):
+    if order_by not in SORT_COLUMNS:
+        order_by = "created_at"
+    order_direction = "asc" if order_direction == "asc" else "desc"
+    return order_by, order_direction
+
+def _serialize_value(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, int):
+        return value
+    return value.value
+
+def encode_cursor(task: Task, order_by: str, order_direction: str) -> str:
+    """Gera um cursor opaco com a chave de ordenação e o id da última tarefa da página."""
+    column, _, _ = SORT_COLUMNS[order_by]
+    payload = {
+        "o": order_by,
+        "d": order_direction,
+        "v": _serialize_value(getattr(task, column.key)),
+        "id": task.id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order_by: str, order_direction: str):
+    """Decodifica um cursor, retornando (valor da chave de ordenação, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["o"] != order_by or payload["d"] != order_direction:
+            raise InvalidCursorError("Cursor gerado para outra ordenação")
+        _, convert, _ = SORT_COLUMNS[order_by]
+        value = payload["v"]
+        return (convert(value) if value is not None else None), int(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+def filter_tasks(stmt, user_id: int, status: Optional[str] = None,
+                 priority: Optional[str] = None, due_date_before: Optional[datetime] = None,
+                 model=Task):
+    """Aplica os mesmos filtros de get_tasks a uma consulta de tarefas (ou de `model`)."""
+    stmt = stmt.where(model.user_id == user_id)
+    if status:
+        stmt = stmt.where(model.status == status)
+    if priority:
+        stmt = stmt.where(model.priority == priority)
+    if due_date_before:
+        stmt = stmt.where(model.due_date <= due_date_before)
+    return stmt
+
+def _seek_predicate(column, nullable: bool, ascending: bool, value, last_id: int, id_column=Task.id):
+    """Predicado de busca que continua a leitura logo após (value, last_id).
+
+    Nulos ficam por último em ordem crescente e primeiro em ordem decrescente,
+    o mesmo comportamento padrão do PostgreSQL, para que o índice seja usado.
+    """
+    if value is None:
+        same_key = and_(column.is_(None), id_column > last_id if ascending else id_column < last_id)
+        return same_key if ascending else or_(same_key, column.isnot(None))
+
+    key = tuple_(column, id_column)
+    bound = tuple_(literal(value, column.type), literal(last_id))
+    predicate = key > bound if ascending else key < bound
+    if nullable and ascending:
+        predicate = or_(predicate, column.is_(None))
+    return predicate
+
+def _ordering(column, ascending: bool, id_column=Task.id):
+    if ascending:
+        return column.asc().nulls_last(), id_column.asc()
+    return column.desc().nulls_first(), id_column.desc()
+
+def _archived_page_query(user_id, seek, limit, status, priority, due_date_before, column, ascending, columns):
+    """Página sobre tasks e tasks_archive: cada tabela contribui com até limit + 1
+    linhas já ordenadas pelo seu índice, e a união é reordenada e cortada."""
+    names = [selected.key for selected in columns]
+    branches = []
+    for model in (Task, ArchivedTask):
+        sort_column, id_column = getattr(model, column.key), model.id
+        branch = filter_tasks(
+            select(*(getattr(model, name) for name in names)),
+            user_id, status, priority, due_date_before, model=model,
+        )
+        if seek is not None:
+            branch = branch.where(_seek_predicate(sort_column, *seek, id_column=id_column))
+        branch = branch.order_by(*_ordering(sort_column, ascending, id_column)).limit(limit + 1).subquery()
+        branches.append(select(*branch.c))
+
+    page = union_all(*branches).subquery("tasks_page")
+    return select(*(page.c[name] for name in names)).order_by(
+        *_ordering(page.c[column.key], ascending, page.c.id)
+    )
+
+def build_tasks_page_query(user_id: int, cursor: Optional[str] = None, limit: int = 100,
+                           status: Optional[str] = None, priority: Optional[str] = None,
+                           due_date_before: Optional[datetime] = None,
+                           order_by: str = "created_at", order_direction: str = "desc",
+                           columns: Optional[Sequence] = None, include_archived: bool = False):
+    """Monta a consulta de uma página por keyset (limit + 1 linhas).
+
+    Com `columns`, seleciona apenas essas colunas (que devem incluir `id`) em
+    vez de objetos Task; a coluna de ordenação é acrescentada ao final se não
+    estiver entre elas, para gerar o cursor. Com `include_archived`, a página
+    inclui as tarefas de tasks_archive (exige `columns`).
+    """
+    order_by, order_direction = _normalize_order(order_by, order_direction)
+    column, _, nullable = SORT_COLUMNS[order_by]
+    ascending = order_direction == "asc"
+    if columns and not any(selected is column for selected in columns):
+        columns = (*columns, column)
+
+    seek = None
+    if cursor:
+        value, last_id = decode_cursor(cursor, order_by, order_direction)
+        seek = (nullable, ascending, value, last_id)
+
+    if include_archived:
+        if not columns:
+            raise ValueError("include_archived exige columns")
+        stmt = _archived_page_query(
+            user_id, seek, limit, status, priority, due_date_before, column, ascending, columns
+        )
+        return stmt.limit(limit + 1), order_by, order_direction
+
+    stmt = filter_tasks(select(*columns) if columns else select(Task), user_id, status, priority, due_date_before)
+    if seek is not None:
+        stmt = stmt.where(_seek_predicate(column, *seek))
+    stmt = stmt.order_by(*_ordering(column, ascending))
+
+    return stmt.limit(limit + 1), order_by, order_direction
+
+def paginate(rows: List[Task], limit: int, order_by: str, order_direction: str):
+    """Corta a linha extra da consulta e gera o cursor da próxima página."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], order_by, order_direction)
+
+def get_tasks_page(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 100,
+                   status: Optional[str] = None, priority: Optional[str] = None,
+                   due_date_before: Optional[datetime] = None,
+                   order_by: str = "created_at", order_direction: str = "desc",
+                   columns: Optional[Sequence] = None,
+                   include_archived: bool = False) -> Tuple[List[Task], Optional[str]]:
+    """Busca uma página de tarefas por keyset, retornando (tarefas, próximo cursor).
+
+    Com `columns`, as tarefas vêm como linhas (tuplas) com essas colunas.
+    """
+    stmt, order_by, order_direction = build_tasks_page_query(
+        user_id, cursor, limit, status, priority, due_date_before, order_by, order_direction, columns,
+        include_archived
+    )
+    rows = db.execute(stmt).all() if columns else db.scalars(stmt).all()
+    return paginate(list(rows), limit, order_by, order_direction)
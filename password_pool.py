@@ -0,0 +1,128 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Configuração do pool de processos para hashing de senhas
+PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", str(os.cpu_count() or 1)))
+PASSWORD_POOL_QUEUE_LIMIT = int(os.getenv("PASSWORD_POOL_QUEUE_LIMIT", str(PASSWORD_POOL_SIZE * 4)))
+PASSWORD_POOL_RETRY_AFTER = int(os.getenv("PASSWORD_POOL_RETRY_AFTER", "1"))
+# Threads que podem ficar bloqueadas aguardando um hash (rotas síncronas). Deve
+# ficar abaixo do threadpool do FastAPI (40 tokens do AnyIO por padrão), para
+# que rajadas de login não ocupem todas as threads das rotas de tarefas
+PASSWORD_POOL_MAX_BLOCKING = int(os.getenv("PASSWORD_POOL_MAX_BLOCKING", "20"))
+
+class PoolSaturatedError(RuntimeError):
+    """O pool atingiu o limite de trabalhos pendentes."""
+
+    def __init__(self, retry_after: int = PASSWORD_POOL_RETRY_AFTER):
+        super().__init__("Pool de processos saturado")
+        self.retry_after = retry_after
+
+class BoundedProcessPool:
+    """Pool de processos com limite de trabalhos em andamento.
+
+    Quando o limite é atingido, novos trabalhos são recusados imediatamente
+    com PoolSaturatedError em vez de entrarem em uma fila sem limite.
+    Chamadas bloqueantes (`run`) têm um limite próprio, `max_blocking`, que
+    limita as threads paradas à espera do resultado; `run_async` não ocupa
+    threads e usa só `queue_limit`.
+    Com max_workers=0 os trabalhos são executados no próprio processo.
+    """
+
+    def __init__(self, max_workers: int = PASSWORD_POOL_SIZE, queue_limit: int = PASSWORD_POOL_QUEUE_LIMIT,
+                 max_blocking: int = PASSWORD_POOL_MAX_BLOCKING):
+        self.max_workers = max_workers
+        self.queue_limit = max(queue_limit, max_workers, 1)
+        self.max_blocking = max(max_blocking, 1)
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+        self._blocking = threading.BoundedSemaphore(self.max_blocking)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        # Criado no primeiro uso, para não iniciar processos na importação.
+        # "spawn" evita herdar conexões e threads do servidor via fork.
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturatedError()
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args):
+        """Envia um trabalho ao pool, retornando um Future."""
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args):
+        """Executa um trabalho no pool e aguarda o resultado, bloqueando a thread."""
+        if not self._blocking.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturatedError()
+        try:
+            if self.max_workers <= 0:
+                self._acquire()
+                try:
+                    return fn(*args)
+                finally:
+                    self._release()
+            return self.submit(fn, *args).result()
+        finally:
+            self._blocking.release()
+
+    async def run_async(self, fn, *args):
+        """Executa um trabalho no pool sem bloquear o event loop."""
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(self.run, fn, *args)
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def warm_up(self):
+        """Inicia os processos do pool antecipadamente (STARTUP_WARMUP)."""
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(os.getpid) for _ in range(self.max_workers)]:
+            future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "max_blocking": self.max_blocking,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_pool = BoundedProcessPool()
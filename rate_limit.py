@@ -0,0 +1,261 @@
+"""Limite de requisições por usuário/IP e descarte de carga.
+
+- `RateLimitMiddleware`: token bucket por regra. Cada regra casa método e
+  caminho (padrão fnmatch) e define o limite, a janela e a chave: `user`
+  (subject do JWT; sem token válido, o IP) ou `ip`. A primeira regra que casa
+  é aplicada. Acima do limite, responde 429 com Retry-After.
+- `LoadSheddingMiddleware`: com mais de LOAD_SHED_MAX_IN_FLIGHT requisições
+  em andamento, recusa as novas com 503 e Retry-After em vez de enfileirá-las
+  no threadpool e no pool de conexões; a latência de quem é atendido
+  continua limitada.
+
+Backends do limite (RATE_LIMIT): `memory` (por processo) ou `redis`
+(compartilhado entre os workers, atualizado atomicamente por um script Lua).
+Se o Redis falhar, a requisição é liberada.
+"""
+import fnmatch
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from app.utils.auth import SECRET_KEY, ALGORITHM
+from app.utils.metrics import Counter, CounterVec
+
+logger = logging.getLogger(__name__)
+
+# Configuração
+RATE_LIMIT = os.getenv("RATE_LIMIT", "off")  # off, memory ou redis
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/4")
+# Regras "MÉTODO CAMINHO=LIMITE/SEGUNDOS:CHAVE", separadas por ";"
+RATE_LIMIT_RULES = os.getenv(
+    "RATE_LIMIT_RULES",
+    "POST /login=10/60:ip; POST /register=5/60:ip; * /tasks*=300/60:user",
+)
+# Usar o primeiro IP de X-Forwarded-For (apenas atrás de um proxy confiável)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "0"))  # 0 desativa
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "1"))
+# Caminhos nunca descartados (monitoramento)
+LOAD_SHED_EXEMPT = ("/metrics", "/internal/*")
+
+RATE_LIMITED = CounterVec(("rule",))
+SHED = Counter()
+
+class RateLimitRule:
+    def __init__(self, method: str, pattern: str, limit: int, period: float, key: str = "user"):
+        if key not in ("user", "ip"):
+            raise ValueError(f"Chave de limite inválida: {key}")
+        self.method = method.upper()
+        self.pattern = pattern
+        self.limit = limit
+        self.period = period
+        self.key = key
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.pattern}"
+
+    @property
+    def rate(self) -> float:
+        """Tokens repostos por segundo."""
+        return self.limit / self.period
+
+    def matches(self, method: str, path: str) -> bool:
+        return self.method in ("*", method) and fnmatch.fnmatchcase(path, self.pattern)
+
+def parse_rules(value: str) -> List[RateLimitRule]:
+    """Converte RATE_LIMIT_RULES em regras, ex.: "POST /login=10/60:ip"."""
+    rules = []
+    for item in filter(None, (part.strip() for part in value.split(";"))):
+        route, _, spec = item.rpartition("=")
+        method, _, pattern = route.strip().partition(" ")
+        spec, _, key = spec.partition(":")
+        limit, _, period = spec.partition("/")
+        rules.append(RateLimitRule(method, pattern.strip(), int(limit), float(period or 60), key.strip() or "user"))
+    return rules
+
+# Backends (token bucket)
+
+class MemoryBackend:
+    """Buckets no processo; com vários workers, cada um aplica o limite sozinho."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets = {}  # chave -> [tokens, atualizado_em, taxa, capacidade]
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        # Buckets cheios equivalem a buckets inexistentes
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[2] < bucket[3]
+        }
+
+    async def hit(self, key: str, capacity: int, rate: float) -> Tuple[bool, float, float]:
+        """Consome um token; retorna (permitido, tokens restantes, espera em segundos)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [capacity, now, rate, capacity]
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            bucket[0], bucket[1] = tokens, now
+        return allowed, tokens, 0.0 if allowed else (1 - tokens) / rate
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+class RedisBackend:
+    """Buckets no Redis, compartilhados entre os workers da API."""
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, capacity: int, rate: float) -> Tuple[bool, float, float]:
+        try:
+            allowed, tokens, wait = await self._script(keys=[f"ratelimit:{key}"], args=[capacity, rate])
+        except Exception:
+            logger.warning("Limite de requisições indisponível; liberando a requisição", exc_info=True)
+            return True, float(capacity), 0.0
+        return bool(allowed), float(tokens), float(wait)
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+}
+
+# Middlewares
+
+def client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+def token_subject(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+            except JWTError:
+                return None
+    return None
+
+async def _send_error(send, status_code: int, detail: str, headers: dict):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    raw_headers += [(name.lower().encode(), str(value).encode()) for name, value in headers.items()]
+    await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+class RateLimitMiddleware:
+    """Middleware ASGI de limite de requisições (token bucket por regra e chave)."""
+
+    def __init__(self, app, backend=None, rules: Optional[List[RateLimitRule]] = None):
+        self.app = app
+        if backend is None and RATE_LIMIT in BACKENDS:
+            backend = BACKENDS[RATE_LIMIT]()
+        self.backend = backend
+        self.rules = parse_rules(RATE_LIMIT_RULES) if rules is None else rules
+
+    def _rule(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.backend is None or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        rule = self._rule(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        subject = token_subject(scope) if rule.key == "user" else None
+        key = f"user:{subject}" if subject else f"ip:{client_ip(scope)}"
+        allowed, remaining, wait = await self.backend.hit(f"{rule.name}:{key}", rule.limit, rule.rate)
+        headers = {"X-RateLimit-Limit": rule.limit, "X-RateLimit-Remaining": max(0, math.floor(remaining))}
+        if not allowed:
+            RATE_LIMITED.labels(rule.name).inc()
+            headers["Retry-After"] = max(1, math.ceil(wait))
+            await _send_error(send, 429, "Muitas requisições. Tente novamente em instantes.", headers)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.lower().encode(), str(value).encode()) for name, value in headers.items()
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+class LoadSheddingMiddleware:
+    """Recusa requisições com 503 quando há requisições demais em andamento."""
+
+    def __init__(self, app, max_in_flight: int = LOAD_SHED_MAX_IN_FLIGHT, retry_after: int = LOAD_SHED_RETRY_AFTER):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0  # alterado só no event loop
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or self.max_in_flight <= 0
+            or any(fnmatch.fnmatchcase(scope["path"], pattern) for pattern in LOAD_SHED_EXEMPT)
+        ):
+            await self.app(scope, receive, send)
+            return
+        if self.in_flight >= self.max_in_flight:
+            SHED.inc()
+            await _send_error(
+                send, 503, "Servidor ocupado. Tente novamente em instantes.", {"Retry-After": self.retry_after}
+            )
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,117 @@
+"""Roteamento de leituras entre o primário e as réplicas (read-your-writes).
+
+As rotas somente leitura usam `get_read_db` (app.utils.deps), que lê de uma
+réplica. Como a replicação é assíncrona, um usuário que acabou de alterar
+as próprias tarefas poderia não ver a alteração na leitura seguinte. Este
+middleware evita isso:
+
+- requisições que alteram dados (POST, PUT, PATCH, DELETE) leem do primário
+  do início ao fim, e, se bem-sucedidas, marcam o usuário (subject do JWT)
+  por READ_STICKY_SECONDS;
+- leituras de um usuário marcado vão ao primário até a marca expirar.
+
+Backends da marca (READ_STICKY_BACKEND): `memory` (por processo) ou `redis`
+(compartilhado entre os workers). Se o Redis falhar, a leitura vai ao
+primário.
+"""
+import logging
+import os
+import threading
+import time
+
+from app.database import read_from_primary, replica_router, REPLICA_MAX_LAG_SECONDS
+from app.utils.rate_limit import token_subject
+
+logger = logging.getLogger(__name__)
+
+# Configuração
+READ_STICKY_BACKEND = os.getenv("READ_STICKY_BACKEND", "memory")  # memory ou redis
+READ_STICKY_REDIS_URL = os.getenv("READ_STICKY_REDIS_URL", "redis://localhost:6379/5")
+# Deve cobrir o atraso máximo tolerado das réplicas
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", str(REPLICA_MAX_LAG_SECONDS or 10)))
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class MemoryBackend:
+    """Marcas no processo; com vários workers, use o backend redis."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._until = {}  # subject -> expira_em
+        self._lock = threading.Lock()
+
+    async def mark(self, subject: str, seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_keys:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+            self._until[subject] = now + seconds
+
+    async def is_sticky(self, subject: str) -> bool:
+        with self._lock:
+            until = self._until.get(subject)
+        return until is not None and until > time.monotonic()
+
+class RedisBackend:
+    """Marcas no Redis, vistas por todos os workers da API."""
+
+    def __init__(self, url: str = READ_STICKY_REDIS_URL):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+    async def mark(self, subject: str, seconds: float):
+        try:
+            await self._redis.set(f"read_sticky:{subject}", 1, px=int(seconds * 1000))
+        except Exception:
+            logger.warning("Não foi possível marcar leituras do primário para %s", subject, exc_info=True)
+
+    async def is_sticky(self, subject: str) -> bool:
+        try:
+            return bool(await self._redis.exists(f"read_sticky:{subject}"))
+        except Exception:
+            logger.warning("Marcas de leitura indisponíveis; lendo do primário", exc_info=True)
+            return True
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+}
+
+class ReadRoutingMiddleware:
+    """Middleware ASGI que decide se as leituras da requisição vão ao primário."""
+
+    def __init__(self, app, backend=None, sticky_seconds: float = READ_STICKY_SECONDS):
+        self.app = app
+        self.backend = backend
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_router.enabled:
+            await self.app(scope, receive, send)
+            return
+        if self.backend is None:
+            self.backend = BACKENDS[READ_STICKY_BACKEND]()
+
+        subject = token_subject(scope)
+        if scope["method"] in SAFE_METHODS:
+            primary = subject is not None and await self.backend.is_sticky(subject)
+            token = read_from_primary.set(primary)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                read_from_primary.reset(token)
+            return
+
+        # Escritas: a busca do usuário usa a mesma sessão do primário da rota
+        async def send_and_mark(message):
+            if message["type"] == "http.response.start" and subject and message["status"] < 400:
+                # Antes da resposta: a próxima leitura do cliente já vê a marca
+                await self.backend.mark(subject, self.sticky_seconds)
+            await send(message)
+
+        token = read_from_primary.set(True)
+        try:
+            await self.app(scope, receive, send_and_mark)
+        finally:
+            read_from_primary.reset(token)
@@ -0,0 +1,161 @@
+"""Pipeline de lembretes de prazo.
+
+A cada REMINDER_INTERVAL_MINUTES, `dispatch_reminders` localiza a faixa de
+usuários com tarefas vencendo nas próximas 24h e divide essa faixa em
+sub-jobs `process_reminder_shard`, distribuídos entre os workers. Cada
+sub-job percorre suas tarefas por keyset (user_id, id) em lotes, reserva o
+lote marcando `reminder_sent_at` e só então envia os e-mails; reexecuções
+não reenviam lembretes já marcados. Se o envio falhar, a marcação é desfeita
+e o lembrete volta a ser tentado na próxima execução.
+
+Os lembretes de um mesmo usuário são agrupados em um único e-mail (digest),
+entregue pelo Mailer de app.notifications.
+"""
+import html
+import logging
+import os
+from itertools import groupby
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, func, tuple_, and_
+
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.task import Task, StatusEnum
+from app.models.user import User
+from app.notifications import EmailMessage, get_mailer
+
+logger = logging.getLogger(__name__)
+
+# Configuração dos lembretes
+REMINDER_WINDOW_HOURS = int(os.getenv("REMINDER_WINDOW_HOURS", "24"))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "500"))
+REMINDER_USERS_PER_SHARD = int(os.getenv("REMINDER_USERS_PER_SHARD", "1000"))
+
+def _pending_window(start, end):
+    """Tarefas em aberto, sem lembrete enviado, com prazo na janela (start, end]."""
+    return and_(
+        Task.reminder_sent_at.is_(None),
+        Task.status != StatusEnum.concluida,
+        Task.due_date.isnot(None),
+        Task.due_date > start,
+        Task.due_date <= end,
+    )
+
+def build_digest(rows) -> EmailMessage:
+    """Um único e-mail com todas as tarefas de um usuário que vencem em breve.
+
+    Título e nome vêm do usuário: são escapados antes de entrar no HTML.
+    """
+    first = rows[0]
+    items = "".join(
+        f"<li><strong>{html.escape(row.title or '')}</strong> — "
+        f"vence em {html.escape(row.due_date.strftime('%d/%m/%Y %H:%M'))}</li>"
+        for row in sorted(rows, key=lambda row: row.due_date)
+    )
+    if len(rows) == 1:
+        subject = f"Lembrete: a tarefa '{first.title}' vence em breve"
+    else:
+        subject = f"Lembrete: {len(rows)} tarefas vencem nas próximas horas"
+    content = f"<p>Olá, {html.escape(first.name or '')}!</p><p>Tarefas com prazo próximo:</p><ul>{items}</ul>"
+    return EmailMessage(to_email=first.email, subject=subject, html_content=content)
+
+def shard_ranges(min_user_id, max_user_id, users_per_shard=REMINDER_USERS_PER_SHARD):
+    """Divide o intervalo [min_user_id, max_user_id] em faixas consecutivas."""
+    return [
+        (low, min(low + users_per_shard - 1, max_user_id))
+        for low in range(min_user_id, max_user_id + 1, users_per_shard)
+    ]
+
+@celery_app.task(name="app.reminders.dispatch_reminders")
+def dispatch_reminders():
+    """Distribui a busca de lembretes em sub-jobs por faixa de user_id."""
+    start = datetime.now(timezone.utc)
+    end = start + timedelta(hours=REMINDER_WINDOW_HOURS)
+    with SessionLocal() as db:
+        min_user_id, max_user_id = db.execute(
+            select(func.min(Task.user_id), func.max(Task.user_id)).where(_pending_window(start, end))
+        ).one()
+    if min_user_id is None:
+        return 0
+
+    ranges = shard_ranges(min_user_id, max_user_id)
+    for low, high in ranges:
+        process_reminder_shard.delay(low, high, start.isoformat(), end.isoformat())
+    return len(ranges)
+
+@celery_app.task(name="app.reminders.process_reminder_shard")
+def process_reminder_shard(low_user_id, high_user_id, window_start, window_end):
+    """Envia os lembretes das tarefas de uma faixa de usuários, em lotes.
+
+    Retorna o número de lembretes (tarefas) e de e-mails enviados.
+    """
+    start = datetime.fromisoformat(window_start)
+    end = datetime.fromisoformat(window_end)
+    mailer = get_mailer()
+    reminders_sent = 0
+    emails_sent = 0
+    last_key = (low_user_id - 1, 0)
+
+    while True:
+        with SessionLocal() as db:
+            batch = db.execute(
+                select(Task.id, Task.user_id, Task.title, Task.due_date, User.email, User.name)
+                .join(User, User.id == Task.user_id)
+                .where(
+                    _pending_window(start, end),
+                    Task.user_id <= high_user_id,
+                    tuple_(Task.user_id, Task.id) > tuple_(*last_key),
+                )
+                .order_by(Task.user_id, Task.id)
+                .limit(REMINDER_BATCH_SIZE)
+            ).all()
+            if not batch:
+                break
+            more = len(batch) == REMINDER_BATCH_SIZE
+            if more and batch[0].user_id != batch[-1].user_id:
+                # O último usuário pode ter mais tarefas: fica para o próximo lote,
+                # para que todas entrem no mesmo digest
+                batch = [row for row in batch if row.user_id != batch[-1].user_id]
+            last_key = (batch[-1].user_id, batch[-1].id)
+
+            # Reserva o lote: só as tarefas ainda não marcadas por outra execução.
+            # updated_at é mantido: o lembrete não é uma alteração da tarefa.
+            claimed = set(db.scalars(
+                update(Task)
+                .where(Task.id.in_([row.id for row in batch]), Task.reminder_sent_at.is_(None))
+                .values(reminder_sent_at=func.now(), updated_at=Task.updated_at)
+                .returning(Task.id)
+                .execution_options(synchronize_session=False)
+            ))
+            db.commit()
+
+            sent = set()
+            claimed_rows = [row for row in batch if row.id in claimed]
+            try:
+                for _, user_rows in groupby(claimed_rows, key=lambda row: row.user_id):
+                    user_rows = list(user_rows)
+                    try:
+                        mailer.send(build_digest(user_rows))
+                    except Exception:
+                        # Qualquer falha (entrega, montagem do e-mail, limitador) só afeta este digest
+                        logger.exception("Falha ao enviar lembretes para %s", user_rows[0].email)
+                        continue
+                    emails_sent += 1
+                    reminders_sent += len(user_rows)
+                    sent.update(row.id for row in user_rows)
+            finally:
+                # Desfaz a reserva do que não foi enviado, inclusive se o sub-job for interrompido
+                unsent = claimed - sent
+                if unsent:
+                    db.execute(
+                        update(Task).where(Task.id.in_(sorted(unsent))).values(reminder_sent_at=None, updated_at=Task.updated_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                    db.commit()
+
+        if not more:
+            break
+
+    logger.info("Faixa %s-%s: %s lembretes em %s e-mails", low_user_id, high_user_id, reminders_sent, emails_sent)
+    return {"reminders": reminders_sent, "emails": emails_sent}
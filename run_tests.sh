@@ -5,7 +5,7 @@
 echo "Iniciando testes do Gerenciador de Tarefas..."
 
 # Diretório base do projeto
-BASE_DIR="/home/ubuntu/task-manager"
+BASE_DIR="${BASE_DIR:-/home/ubuntu/task-manager}"
 
 # Verificar se os serviços estão rodando
 echo "Verificando se os serviços estão rodando..."
@@ -25,14 +25,29 @@ cd $BASE_DIR/backend
 source venv/bin/activate
 pip install pytest requests selenium webdriver_manager
 
-# Executar testes da API
+# Executar testes da API (com INTERNAL_TOKEN igual ao do servidor, o teste de métricas também lê /metrics)
 echo "Executando testes da API..."
 cd $BASE_DIR/backend
 python -m unittest tests/test_api.py
 
+# Executar testes do pipeline de lembretes (broker em memória, sem envio real)
+echo "Executando testes dos lembretes..."
+python -m unittest tests/test_reminders.py
+
+# Executar testes do roteamento de leituras (dois SQLite como primário e réplica)
+echo "Executando testes do roteamento de leituras..."
+python -m unittest tests/test_read_routing.py
+
 # Executar testes da UI
 echo "Executando testes da UI..."
 cd $BASE_DIR/frontend
 python ../backend/venv/bin/python tests/test_ui.py
 
+# Benchmark opcional (aplicação em processo, SQLite temporário): RUN_BENCH=1 ./run_tests.sh
+if [ "${RUN_BENCH:-0}" = "1" ]; then
+  echo "Executando a suíte de benchmark..."
+  cd $BASE_DIR/backend
+  python -m app.bench_suite --output "bench-$(date +%Y%m%d%H%M%S).json"
+fi
+
 echo "Testes concluídos!"
@@ -20,6 +20,11 @@ echo "Ativando ambiente virtual..."
 cd $BASE_DIR/backend
 source venv/bin/activate
 
+# Aplicar migrações pendentes do banco de dados
+echo "Aplicando migrações do banco de dados..."
+cd $BASE_DIR/backend
+python -m app.migrations upgrade
+
 # Iniciar o servidor FastAPI
 echo "Iniciando servidor FastAPI..."
 cd $BASE_DIR/backend
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.crud.task_stats import get_task_stats, compute_task_stats
+from app.schemas.summary import TaskStats
+from app.utils.deps import get_current_user
+from app.models.user import User
+
+# Incluído antes dos routers com /tasks/{task_id}
+router = APIRouter(prefix="/tasks", tags=["tarefas"])
+
+@router.get("/stats", response_model=TaskStats)
+def read_task_stats(
+    exact: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Contagens por status e prioridade, tarefas atrasadas e taxa de conclusão.
+
+    Por padrão usa o resumo mantido a cada escrita; com `exact=true`, recalcula
+    a partir das tarefas em uma única consulta agrupada.
+    """
+    if exact:
+        return compute_task_stats(db, current_user.id)
+    return get_task_stats(db, current_user.id)
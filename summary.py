@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Dict
+
+class TaskStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    overdue: int
+    completion_rate: float
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.task import TaskResponse
+
+class TaskChanges(BaseModel):
+    """Página do feed de alterações.
+
+    `version` é o cursor da próxima chamada (parâmetro `since`); enquanto
+    `has_more` for verdadeiro, ainda há alterações até a versão atual.
+    """
+    version: int
+    changes: List[TaskResponse]
+    deleted: List[int]
+    has_more: bool
@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum, Index, event, inspect,
+    case, cast, extract, literal
+)
+from sqlalchemy.sql import func, text
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -14,8 +18,76 @@ class StatusEnum(enum.Enum):
     em_andamento = "em_andamento"
     concluida = "concluida"
 
+# Urgência (order_by=urgency): chave armazenada e indexada, maior = mais urgente.
+# Faixas: tarefas em aberto com data limite > em aberto sem data > concluídas.
+# Entre as que têm data limite, vence a data "efetiva" mais próxima: a data
+# limite antecipada para prioridade alta e adiada para prioridade baixa. A
+# chave não depende do horário atual, então só muda quando status,
+# prioridade ou data limite mudam.
+URGENCY_BAND = 10 ** 10
+PRIORITY_WEIGHT = {"alta": 3, "media": 2, "baixa": 1}
+PRIORITY_LEAD_SECONDS = {"alta": 2 * 86400, "media": 0, "baixa": -2 * 86400}
+
+def _sql_operand(value, type_):
+    if isinstance(value, ColumnElement) or hasattr(value, "__clause_element__"):
+        return value
+    if isinstance(value, enum.Enum):
+        value = value.value
+    return literal(value, type_)
+
+def urgency_rank_expression(status, priority, due_date):
+    """Expressão SQL da urgência; cada argumento pode ser uma coluna ou um valor.
+
+    Calculada sempre pelo banco (inclusive para valores), para que o
+    instante da data limite seja interpretado igual nas escritas pelo ORM,
+    nas escritas em lote e na migração.
+    """
+    status = _sql_operand(status, String())
+    priority = _sql_operand(priority, String())
+    due_date = _sql_operand(due_date, DateTime(timezone=True))
+    weight = case(PRIORITY_WEIGHT, value=priority, else_=PRIORITY_WEIGHT["media"])
+    lead = case(PRIORITY_LEAD_SECONDS, value=priority, else_=0)
+    effective_due = cast(extract("epoch", due_date), BigInteger) - lead
+    return case(
+        (status == StatusEnum.concluida.value, weight),
+        (due_date.is_(None), URGENCY_BAND + weight),
+        else_=3 * URGENCY_BAND - 1 - effective_due,
+    )
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Índices compostos da paginação por keyset: usuário + chave de ordenação + id
+        Index("ix_tasks_user_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_due_date_id", "user_id", "due_date", "id"),
+        Index("ix_tasks_user_priority_id", "user_id", "priority", "id"),
+        Index("ix_tasks_user_status_id", "user_id", "status", "id"),
+        # Filtro por status com ordenação/filtro por data limite
+        Index("ix_tasks_user_status_due_date", "user_id", "status", "due_date"),
+        # Índice parcial: apenas tarefas em aberto com data limite
+        Index(
+            "ix_tasks_open_due_date",
+            "user_id",
+            "due_date",
+            postgresql_where=text("status <> 'concluida' AND due_date IS NOT NULL"),
+            sqlite_where=text("status <> 'concluida' AND due_date IS NOT NULL"),
+        ),
+        # Busca de lembretes pendentes por janela de prazo
+        Index(
+            "ix_tasks_reminder_pending",
+            "due_date",
+            "user_id",
+            "id",
+            postgresql_where=text("reminder_sent_at IS NULL AND status <> 'concluida' AND due_date IS NOT NULL"),
+            sqlite_where=text("reminder_sent_at IS NULL AND status <> 'concluida' AND due_date IS NOT NULL"),
+        ),
+        # Feed de alterações: tarefas do usuário a partir de uma versão
+        Index("ix_tasks_user_sync_version", "user_id", "sync_version", "id"),
+        # Ordenação por urgência com paginação por keyset
+        Index("ix_tasks_user_urgency_id", "user_id", "urgency_rank", "id"),
+        # SQLite: ids nunca reaproveitados (migração 0010), também os de tarefas arquivadas
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -25,7 +97,81 @@ class Task(Base):
     status = Column(Enum(StatusEnum), default=StatusEnum.pendente)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Momento em que o lembrete de prazo foi enviado (None = pendente)
+    reminder_sent_at = Column(DateTime(timezone=True))
+    # Versão das tarefas do usuário (users.tasks_version) na última alteração
+    sync_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Chave de urgência (urgency_rank_expression), mantida a cada escrita
+    urgency_rank = Column(BigInteger, nullable=False, default=0, server_default="0")
     
     # Relacionamento com o usuário
     user_id = Column(Integer, ForeignKey("users.id"))
     user = relationship("User", backref="tasks")
+
+
+class TaskTombstone(Base):
+    """Registro de uma tarefa excluída, consumido pelo feed de alterações."""
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_user_version", "user_id", "version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ArchivedTask(Base):
+    """Tarefa concluída movida de `tasks` pelo job de arquivamento (app.archival).
+
+    Mantém o id original; as listagens a incluem com include_archived=true.
+    """
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String)
+    description = Column(String)
+    due_date = Column(DateTime(timezone=True))
+    priority = Column(Enum(PriorityEnum))
+    status = Column(Enum(StatusEnum))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    urgency_rank = Column(BigInteger, nullable=False, default=0, server_default="0")
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TaskStat(Base):
+    """Resumo por usuário: quantidade de tarefas por status e prioridade.
+
+    Mantido incrementalmente na mesma transação das escritas em `tasks`.
+    """
+    __tablename__ = "task_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    priority = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# A urgência é recalculada quando status, prioridade ou data limite mudam
+@event.listens_for(Task, "before_insert")
+def _set_urgency_rank_on_insert(mapper, connection, target):
+    target.urgency_rank = urgency_rank_expression(target.status, target.priority, target.due_date)
+
+@event.listens_for(Task, "before_update")
+def _set_urgency_rank_on_update(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in ("status", "priority", "due_date")):
+        target.urgency_rank = urgency_rank_expression(target.status, target.priority, target.due_date)
+
+# Uma nova data limite exige um novo lembrete
+@event.listens_for(Task, "before_update")
+def _reset_reminder_on_due_date_change(mapper, connection, target):
+    if inspect(target).attrs.due_date.history.has_changes():
+        target.reminder_sent_at = None
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.crud.pagination import SORT_COLUMNS, filter_tasks, build_tasks_page_query, paginate
+
+# Variantes assíncronas das operações de crud/task.py
+
+async def get_tasks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100,
+                    status: Optional[str] = None, priority: Optional[str] = None,
+                    due_date_before: Optional[datetime] = None,
+                    order_by: str = "created_at", order_direction: str = "desc") -> List[Task]:
+    """Busca tarefas com filtros opcionais (paginação por offset)."""
+    column = SORT_COLUMNS.get(order_by, SORT_COLUMNS["created_at"])[0]
+    stmt = filter_tasks(select(Task), user_id, status, priority, due_date_before)
+    stmt = stmt.order_by(column.asc() if order_direction == "asc" else column.desc())
+    result = await db.scalars(stmt.offset(skip).limit(limit))
+    return list(result.all())
+
+async def get_tasks_page(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 100,
+                         status: Optional[str] = None, priority: Optional[str] = None,
+                         due_date_before: Optional[datetime] = None,
+                         order_by: str = "created_at", order_direction: str = "desc",
+                         columns: Optional[Sequence] = None,
+                         include_archived: bool = False) -> Tuple[List[Task], Optional[str]]:
+    """Busca uma página de tarefas por keyset, retornando (tarefas, próximo cursor)."""
+    stmt, order_by, order_direction = build_tasks_page_query(
+        user_id, cursor, limit, status, priority, due_date_before, order_by, order_direction, columns,
+        include_archived
+    )
+    result = await (db.execute(stmt) if columns else db.scalars(stmt))
+    return paginate(list(result.all()), limit, order_by, order_direction)
+
+async def get_task(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
+    """Busca uma tarefa específica do usuário."""
+    result = await db.scalars(select(Task).where(Task.id == task_id, Task.user_id == user_id))
+    return result.first()
+
+async def create_task(db: AsyncSession, task: TaskCreate, user_id: int) -> Task:
+    """Cria uma nova tarefa."""
+    db_task = Task(**task.model_dump(), user_id=user_id)
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    return db_task
+
+async def update_task(db: AsyncSession, task_id: int, user_id: int, task_update: TaskUpdate) -> Optional[Task]:
+    """Atualiza uma tarefa existente."""
+    db_task = await get_task(db, task_id, user_id)
+    if db_task is None:
+        return None
+    for field, value in task_update.model_dump(exclude_unset=True).items():
+        setattr(db_task, field, value)
+    await db.commit()
+    await db.refresh(db_task)
+    return db_task
+
+async def delete_task(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
+    """Exclui uma tarefa."""
+    db_task = await get_task(db, task_id, user_id)
+    if db_task is None:
+        return None
+    await db.delete(db_task)
+    await db.commit()
+    return db_task
@@ -0,0 +1,156 @@
+from collections import Counter
+from typing import List, Optional
+
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskTombstone, StatusEnum, urgency_rank_expression
+from app.schemas.task import TaskCreate, TaskResponse
+from app.schemas.bulk import BulkTaskUpdateItem, BulkItemResult, TaskFilter
+from app.crud.pagination import filter_tasks
+from app.crud.task_versions import bump_tasks_version
+from app.crud.task_stats import stat_key, apply_stat_deltas
+from app.events import record_task_changes
+
+# Operações em lote: cada função executa poucas instruções multi-linha
+# em uma única transação, em vez de um commit/refresh por tarefa. Como as
+# instruções em lote não passam pelo flush do ORM, a versão das tarefas do
+# usuário é incrementada aqui, antes das escritas (mesma ordem de bloqueio
+# do flush), e carimbada nas linhas afetadas; o resumo de estatísticas
+# recebe os deltas de cada operação e a chave de urgência é recalculada pelo
+# banco. Sem linhas afetadas, a transação é desfeita.
+
+URGENCY_FIELDS = {"status", "priority", "due_date"}
+
+NOT_FOUND = "Tarefa não encontrada"
+
+def _selection(stmt, user_id: int, ids: Optional[List[int]], task_filter: Optional[TaskFilter]):
+    task_filter = task_filter or TaskFilter()
+    stmt = filter_tasks(stmt, user_id, task_filter.status, task_filter.priority, task_filter.due_date_before)
+    if ids is not None:
+        stmt = stmt.where(Task.id.in_(ids))
+    return stmt
+
+def _next_version(db: Session, user_id: int) -> int:
+    return bump_tasks_version(db.connection(), [user_id])[user_id]
+
+def _update_urgency(db: Session, ids: List[int]):
+    """Recalcula urgency_rank das tarefas a partir dos valores já gravados."""
+    if ids:
+        db.execute(
+            update(Task).where(Task.id.in_(ids))
+            .values(urgency_rank=urgency_rank_expression(Task.status, Task.priority, Task.due_date))
+            .execution_options(synchronize_session=False)
+        )
+
+def _finish(db: Session, affected: bool):
+    if affected:
+        db.commit()
+    else:
+        db.rollback()
+
+def _results(ids: Optional[List[int]], tasks: List[Task]) -> List[BulkItemResult]:
+    """Resultados por item, na ordem dos ids pedidos (ou das tarefas afetadas)."""
+    found = {task.id: task for task in tasks}
+    order = ids if ids is not None else list(found)
+    return [
+        BulkItemResult(id=task_id, ok=True, task=TaskResponse.model_validate(found[task_id]))
+        if task_id in found
+        else BulkItemResult(id=task_id, ok=False, detail=NOT_FOUND)
+        for task_id in order
+    ]
+
+def bulk_create_tasks(db: Session, tasks: List[TaskCreate], user_id: int) -> List[BulkItemResult]:
+    """Cria várias tarefas com um único INSERT multi-linha."""
+    version = _next_version(db, user_id)
+    rows = [dict(task.model_dump(), user_id=user_id, sync_version=version) for task in tasks]
+    created = db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows).all()
+    # Serializar antes do commit: após ele os objetos expiram e seriam recarregados um a um
+    results = [BulkItemResult(id=task.id, ok=True, task=TaskResponse.model_validate(task)) for task in created]
+    _update_urgency(db, [task.id for task in created])
+    apply_stat_deltas(db.connection(), user_id, Counter(stat_key(task.status, task.priority) for task in created))
+    record_task_changes(db, user_id, version, created=[task.id for task in created])
+    _finish(db, bool(created))
+    return results
+
+def bulk_update_tasks(db: Session, items: List[BulkTaskUpdateItem], user_id: int) -> List[BulkItemResult]:
+    """Atualiza várias tarefas (UPDATE em lote por chave primária)."""
+    values_by_id = {item.id: item.model_dump(exclude_unset=True, exclude={"id"}) for item in items}
+    for values in values_by_id.values():
+        # O UPDATE em lote não dispara os eventos do modelo: nova data limite, novo lembrete
+        if "due_date" in values:
+            values["reminder_sent_at"] = None
+    version = _next_version(db, user_id)
+    current = {
+        row.id: stat_key(row.status, row.priority)
+        for row in db.execute(
+            select(Task.id, Task.status, Task.priority).where(Task.user_id == user_id, Task.id.in_(values_by_id))
+        )
+    }
+    owned = set(current)
+
+    params = [dict(values, id=task_id) for task_id, values in values_by_id.items() if task_id in owned and values]
+    if params:
+        db.execute(update(Task), [dict(values, sync_version=version) for values in params])
+        _update_urgency(db, [values["id"] for values in params if URGENCY_FIELDS & values.keys()])
+        deltas = Counter()
+        for values in params:
+            before = current[values["id"]]
+            deltas[before] -= 1
+            deltas[stat_key(values.get("status", before[0]), values.get("priority", before[1]))] += 1
+        apply_stat_deltas(db.connection(), user_id, deltas)
+        record_task_changes(db, user_id, version, updated=[values["id"] for values in params])
+
+    tasks = db.scalars(
+        select(Task).where(Task.id.in_(owned)).execution_options(populate_existing=True)
+    ).all()
+    results = _results(list(values_by_id), tasks)
+    _finish(db, bool(params))
+    return results
+
+def bulk_set_status(db: Session, user_id: int, status: StatusEnum, ids: Optional[List[int]] = None,
+                    task_filter: Optional[TaskFilter] = None) -> List[BulkItemResult]:
+    """Altera o status das tarefas selecionadas com um único UPDATE."""
+    version = _next_version(db, user_id)
+    deltas = Counter()
+    for row in db.execute(
+        _selection(select(Task.status, Task.priority, func.count().label("count")), user_id, ids, task_filter)
+        .group_by(Task.status, Task.priority)
+    ):
+        deltas[stat_key(row.status, row.priority)] -= row.count
+        deltas[stat_key(status, row.priority)] += row.count
+    stmt = _selection(update(Task), user_id, ids, task_filter).values(
+        status=status,
+        sync_version=version,
+        urgency_rank=urgency_rank_expression(status, Task.priority, Task.due_date),
+    ).returning(Task)
+    tasks = db.scalars(stmt.execution_options(synchronize_session=False)).all()
+    results = _results(ids, tasks)
+    apply_stat_deltas(db.connection(), user_id, deltas)
+    record_task_changes(db, user_id, version, updated=[task.id for task in tasks])
+    _finish(db, bool(tasks))
+    return results
+
+def bulk_delete_tasks(db: Session, user_id: int, ids: Optional[List[int]] = None,
+                      task_filter: Optional[TaskFilter] = None) -> List[BulkItemResult]:
+    """Exclui as tarefas selecionadas com um único DELETE."""
+    version = _next_version(db, user_id)
+    stmt = _selection(delete(Task), user_id, ids, task_filter).returning(Task.id, Task.status, Task.priority)
+    deleted = db.execute(stmt.execution_options(synchronize_session=False)).all()
+    deleted_ids = [row.id for row in deleted]
+    if deleted_ids:
+        apply_stat_deltas(db.connection(), user_id, Counter({
+            key: -count for key, count in Counter(stat_key(row.status, row.priority) for row in deleted).items()
+        }))
+        db.execute(insert(TaskTombstone), [
+            {"task_id": task_id, "user_id": user_id, "version": version} for task_id in deleted_ids
+        ])
+        record_task_changes(db, user_id, version, deleted=deleted_ids)
+    _finish(db, bool(deleted_ids))
+    found = set(deleted_ids)
+    order = ids if ids is not None else deleted_ids
+    return [
+        BulkItemResult(id=task_id, ok=True) if task_id in found
+        else BulkItemResult(id=task_id, ok=False, detail=NOT_FOUND)
+        for task_id in order
+    ]
@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache read-through das listagens de tarefas (GET /tasks).
+#
+# A chave inclui a versão das tarefas do usuário (users.tasks_version), que é
+# incrementada na mesma transação de toda escrita e já é lida pela rota para
+# o ETag. Ela funciona como contador de geração: depois de uma escrita, as
+# chaves antigas deixam de ser consultadas e expiram pelo TTL, sem apagar
+# nada e sem janela em que uma leitura veja a página anterior à escrita.
+#
+# Camadas: L1 em memória no processo (LRU) e L2 compartilhado (`redis` ou
+# `memory`, este para testes e processo único). Falhas do Redis não quebram
+# a leitura: a consulta vai ao banco.
+
+TASK_CACHE = os.getenv("TASK_CACHE", "off")  # off, memory ou redis
+TASK_CACHE_REDIS_URL = os.getenv("TASK_CACHE_REDIS_URL", "redis://localhost:6379/3")
+TASK_CACHE_TTL = int(os.getenv("TASK_CACHE_TTL", "300"))
+TASK_CACHE_L1_SIZE = int(os.getenv("TASK_CACHE_L1_SIZE", "1000"))
+
+CachedPage = Tuple[bytes, Optional[str]]  # (corpo JSON, próximo cursor)
+
+def list_key(user_id: int, version: int, params: dict) -> str:
+    """Chave da página: usuário, versão e parâmetros normalizados (sem os nulos)."""
+    normalized = {}
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, str) and name in ("order_by", "order_direction"):
+            value = value.lower()
+        normalized[name] = value
+    digest = hashlib.sha1(json.dumps(normalized, separators=(",", ":")).encode()).hexdigest()[:20]
+    return f"tasks:{user_id}:{version}:{digest}"
+
+def _encode(page: CachedPage) -> bytes:
+    body, next_cursor = page
+    return (next_cursor or "").encode() + b"\n" + body
+
+def _decode(value: bytes) -> CachedPage:
+    next_cursor, _, body = value.partition(b"\n")
+    return body, next_cursor.decode() or None
+
+class MemoryBackend:
+    """L2 em memória com TTL (testes e processo único)."""
+
+    name = "memory"
+    remote = False
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) > 10000:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[key] = (now + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisBackend:
+    """L2 no Redis, compartilhado entre os workers da API."""
+
+    name = "redis"
+    remote = True
+
+    def __init__(self, url: str = TASK_CACHE_REDIS_URL):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._redis.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._redis.set(key, value, ex=ttl)
+
+    def clear(self):
+        for key in self._redis.scan_iter(match="tasks:*"):
+            self._redis.delete(key)
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+}
+
+class TaskListCache:
+    """Cache de páginas de tarefas com L1 (LRU no processo) e L2 (backend)."""
+
+    def __init__(self, backend=None, ttl: int = TASK_CACHE_TTL, l1_size: int = TASK_CACHE_L1_SIZE):
+        self.backend = backend
+        self.ttl = ttl
+        self.l1_size = l1_size
+        self._l1 = OrderedDict()
+        self._lock = threading.Lock()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _l1_get(self, key):
+        with self._lock:
+            value = self._l1.get(key)
+            if value is not None:
+                self._l1.move_to_end(key)
+                self.l1_hits += 1
+            return value
+
+    def _l1_set(self, key, value):
+        with self._lock:
+            self._l1[key] = value
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_size:
+                self._l1.popitem(last=False)
+
+    def _count(self, attribute):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def _backend_get(self, key) -> Optional[CachedPage]:
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.warning("Falha ao ler o cache de tarefas", exc_info=True)
+            self._count("errors")
+            value = None
+        if value is None:
+            self._count("misses")
+            return None
+        page = _decode(value)
+        self._count("l2_hits")
+        self._l1_set(key, page)
+        return page
+
+    def _backend_set(self, key, page: CachedPage):
+        try:
+            self.backend.set(key, _encode(page), self.ttl)
+        except Exception:
+            logger.warning("Falha ao gravar no cache de tarefas", exc_info=True)
+            self._count("errors")
+
+    def get(self, user_id: int, version: int, params: dict) -> Optional[CachedPage]:
+        """Página em cache para a versão atual das tarefas, ou None."""
+        if self.backend is None:
+            return None
+        key = list_key(user_id, version, params)
+        return self._l1_get(key) or self._backend_get(key)
+
+    def set(self, user_id: int, version: int, params: dict, body: bytes, next_cursor: Optional[str] = None):
+        if self.backend is None:
+            return
+        key = list_key(user_id, version, params)
+        self._l1_set(key, (body, next_cursor))
+        self._backend_set(key, (body, next_cursor))
+
+    async def get_async(self, user_id: int, version: int, params: dict) -> Optional[CachedPage]:
+        """Variante para rotas async: o acesso ao Redis sai do event loop."""
+        if self.backend is None:
+            return None
+        key = list_key(user_id, version, params)
+        page = self._l1_get(key)
+        if page is not None or not self.backend.remote:
+            return page or self._backend_get(key)
+        return await asyncio.to_thread(self._backend_get, key)
+
+    async def set_async(self, user_id: int, version: int, params: dict, body: bytes, next_cursor: Optional[str] = None):
+        if self.backend is None:
+            return
+        key = list_key(user_id, version, params)
+        self._l1_set(key, (body, next_cursor))
+        if self.backend.remote:
+            await asyncio.to_thread(self._backend_set, key, (body, next_cursor))
+        else:
+            self._backend_set(key, (body, next_cursor))
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """Acertos por camada, falhas e erros do backend."""
+        with self._lock:
+            hits = self.l1_hits + self.l2_hits
+            lookups = hits + self.misses
+            return {
+                "backend": self.backend.name if self.backend is not None else "off",
+                "l1_size": len(self._l1),
+                "l1_hits": self.l1_hits,
+                "l2_hits": self.l2_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+task_list_cache = TaskListCache(BACKENDS[TASK_CACHE]() if TASK_CACHE in BACKENDS else None)
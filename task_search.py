@@ -0,0 +1,228 @@
+import base64
+import binascii
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, literal, literal_column, func, and_, or_, cast
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.crud.pagination import InvalidCursorError, filter_tasks
+from app.crud.task_versions import get_tasks_version
+
+# Busca textual em título e descrição, com ranking e paginação por keyset
+# sobre (relevância, id).
+#
+# - `postgres`: coluna gerada `search_vector` (tsvector, título com peso A e
+#   descrição com peso B) com índice GIN; se a busca textual não encontra
+#   nada, recorre à similaridade de trigramas (pg_trgm), que tolera erros de
+#   digitação e palavras incompletas.
+# - `memory`: índice invertido em Python por usuário, reconstruído quando a
+#   versão das tarefas do usuário muda; usado com SQLite (testes).
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")  # auto, postgres ou memory
+SEARCH_CONFIG = "portuguese"  # mesma configuração da coluna gerada (migração 0007)
+SEARCH_INDEX_CACHE_SIZE = int(os.getenv("SEARCH_INDEX_CACHE_SIZE", "1000"))
+
+FULL_TEXT = "fts"
+FUZZY = "fuzzy"
+
+# Expressões idênticas às dos índices da migração 0007, para que sejam usados
+SEARCH_VECTOR = literal_column("tasks.search_vector")
+SEARCH_DOCUMENT = literal_column("(coalesce(tasks.title, '') || ' ' || coalesce(tasks.description, ''))")
+
+def _query_key(q: str) -> str:
+    return hashlib.sha1(q.encode()).hexdigest()[:8]
+
+def encode_search_cursor(q: str, mode: str, rank: float, task_id: int) -> str:
+    payload = {"q": _query_key(q), "m": mode, "r": rank, "id": task_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str, q: str) -> Tuple[str, float, int]:
+    """Decodifica um cursor de busca, retornando (modo, relevância, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["q"] != _query_key(q) or payload["m"] not in (FULL_TEXT, FUZZY):
+            raise InvalidCursorError("Cursor gerado para outra busca")
+        return payload["m"], float(payload["r"]), int(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+def _page(rows, q: str, mode: str, limit: int):
+    """Recebe até limit+1 pares (tarefa, relevância) e monta a página e o próximo cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_task, last_rank = rows[-1]
+        next_cursor = encode_search_cursor(q, mode, float(last_rank), last_task.id)
+    return [task for task, _ in rows], next_cursor
+
+# Backend PostgreSQL
+
+def _postgres_query(q: str, mode: str):
+    if mode == FULL_TEXT:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery)
+        match = SEARCH_VECTOR.op("@@")(tsquery)
+    else:
+        rank = func.word_similarity(q, SEARCH_DOCUMENT)
+        match = literal(q).op("<%")(SEARCH_DOCUMENT)
+    # ts_rank_cd e word_similarity retornam real (float4); em float8, o valor
+    # do SELECT, o do cursor (float do Python) e o da comparação são o mesmo,
+    # e empates com a última linha da página não são pulados nem repetidos
+    return cast(rank, DOUBLE_PRECISION), match
+
+def _search_postgres(db: Session, user_id: int, q: str, limit: int, after, filters) -> Tuple[List[Task], Optional[str]]:
+    modes = [after[0]] if after else [FULL_TEXT, FUZZY]
+    for mode in modes:
+        rank, match = _postgres_query(q, mode)
+        stmt = filter_tasks(select(Task, rank.label("rank")).where(match), user_id, *filters)
+        if after:
+            _, last_rank, last_id = after
+            bound = cast(literal(last_rank), DOUBLE_PRECISION)
+            stmt = stmt.where(or_(rank < bound, and_(rank == bound, Task.id < last_id)))
+        rows = db.execute(stmt.order_by(rank.desc(), Task.id.desc()).limit(limit + 1)).all()
+        if rows or after:
+            return _page([(row.Task, row.rank) for row in rows], q, mode, limit)
+    return [], None
+
+# Backend em memória (índice invertido)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Palavras em minúsculas e sem acentos."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text)
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    return re.findall(r"\w+", normalized.lower())
+
+class InvertedIndex:
+    """Índice invertido das tarefas de um usuário: termo -> {id da tarefa: peso}."""
+
+    TITLE_WEIGHT = 2.0
+    DESCRIPTION_WEIGHT = 1.0
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = 0
+
+    def add(self, task_id: int, title: Optional[str], description: Optional[str]):
+        weights = Counter()
+        for token in tokenize(title):
+            weights[token] += self.TITLE_WEIGHT
+        for token in tokenize(description):
+            weights[token] += self.DESCRIPTION_WEIGHT
+        for token, weight in weights.items():
+            self.postings[token][task_id] = weight
+        self.documents += 1
+
+    def _score(self, postings_per_term) -> Dict[int, float]:
+        """Soma de tf-idf, exigindo que todos os termos ocorram na tarefa."""
+        scores = None
+        for postings in postings_per_term:
+            idf = math.log(1 + self.documents / (1 + len(postings)))
+            term_scores = {task_id: weight * idf for task_id, weight in postings.items()}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: scores[task_id] + term_scores[task_id] for task_id in scores.keys() & term_scores.keys()}
+        return scores or {}
+
+    def search(self, q: str, mode: str) -> Dict[int, float]:
+        terms = tokenize(q)
+        if not terms:
+            return {}
+        if mode == FULL_TEXT:
+            return self._score(self.postings.get(term, {}) for term in terms)
+        # Busca aproximada: termos como prefixo de palavras indexadas
+        merged = []
+        for term in terms:
+            postings = {}
+            for token, token_postings in self.postings.items():
+                if token.startswith(term):
+                    for task_id, weight in token_postings.items():
+                        postings[task_id] = max(postings.get(task_id, 0), weight)
+            merged.append(postings)
+        return self._score(merged)
+
+class IndexCache:
+    """Índices por usuário (LRU), válidos enquanto a versão das tarefas não muda."""
+
+    def __init__(self, maxsize=SEARCH_INDEX_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> InvertedIndex:
+        version, _ = get_tasks_version(db, user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        index = InvertedIndex()
+        for row in db.execute(select(Task.id, Task.title, Task.description).where(Task.user_id == user_id)):
+            index.add(row.id, row.title, row.description)
+
+        with self._lock:
+            self._entries[user_id] = (version, index)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+index_cache = IndexCache()
+
+def _search_memory(db: Session, user_id: int, q: str, limit: int, after, filters) -> Tuple[List[Task], Optional[str]]:
+    index = index_cache.get(db, user_id)
+    modes = [after[0]] if after else [FULL_TEXT, FUZZY]
+    for mode in modes:
+        scores = index.search(q, mode)
+        if scores:
+            tasks = db.scalars(filter_tasks(select(Task).where(Task.id.in_(list(scores))), user_id, *filters)).all()
+            ranked = sorted(((task, scores[task.id]) for task in tasks), key=lambda pair: (pair[1], pair[0].id), reverse=True)
+            if after:
+                _, last_rank, last_id = after
+                ranked = [pair for pair in ranked if (pair[1], pair[0].id) < (last_rank, last_id)]
+            if ranked or after:
+                return _page(ranked[:limit + 1], q, mode, limit)
+        elif after:
+            return [], None
+    return [], None
+
+def _backend(db: Session) -> str:
+    if SEARCH_BACKEND != "auto":
+        return SEARCH_BACKEND
+    return "postgres" if db.get_bind().dialect.name == "postgresql" else "memory"
+
+def search_tasks(db: Session, user_id: int, q: str, limit: int = 20, cursor: Optional[str] = None,
+                 status: Optional[str] = None, priority: Optional[str] = None,
+                 due_date_before: Optional[datetime] = None) -> Tuple[List[Task], Optional[str]]:
+    """Busca tarefas do usuário por relevância, com os mesmos filtros de get_tasks.
+
+    Retorna (tarefas, cursor da próxima página ou None). Lança
+    InvalidCursorError se o cursor for inválido ou de outra busca.
+    """
+    after = decode_search_cursor(cursor, q) if cursor else None
+    filters = (status, priority, due_date_before)
+    if _backend(db) == "postgres":
+        return _search_postgres(db, user_id, q, limit, after, filters)
+    return _search_memory(db, user_id, q, limit, after, filters)
@@ -0,0 +1,131 @@
+import enum
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, func, case, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, ArchivedTask, TaskStat, StatusEnum, PriorityEnum
+
+# Estatísticas das tarefas de um usuário. O resumo `task_stats` guarda a
+# contagem por (status, prioridade) e é atualizado com deltas na mesma
+# transação de cada escrita; o painel lê no máximo 9 linhas por usuário.
+# Tarefas atrasadas dependem do horário da consulta e são contadas pelo
+# índice parcial ix_tasks_open_due_date. Tarefas arquivadas (tasks_archive)
+# continuam no resumo.
+
+DEFAULT_STATUS = StatusEnum.pendente.value
+DEFAULT_PRIORITY = PriorityEnum.media.value
+
+StatKey = Tuple[str, str]
+
+def _value(value, default):
+    if value is None:
+        return default
+    return value.value if isinstance(value, enum.Enum) else value
+
+def stat_key(status, priority) -> StatKey:
+    return _value(status, DEFAULT_STATUS), _value(priority, DEFAULT_PRIORITY)
+
+def _old_and_new(obj, attribute):
+    history = inspect(obj).attrs[attribute].history
+    current = history.added[0] if history.added else (history.unchanged[0] if history.unchanged else None)
+    previous = history.deleted[0] if history.deleted else current
+    return previous, current
+
+def flush_deltas(created: Iterable[Task], updated: Iterable[Task], deleted: Iterable[Task]) -> Dict[int, Counter]:
+    """Deltas do resumo para as tarefas de um flush do ORM, por usuário."""
+    deltas = defaultdict(Counter)
+    for obj in created:
+        deltas[obj.user_id][stat_key(obj.status, obj.priority)] += 1
+    for obj in deleted:
+        previous_status, _ = _old_and_new(obj, "status")
+        previous_priority, _ = _old_and_new(obj, "priority")
+        deltas[obj.user_id][stat_key(previous_status, previous_priority)] -= 1
+    for obj in updated:
+        previous_status, status = _old_and_new(obj, "status")
+        previous_priority, priority = _old_and_new(obj, "priority")
+        before, after = stat_key(previous_status, previous_priority), stat_key(status, priority)
+        if before != after:
+            deltas[obj.user_id][before] -= 1
+            deltas[obj.user_id][after] += 1
+    return deltas
+
+def apply_stat_deltas(connection, user_id: int, deltas: Counter):
+    """Soma os deltas ao resumo do usuário (INSERT ... ON CONFLICT DO UPDATE)."""
+    rows = [
+        {"user_id": user_id, "status": status, "priority": priority, "count": delta}
+        for (status, priority), delta in sorted(deltas.items()) if delta
+    ]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(TaskStat.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "status", "priority"],
+        set_={"count": TaskStat.__table__.c.count + stmt.excluded.count},
+    )
+    connection.execute(stmt, rows)
+
+def _empty_stats():
+    return {
+        "total": 0,
+        "by_status": {status.value: 0 for status in StatusEnum},
+        "by_priority": {priority.value: 0 for priority in PriorityEnum},
+        "overdue": 0,
+        "completion_rate": 0.0,
+    }
+
+def _finish(stats):
+    if stats["total"]:
+        stats["completion_rate"] = round(stats["by_status"][StatusEnum.concluida.value] / stats["total"], 4)
+    return stats
+
+def _overdue(now):
+    return (Task.status != StatusEnum.concluida) & Task.due_date.isnot(None) & (Task.due_date < now)
+
+def get_task_stats(db: Session, user_id: int, now: Optional[datetime] = None) -> dict:
+    """Estatísticas a partir do resumo: custo independente do número de tarefas."""
+    now = now or datetime.now(timezone.utc)
+    stats = _empty_stats()
+    for row in db.execute(
+        select(TaskStat.status, TaskStat.priority, TaskStat.count).where(TaskStat.user_id == user_id)
+    ):
+        stats["by_status"][row.status] += row.count
+        stats["by_priority"][row.priority] += row.count
+        stats["total"] += row.count
+    stats["overdue"] = db.scalar(select(func.count()).select_from(Task).where(Task.user_id == user_id, _overdue(now)))
+    return _finish(stats)
+
+def compute_task_stats(db: Session, user_id: int, now: Optional[datetime] = None) -> dict:
+    """Estatísticas calculadas direto de `tasks` (e de `tasks_archive`) com consultas agrupadas."""
+    now = now or datetime.now(timezone.utc)
+    stats = _empty_stats()
+    for row in db.execute(
+        select(
+            Task.status,
+            Task.priority,
+            func.count().label("count"),
+            func.sum(case((_overdue(now), 1), else_=0)).label("overdue"),
+        )
+        .where(Task.user_id == user_id)
+        .group_by(Task.status, Task.priority)
+    ):
+        status, priority = stat_key(row.status, row.priority)
+        stats["by_status"][status] += row.count
+        stats["by_priority"][priority] += row.count
+        stats["total"] += row.count
+        stats["overdue"] += row.overdue or 0
+    # Tarefas arquivadas estão concluídas: nunca atrasadas
+    for row in db.execute(
+        select(ArchivedTask.status, ArchivedTask.priority, func.count().label("count"))
+        .where(ArchivedTask.user_id == user_id)
+        .group_by(ArchivedTask.status, ArchivedTask.priority)
+    ):
+        status, priority = stat_key(row.status, row.priority)
+        stats["by_status"][status] += row.count
+        stats["by_priority"][priority] += row.count
+        stats["total"] += row.count
+    return _finish(stats)
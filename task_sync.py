@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskTombstone
+from app.crud.task_versions import get_tasks_version
+
+# Feed de alterações: tarefas criadas/alteradas (tasks.sync_version) e
+# excluídas (task_tombstones) depois de uma versão, lidas pelos índices
+# (user_id, sync_version, id) e (user_id, version). Uma versão nunca é
+# dividida entre páginas: operações em lote carimbam várias tarefas com a
+# mesma versão, e o cliente avança o cursor para a versão retornada.
+
+def _changed(user_id: int, since: int, upto: int):
+    return (
+        select(Task)
+        .where(Task.user_id == user_id, Task.sync_version > since, Task.sync_version <= upto)
+        .order_by(Task.sync_version, Task.id)
+    )
+
+def _deleted(user_id: int, since: int, upto: int):
+    return (
+        select(TaskTombstone.task_id, TaskTombstone.version)
+        .where(TaskTombstone.user_id == user_id, TaskTombstone.version > since, TaskTombstone.version <= upto)
+        .order_by(TaskTombstone.version, TaskTombstone.task_id)
+    )
+
+def get_changes(db: Session, user_id: int, since: int = 0, limit: int = 500) -> Tuple[List[Task], List[int], int, bool]:
+    """Retorna (tarefas alteradas, ids excluídos, versão alcançada, has_more).
+
+    Cada lista traz no máximo `limit` itens, exceto quando uma única versão
+    tem mais alterações que isso: ela é retornada inteira.
+    """
+    current, _ = get_tasks_version(db, user_id)
+    if since >= current:
+        return [], [], current, False
+
+    tasks = db.scalars(_changed(user_id, since, current).limit(limit + 1)).all()
+    deleted = db.execute(_deleted(user_id, since, current).limit(limit + 1)).all()
+
+    upto = current
+    if len(tasks) > limit:
+        upto = min(upto, tasks[limit].sync_version - 1)
+    if len(deleted) > limit:
+        upto = min(upto, deleted[limit].version - 1)
+
+    if upto <= since:
+        # A primeira versão pendente sozinha excede o limite
+        upto = since + 1
+        tasks = db.scalars(_changed(user_id, since, upto)).all()
+        deleted = db.execute(_deleted(user_id, since, upto)).all()
+    else:
+        tasks = [task for task in tasks if task.sync_version <= upto]
+        deleted = [row for row in deleted if row.version <= upto]
+
+    return tasks, [row.task_id for row in deleted], upto, upto < current
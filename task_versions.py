@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, Optional, Tuple
+from datetime import datetime
+
+from sqlalchemy import event, select, update, func
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskTombstone
+from app.models.user import User
+from app.events import record_task_changes
+from app.crud.task_stats import flush_deltas, apply_stat_deltas
+
+# Versão das tarefas de cada usuário: incrementada na mesma transação de
+# qualquer criação, alteração ou exclusão de tarefas. Usada como ETag e como
+# cursor do feed de alterações: cada tarefa guarda em `sync_version` a versão
+# da sua última alteração, e cada exclusão gera um TaskTombstone. O resumo de
+# estatísticas (task_stats) é atualizado no mesmo ponto.
+#
+# O incremento bloqueia a linha do usuário até o commit, então transações
+# concorrentes do mesmo usuário recebem versões na ordem em que são confirmadas.
+
+def bump_tasks_version(connection, user_ids: Iterable[int]) -> Dict[int, int]:
+    """Incrementa a versão das tarefas dos usuários informados.
+
+    Retorna a nova versão de cada usuário.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
+    users = User.__table__
+    rows = connection.execute(
+        update(users)
+        .where(users.c.id.in_(user_ids))
+        .values(
+            tasks_version=users.c.tasks_version + 1,
+            tasks_modified_at=func.now(),
+            # A versão das tarefas não é uma alteração do usuário
+            updated_at=users.c.updated_at,
+        )
+        .returning(users.c.id, users.c.tasks_version)
+    )
+    return {row.id: row.tasks_version for row in rows}
+
+def get_tasks_version(db: Session, user_id: int) -> Tuple[int, Optional[datetime]]:
+    """Retorna (versão, data da última alteração) das tarefas do usuário."""
+    row = db.execute(
+        select(User.tasks_version, User.tasks_modified_at).where(User.id == user_id)
+    ).first()
+    return (row.tasks_version, row.tasks_modified_at) if row else (0, None)
+
+async def get_tasks_version_async(db, user_id: int) -> Tuple[int, Optional[datetime]]:
+    """Variante assíncrona de get_tasks_version."""
+    row = (await db.execute(
+        select(User.tasks_version, User.tasks_modified_at).where(User.id == user_id)
+    )).first()
+    return (row.tasks_version, row.tasks_modified_at) if row else (0, None)
+
+@event.listens_for(Session, "before_flush")
+def _version_task_changes(session, flush_context, instances):
+    """Carimba a nova versão nas tarefas inseridas, alteradas ou excluídas pelo ORM
+    e atualiza o resumo de estatísticas."""
+    created = [obj for obj in session.new if isinstance(obj, Task)]
+    updated = [
+        obj for obj in session.dirty
+        if isinstance(obj, Task) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Task)]
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+
+    user_ids = {obj.user_id for obj in created + updated + deleted} - {None}
+    if not user_ids:
+        return
+    versions = bump_tasks_version(session.connection(), user_ids)
+    for obj in created + updated:
+        if obj.user_id in versions:
+            obj.sync_version = versions[obj.user_id]
+    for obj in updated:
+        if obj.user_id in versions:
+            record_task_changes(session, obj.user_id, versions[obj.user_id], updated=[obj.id])
+    for obj in deleted:
+        # Tarefas removidas junto com o usuário não precisam de registro
+        if obj.user_id in versions and obj.user_id not in deleted_users:
+            session.add(TaskTombstone(task_id=obj.id, user_id=obj.user_id, version=versions[obj.user_id]))
+            record_task_changes(session, obj.user_id, versions[obj.user_id], deleted=[obj.id])
+    for user_id, deltas in flush_deltas(created, updated, deleted).items():
+        if user_id in versions and user_id not in deleted_users:
+            apply_stat_deltas(session.connection(), user_id, deltas)
+    # Ids das tarefas novas só existem após o flush
+    session.info["_created_tasks"] = [obj for obj in created if obj.user_id in versions]
+
+@event.listens_for(Session, "after_flush")
+def _record_created_tasks(session, flush_context):
+    for obj in session.info.pop("_created_tasks", ()):
+        record_task_changes(session, obj.user_id, obj.sync_version, created=[obj.id])
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -6,7 +6,15 @@ from datetime import datetime
 from app.database import get_db
 from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
 from app.crud.task import get_tasks, get_task, create_task, update_task, delete_task
-from app.utils.deps import get_current_user
+from app.crud.pagination import get_tasks_page, InvalidCursorError
+from app.crud.task_search import search_tasks
+from app.crud.task_bulk import bulk_create_tasks, bulk_update_tasks, bulk_set_status, bulk_delete_tasks
+from app.schemas.bulk import BulkTaskCreate, BulkTaskUpdate, BulkTaskSelection, BulkStatusUpdate, BulkResponse
+from app.crud.task_versions import get_tasks_version
+from app.utils.http_cache import make_etag, list_scope, cache_headers, is_not_modified
+from app.utils.fast_json import FastJSONResponse, parse_fields, task_columns, task_rows, task_objects
+from app.utils.task_cache import task_list_cache
+from app.utils.deps import get_current_user, get_read_db
 from app.models.user import User
 
 router = APIRouter(prefix="/tasks", tags=["tarefas"])
@@ -22,17 +30,80 @@ def create_task_endpoint(
 
 @router.get("/", response_model=List[TaskResponse])
 def read_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     due_date_before: Optional[datetime] = None,
     order_by: str = "created_at",
     order_direction: str = "desc",
-    db: Session = Depends(get_db),
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Retorna todas as tarefas do usuário com filtros opcionais."""
+    """Retorna todas as tarefas do usuário com filtros opcionais.
+
+    Sem `skip`, a listagem é paginada por keyset: o cabeçalho `X-Next-Cursor`
+    traz o cursor da próxima página, que deve ser enviado no parâmetro `cursor`.
+    Responde 304 quando o `If-None-Match` corresponde ao ETag atual.
+    Com TASK_CACHE habilitado, a página é servida do cache enquanto a
+    versão das tarefas do usuário não muda. Com `include_archived=true`, a
+    listagem inclui as tarefas arquivadas (apenas na paginação por keyset).
+    `fields` (ex.: `id,title,status`) limita as colunas consultadas e retornadas.
+    """
+    if include_archived and skip:
+        raise HTTPException(status_code=400, detail="include_archived não é suportado com skip; use cursor")
+    try:
+        selected = parse_fields(fields)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    version, modified_at = get_tasks_version(db, current_user.id)
+    etag = make_etag(current_user.id, version, list_scope(request))
+    headers = cache_headers(etag, modified_at)
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    params = {
+        "skip": skip, "limit": limit, "cursor": cursor, "status": status, "priority": priority,
+        "due_date_before": due_date_before, "order_by": order_by, "order_direction": order_direction,
+        "include_archived": include_archived or None, "fields": ",".join(selected) if fields else None,
+    }
+    cached = task_list_cache.get(current_user.id, version, params)
+    if cached is not None:
+        body, next_cursor = cached
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(body, media_type="application/json", headers=headers)
+
+    if cursor or not skip:
+        try:
+            rows, next_cursor = get_tasks_page(
+                db=db,
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit,
+                status=status,
+                priority=priority,
+                due_date_before=due_date_before,
+                order_by=order_by,
+                order_direction=order_direction,
+                columns=task_columns(selected),
+                include_archived=include_archived
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        # Caminho rápido: colunas como tuplas, sem validação pelo response_model
+        page = FastJSONResponse(task_rows(rows, selected), headers=headers)
+        task_list_cache.set(current_user.id, version, params, page.body, next_cursor)
+        return page
+
     tasks = get_tasks(
         db=db, 
         user_id=current_user.id, 
@@ -44,15 +115,114 @@ def read_tasks(
         order_by=order_by,
         order_direction=order_direction
     )
+    if not task_list_cache.enabled and not fields:
+        return tasks
+    page = FastJSONResponse(task_objects(tasks, selected), headers=headers)
+    task_list_cache.set(current_user.id, version, params, page.body)
+    return page
+
+@router.get("/search", response_model=List[TaskResponse])
+def search_tasks_endpoint(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_date_before: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Busca tarefas do usuário por título e descrição, ordenadas por relevância.
+
+    Aceita os mesmos filtros de GET /tasks; a próxima página vem no cabeçalho
+    `X-Next-Cursor`.
+    """
+    try:
+        tasks, next_cursor = search_tasks(
+            db=db,
+            user_id=current_user.id,
+            q=q,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            priority=priority,
+            due_date_before=due_date_before
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tasks
 
+def _bulk_response(results):
+    return BulkResponse(affected=sum(1 for result in results if result.ok), results=results)
+
+def _require_selection(selection: BulkTaskSelection):
+    if selection.ids is None and selection.filter is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ids ou filter"
+        )
+
+@router.post("/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_endpoint(
+    payload: BulkTaskCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cria várias tarefas em uma única transação."""
+    return _bulk_response(bulk_create_tasks(db=db, tasks=payload.tasks, user_id=current_user.id))
+
+@router.post("/bulk/update", response_model=BulkResponse)
+def bulk_update_endpoint(
+    payload: BulkTaskUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Atualiza várias tarefas em uma única transação."""
+    return _bulk_response(bulk_update_tasks(db=db, items=payload.items, user_id=current_user.id))
+
+@router.post("/bulk/status", response_model=BulkResponse)
+def bulk_status_endpoint(
+    payload: BulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Altera o status das tarefas selecionadas por ids e/ou filtro (ex.: marcar todas como concluídas)."""
+    _require_selection(payload)
+    return _bulk_response(bulk_set_status(
+        db=db, user_id=current_user.id, status=payload.status, ids=payload.ids, task_filter=payload.filter
+    ))
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+def bulk_delete_endpoint(
+    payload: BulkTaskSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Exclui as tarefas selecionadas por ids e/ou filtro."""
+    _require_selection(payload)
+    return _bulk_response(bulk_delete_tasks(
+        db=db, user_id=current_user.id, ids=payload.ids, task_filter=payload.filter
+    ))
+
 @router.get("/{task_id}", response_model=TaskResponse)
 def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Retorna uma tarefa específica do usuário."""
+    version, modified_at = get_tasks_version(db, current_user.id)
+    etag = make_etag(current_user.id, version, f"task/{task_id}")
+    headers = cache_headers(etag, modified_at)
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
     task = get_task(db=db, task_id=task_id, user_id=current_user.id)
     if task is None:
         raise HTTPException(
@@ -1,41 +1,53 @@
+import os
+import time
 import unittest
 import requests
 import json
 from datetime import datetime, timedelta
 
 BASE_URL = "http://localhost:8000"
+# Mesmo valor de INTERNAL_TOKEN do servidor (endpoints /metrics e /internal/*)
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
 
 class TestTaskManagerAPI(unittest.TestCase):
-    def setUp(self):
-        # Dados para teste
-        self.test_user = {
-            "name": "Usuário Teste",
-            "email": "teste@example.com",
-            "password": "senha123"
-        }
-        self.test_task = {
-            "title": "Tarefa de Teste",
-            "description": "Descrição da tarefa de teste",
-            "due_date": (datetime.now() + timedelta(days=1)).isoformat(),
-            "priority": "media",
-            "status": "pendente"
-        }
-        self.token = None
-        
-        # Tentar registrar o usuário (pode falhar se já existir)
+    # Dados para teste
+    test_user = {
+        "name": "Usuário Teste",
+        "email": "teste@example.com",
+        "password": "senha123"
+    }
+    token = None
+    
+    @classmethod
+    def setUpClass(cls):
+        # Registro e login uma única vez: com o limite de requisições habilitado,
+        # um login por teste esgotaria a regra de /login (e o test_17 a esgota de propósito)
         try:
-            requests.post(f"{BASE_URL}/register", json=self.test_user)
+            requests.post(f"{BASE_URL}/register", json=cls.test_user)
         except:
             pass
         
         # Fazer login para obter o token
         login_data = {
-            "username": self.test_user["email"],
-            "password": self.test_user["password"]
+            "username": cls.test_user["email"],
+            "password": cls.test_user["password"]
         }
         response = requests.post(f"{BASE_URL}/login", data=login_data)
+        if response.status_code == 429:
+            # Regra de /login esgotada por uma execução anterior: aguarda a janela
+            time.sleep(int(response.headers.get("Retry-After", "1")))
+            response = requests.post(f"{BASE_URL}/login", data=login_data)
         if response.status_code == 200:
-            self.token = response.json()["access_token"]
+            cls.token = response.json()["access_token"]
+    
+    def setUp(self):
+        self.test_task = {
+            "title": "Tarefa de Teste",
+            "description": "Descrição da tarefa de teste",
+            "due_date": (datetime.now() + timedelta(days=1)).isoformat(),
+            "priority": "media",
+            "status": "pendente"
+        }
     
     def test_01_register_user(self):
         """Teste de registro de usuário"""
@@ -141,5 +153,336 @@ class TestTaskManagerAPI(unittest.TestCase):
         response = requests.get(f"{BASE_URL}/tasks/{self.task_id}", headers=headers)
         self.assertEqual(response.status_code, 404)
 
+    def test_08_cursor_pagination(self):
+        """Teste de paginação por cursor"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        for i in range(3):
+            task = dict(self.test_task, title=f"Tarefa Paginada {i}")
+            requests.post(f"{BASE_URL}/tasks", json=task, headers=headers)
+        
+        response = requests.get(f"{BASE_URL}/tasks?limit=2", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        next_cursor = response.headers.get("X-Next-Cursor")
+        self.assertIsNotNone(next_cursor)
+        
+        first_ids = {task["id"] for task in response.json()}
+        response = requests.get(f"{BASE_URL}/tasks?limit=2&cursor={next_cursor}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(first_ids.isdisjoint({task["id"] for task in response.json()}))
+        
+        # Cursor de outra ordenação deve ser rejeitado
+        response = requests.get(f"{BASE_URL}/tasks?order_by=due_date&cursor={next_cursor}", headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_09_bulk_operations(self):
+        """Teste das operações em lote"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        tasks = [dict(self.test_task, title=f"Tarefa em Lote {i}") for i in range(3)]
+        response = requests.post(f"{BASE_URL}/tasks/bulk", json={"tasks": tasks}, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["affected"], 3)
+        ids = [result["id"] for result in response.json()["results"]]
+        
+        response = requests.post(
+            f"{BASE_URL}/tasks/bulk/status",
+            json={"ids": ids + [999999999], "status": "concluida"},
+            headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["affected"], 3)
+        self.assertFalse(response.json()["results"][-1]["ok"])
+        self.assertTrue(all(r["task"]["status"] == "concluida" for r in response.json()["results"][:3]))
+        
+        response = requests.post(f"{BASE_URL}/tasks/bulk/delete", json={"ids": ids}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["affected"], 3)
+        
+        # Sem ids nem filtro a operação é recusada
+        response = requests.post(f"{BASE_URL}/tasks/bulk/delete", json={}, headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_10_export_tasks(self):
+        """Teste de exportação de tarefas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers)
+        
+        response = requests.get(f"{BASE_URL}/tasks/export?format=ndjson&status=pendente", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertTrue(lines)
+        self.assertTrue(all(task["status"] == "pendente" for task in lines))
+        
+        response = requests.get(f"{BASE_URL}/tasks/export?format=csv", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.text.startswith("id,title,description"))
+        
+        response = requests.get(f"{BASE_URL}/tasks/export?format=xml", headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_11_conditional_get(self):
+        """Teste de ETag e If-None-Match"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        response = requests.get(f"{BASE_URL}/tasks", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get("ETag")
+        self.assertIsNotNone(etag)
+        
+        response = requests.get(f"{BASE_URL}/tasks", headers={**headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        
+        # Qualquer alteração nas tarefas invalida o ETag
+        requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers)
+        response = requests.get(f"{BASE_URL}/tasks", headers={**headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers.get("ETag"), etag)
+
+    def test_12_task_changes(self):
+        """Teste do feed de alterações"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        response = requests.get(f"{BASE_URL}/tasks/changes", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        version = response.json()["version"]
+        
+        created = requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers).json()
+        removed = requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers).json()
+        requests.put(f"{BASE_URL}/tasks/{created['id']}", json={"status": "em_andamento"}, headers=headers)
+        requests.delete(f"{BASE_URL}/tasks/{removed['id']}", headers=headers)
+        
+        response = requests.get(f"{BASE_URL}/tasks/changes?since={version}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([task["id"] for task in data["changes"]], [created["id"]])
+        self.assertEqual(data["changes"][0]["status"], "em_andamento")
+        self.assertEqual(data["deleted"], [removed["id"]])
+        self.assertFalse(data["has_more"])
+        
+        # Sem alterações desde a última versão
+        response = requests.get(f"{BASE_URL}/tasks/changes?since={data['version']}", headers=headers)
+        self.assertEqual(response.json()["changes"], [])
+        self.assertEqual(response.json()["deleted"], [])
+
+    def test_13_task_stats(self):
+        """Teste das estatísticas de tarefas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        before = requests.get(f"{BASE_URL}/tasks/stats", headers=headers).json()
+        
+        overdue = dict(self.test_task, due_date=(datetime.now() - timedelta(days=1)).isoformat())
+        created = requests.post(f"{BASE_URL}/tasks", json=overdue, headers=headers).json()
+        requests.put(f"{BASE_URL}/tasks/{created['id']}", json={"priority": "alta"}, headers=headers)
+        
+        response = requests.get(f"{BASE_URL}/tasks/stats", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        self.assertEqual(stats["total"], before["total"] + 1)
+        self.assertEqual(stats["by_priority"]["alta"], before["by_priority"]["alta"] + 1)
+        self.assertEqual(stats["overdue"], before["overdue"] + 1)
+        
+        # O resumo incremental coincide com o cálculo direto
+        exact = requests.get(f"{BASE_URL}/tasks/stats?exact=true", headers=headers).json()
+        self.assertEqual(exact, stats)
+
+    def test_14_search_tasks(self):
+        """Teste de busca de tarefas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        in_title = dict(self.test_task, title="Relatório trimestral", description="Enviar ao financeiro")
+        in_description = dict(self.test_task, title="Reunião", description="Revisar o relatório trimestral")
+        first = requests.post(f"{BASE_URL}/tasks", json=in_title, headers=headers).json()
+        second = requests.post(f"{BASE_URL}/tasks", json=in_description, headers=headers).json()
+        
+        response = requests.get(f"{BASE_URL}/tasks/search?q=relatório trimestral", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        ids = [task["id"] for task in response.json()]
+        # Ocorrência no título tem relevância maior
+        self.assertLess(ids.index(first["id"]), ids.index(second["id"]))
+        
+        response = requests.get(f"{BASE_URL}/tasks/search?q=relatório&limit=1", headers=headers)
+        self.assertEqual(len(response.json()), 1)
+        cursor = response.headers.get("X-Next-Cursor")
+        self.assertIsNotNone(cursor)
+        response = requests.get(f"{BASE_URL}/tasks/search?q=relatório&limit=1&cursor={cursor}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        
+        response = requests.get(f"{BASE_URL}/tasks/search?q=outra&cursor={cursor}", headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_15_metrics(self):
+        """Teste do endpoint de métricas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        requests.get(f"{BASE_URL}/tasks", headers=headers)
+        
+        # Sem o token interno (ou com o token de um usuário), as métricas não são expostas
+        self.assertIn(requests.get(f"{BASE_URL}/metrics").status_code, (401, 404))
+        self.assertIn(requests.get(f"{BASE_URL}/metrics", headers=headers).status_code, (401, 404))
+        if not INTERNAL_TOKEN:
+            self.skipTest("INTERNAL_TOKEN não definido")
+        
+        response = requests.get(f"{BASE_URL}/metrics", headers={"Authorization": f"Bearer {INTERNAL_TOKEN}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/plain", response.headers["Content-Type"])
+        # Rótulo com o template da rota, não o caminho com o id
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/tasks/",status="200"}', response.text)
+        self.assertIn('http_request_sql_queries_bucket{method="GET",route="/tasks/"', response.text)
+        self.assertIn("db_queries_total", response.text)
+
+    def test_16_task_list_cache(self):
+        """Teste de consistência das listagens repetidas após uma escrita"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        task = requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers).json()
+        
+        first = requests.get(f"{BASE_URL}/tasks/?limit=50", headers=headers)
+        second = requests.get(f"{BASE_URL}/tasks/?limit=50", headers=headers)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        
+        # A escrita muda a versão: a listagem seguinte não pode vir da página anterior
+        requests.put(f"{BASE_URL}/tasks/{task['id']}", json={"title": "Título alterado"}, headers=headers)
+        response = requests.get(f"{BASE_URL}/tasks/?limit=50", headers=headers)
+        titles = {item["id"]: item["title"] for item in response.json()}
+        self.assertEqual(titles[task["id"]], "Título alterado")
+
+    def test_17_rate_limit(self):
+        """Teste do limite de requisições no login (requer RATE_LIMIT habilitado)"""
+        login_data = {"username": self.test_user["email"], "password": "senha-incorreta"}
+        response = requests.post(f"{BASE_URL}/login", data=login_data)
+        if "X-RateLimit-Limit" not in response.headers:
+            self.skipTest("Limite de requisições desabilitado")
+        
+        for _ in range(int(response.headers["X-RateLimit-Limit"]) + 1):
+            response = requests.post(f"{BASE_URL}/login", data=login_data)
+            if response.status_code == 429:
+                break
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+
+    def test_18_order_by_urgency(self):
+        """Teste de ordenação por urgência com paginação por cursor"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        tomorrow = (datetime.now() + timedelta(days=1)).isoformat()
+        created = []
+        for priority, status, due_date in [
+            ("baixa", "concluida", tomorrow),
+            ("media", "pendente", None),
+            ("baixa", "pendente", tomorrow),
+            ("alta", "pendente", tomorrow),
+        ]:
+            task = dict(self.test_task, priority=priority, status=status, due_date=due_date)
+            created.append(requests.post(f"{BASE_URL}/tasks", json=task, headers=headers).json()["id"])
+        
+        def all_ids():
+            ids = []
+            url = f"{BASE_URL}/tasks/?order_by=urgency&order_direction=desc&limit=20"
+            cursor = None
+            while True:
+                response = requests.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+                self.assertEqual(response.status_code, 200)
+                ids.extend(task["id"] for task in response.json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    return ids
+        
+        ids = all_ids()
+        positions = [ids.index(task_id) for task_id in reversed(created)]
+        self.assertEqual(positions, sorted(positions))
+        
+        # Concluir a tarefa mais urgente a move para depois das tarefas em aberto
+        requests.put(f"{BASE_URL}/tasks/{created[-1]}", json={"status": "concluida"}, headers=headers)
+        ids = all_ids()
+        self.assertLess(ids.index(created[2]), ids.index(created[-1]))
+
+    def test_19_include_archived(self):
+        """Teste da listagem com tarefas arquivadas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        active = requests.get(f"{BASE_URL}/tasks/?limit=500", headers=headers)
+        response = requests.get(f"{BASE_URL}/tasks/?limit=500&include_archived=true", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        # Sem arquivamento recente, as tarefas ativas estão todas na listagem completa
+        archived_ids = {task["id"] for task in response.json()}
+        self.assertTrue({task["id"] for task in active.json()} <= archived_ids)
+        
+        # Arquivadas só aparecem na paginação por keyset
+        response = requests.get(f"{BASE_URL}/tasks/?skip=10&include_archived=true", headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_20_fields_and_compression(self):
+        """Teste da projeção de campos e da compressão das listagens"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        requests.post(f"{BASE_URL}/tasks", json=self.test_task, headers=headers)
+        response = requests.get(f"{BASE_URL}/tasks/?fields=title,status", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        for task in response.json():
+            self.assertEqual(set(task), {"id", "title", "status"})
+        
+        response = requests.get(f"{BASE_URL}/tasks/?fields=title,senha", headers=headers)
+        self.assertEqual(response.status_code, 400)
+        
+        # O requests envia Accept-Encoding (gzip, e br com o pacote brotli) e descomprime a resposta
+        response = requests.get(f"{BASE_URL}/tasks/?limit=500", headers=headers)
+        self.assertIn("Accept-Encoding", response.headers.get("Vary", ""))
+        if len(response.content) >= 1024:
+            self.assertIn(response.headers.get("Content-Encoding"), ("gzip", "br"))
+
+    def test_21_search_tied_ranks(self):
+        """Teste da paginação da busca com relevâncias empatadas"""
+        if not self.token:
+            self.skipTest("Token não disponível")
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        # Tarefas idênticas têm a mesma relevância; o desempate é pelo id
+        term = f"empate{int(datetime.now().timestamp())}"
+        tied = dict(self.test_task, title=f"Orçamento {term}", description="Conferir valores")
+        created = {requests.post(f"{BASE_URL}/tasks", json=tied, headers=headers).json()["id"] for _ in range(5)}
+        
+        ids = []
+        cursor = None
+        for _ in range(len(created) + 1):
+            url = f"{BASE_URL}/tasks/search?q={term}&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            response = requests.get(url, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(task["id"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertIsNone(cursor)
+        # Cada tarefa aparece exatamente uma vez, em ordem decrescente de id
+        self.assertEqual(ids, sorted(created, reverse=True))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+# Dois bancos SQLite temporários (primário e réplica), definidos antes de importar a aplicação.
+# Não há replicação entre eles: cada teste grava nos dois o que a réplica deve conter.
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'primary.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{os.path.join(_db_dir, 'replica.db')}"
+os.environ["READ_STICKY_BACKEND"] = "memory"
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, engine, replica_router
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+from app.utils.auth import create_access_token
+from app.utils.user_cache import token_cache
+from app import migrations
+
+replica = replica_router.replicas[0]
+
+def _seed(session_factory, email, title):
+    with session_factory() as db:
+        db.query(Task).delete()
+        db.query(User).delete()
+        user = User(id=1, name="Usuário", email=email, hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(Task(id=1, title=title, user_id=user.id))
+        db.commit()
+
+class TestReadRouting(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Sem verificações periódicas durante os testes: a saúde é definida por cada teste
+        replica_router.interval = 3600
+        migrations.upgrade(bind=engine)
+        migrations.upgrade(bind=replica.engine)
+
+    def setUp(self):
+        self.email = f"leitor_{self.id().rsplit('.', 1)[-1]}@example.com"
+        _seed(SessionLocal, self.email, "Primário")
+        _seed(replica.SessionLocal, self.email, "Réplica")
+        replica.healthy = True
+        token_cache.clear()
+        self.headers = {"Authorization": f"Bearer {create_access_token(data={'sub': self.email})}"}
+
+    def titles(self, client):
+        response = client.get("/tasks/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return [task["title"] for task in response.json()]
+
+    def test_reads_use_replica(self):
+        with TestClient(app) as client:
+            self.assertEqual(self.titles(client), ["Réplica"])
+            response = client.get("/tasks/1", headers=self.headers)
+            self.assertEqual(response.json()["title"], "Réplica")
+
+    def test_reads_after_own_write_use_primary(self):
+        with TestClient(app) as client:
+            response = client.put("/tasks/1", json={"title": "Alterada"}, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            # A réplica ainda não recebeu a alteração; a leitura seguinte vai ao primário
+            self.assertEqual(self.titles(client), ["Alterada"])
+
+    def test_unhealthy_replica_falls_back_to_primary(self):
+        replica.healthy = False
+        with TestClient(app) as client:
+            self.assertEqual(self.titles(client), ["Primário"])
+
+    def test_user_missing_on_replica_is_found_on_primary(self):
+        with replica.SessionLocal() as db:
+            db.query(Task).delete()
+            db.query(User).delete()
+            db.commit()
+        with TestClient(app) as client:
+            response = client.get("/tasks/", headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), [])
+
+if __name__ == "__main__":
+    unittest.main()
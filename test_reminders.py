@@ -0,0 +1,168 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Banco SQLite temporário e broker em memória, definidos antes de importar a aplicação
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test_reminders.db')}"
+
+from app.celery_app import celery_app
+from app.database import SessionLocal, engine
+from app.models.task import Task, StatusEnum
+from app.models.user import User
+from app import migrations, reminders
+from app.notifications import Mailer, MemoryTransport, set_mailer
+
+celery_app.conf.update(
+    broker_url="memory://",
+    result_backend="cache+memory://",
+    task_always_eager=True,
+    task_eager_propagates=True,
+)
+
+class TestReminderPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        migrations.upgrade(bind=engine)
+
+    def setUp(self):
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            db.query(Task).delete()
+            db.query(User).delete()
+            users = [
+                User(name=f"Usuário {i}", email=f"usuario{i}@example.com", hashed_password="x")
+                for i in range(3)
+            ]
+            db.add_all(users)
+            db.flush()
+            for user in users:
+                db.add_all([
+                    Task(title="Vence em breve", due_date=now + timedelta(hours=2), user_id=user.id),
+                    Task(title="Vence amanhã à noite", due_date=now + timedelta(hours=23), user_id=user.id),
+                    Task(title="Vence na próxima semana", due_date=now + timedelta(days=7), user_id=user.id),
+                    Task(title="Concluída", due_date=now + timedelta(hours=3), user_id=user.id,
+                         status=StatusEnum.concluida),
+                    Task(title="Sem prazo", user_id=user.id),
+                ])
+            db.commit()
+            self.user_ids = [user.id for user in users]
+            self.emails = [user.email for user in users]
+
+        self.transport = MemoryTransport()
+        set_mailer(Mailer(self.transport, rate=0))
+
+    def recipients(self):
+        return [message.to_email for message in self.transport.messages]
+
+    def test_sends_one_digest_per_user(self):
+        reminders.dispatch_reminders.delay()
+        # Duas tarefas por usuário na janela de 24h, agrupadas em um único e-mail
+        self.assertEqual(sorted(self.recipients()), sorted(self.emails))
+        for message in self.transport.messages:
+            self.assertIn("2 tarefas", message.subject)
+            self.assertIn("Vence em breve", message.html_content)
+            self.assertIn("Vence amanhã à noite", message.html_content)
+            self.assertNotIn("Concluída", message.html_content)
+
+    def test_rerun_is_idempotent(self):
+        reminders.dispatch_reminders.delay()
+        reminders.dispatch_reminders.delay()
+        self.assertEqual(len(self.transport.messages), 3)
+
+    def test_small_shards_and_batches_keep_digests_whole(self):
+        original = reminders.REMINDER_BATCH_SIZE
+        reminders.REMINDER_BATCH_SIZE = 3
+        try:
+            ranges = reminders.shard_ranges(self.user_ids[0], self.user_ids[-1], users_per_shard=2)
+            self.assertEqual(len(ranges), 2)
+            start = datetime.now(timezone.utc)
+            end = start + timedelta(hours=24)
+            results = [
+                reminders.process_reminder_shard.delay(low, high, start.isoformat(), end.isoformat()).get()
+                for low, high in ranges
+            ]
+        finally:
+            reminders.REMINDER_BATCH_SIZE = original
+        self.assertEqual(sum(result["reminders"] for result in results), 6)
+        self.assertEqual(sum(result["emails"] for result in results), 3)
+        self.assertEqual(sorted(self.recipients()), sorted(self.emails))
+
+    def test_failed_send_is_retried_next_run(self):
+        set_mailer(Mailer(MemoryTransport(fail_for={self.emails[0]}), rate=0))
+        reminders.dispatch_reminders.delay()
+
+        set_mailer(Mailer(self.transport, rate=0))
+        reminders.dispatch_reminders.delay()
+        self.assertEqual(self.recipients(), [self.emails[0]])
+
+    def test_unexpected_error_only_affects_its_digest(self):
+        failing_email = self.emails[1]
+
+        class BrokenTransport(MemoryTransport):
+            def send(self, message):
+                if message.to_email == failing_email:
+                    raise UnicodeEncodeError("ascii", "ç", 0, 1, "falha simulada")
+                super().send(message)
+
+        broken = BrokenTransport()
+        set_mailer(Mailer(broken, rate=0))
+        reminders.dispatch_reminders.delay()
+        self.assertEqual(len(broken.messages), 2)
+
+        set_mailer(Mailer(self.transport, rate=0))
+        reminders.dispatch_reminders.delay()
+        self.assertEqual(self.recipients(), [failing_email])
+
+    def test_digest_escapes_user_content(self):
+        with SessionLocal() as db:
+            task = db.query(Task).filter(Task.title == "Vence em breve", Task.user_id == self.user_ids[0]).one()
+            task.title = '<b>Urgente</b> <a href="https://example.com">link</a>'
+            db.get(User, self.user_ids[0]).name = "<i>Ana</i>"
+            db.commit()
+
+        reminders.dispatch_reminders.delay()
+        content = next(message.html_content for message in self.transport.messages if message.to_email == self.emails[0])
+        self.assertIn("&lt;b&gt;Urgente&lt;/b&gt;", content)
+        self.assertIn("&lt;i&gt;Ana&lt;/i&gt;", content)
+        self.assertNotIn("<b>", content)
+        self.assertNotIn("<a href", content)
+
+    def test_new_due_date_resets_reminder(self):
+        reminders.dispatch_reminders.delay()
+        with SessionLocal() as db:
+            task = db.query(Task).filter(Task.title == "Vence em breve", Task.user_id == self.user_ids[0]).one()
+            self.assertIsNotNone(task.reminder_sent_at)
+            task.due_date = datetime.now(timezone.utc) + timedelta(hours=5)
+            db.commit()
+            db.refresh(task)
+            self.assertIsNone(task.reminder_sent_at)
+
+        reminders.dispatch_reminders.delay()
+        self.assertEqual(len(self.transport.messages), 4)
+        self.assertEqual(self.recipients()[-1], self.emails[0])
+
+class TestMailer(unittest.TestCase):
+    def test_retries_transient_errors_with_backoff(self):
+        from app.notifications import EmailMessage, TransientDeliveryError
+
+        class FlakyTransport(MemoryTransport):
+            def __init__(self):
+                super().__init__()
+                self.attempts = 0
+
+            def send(self, message):
+                self.attempts += 1
+                if self.attempts < 3:
+                    raise TransientDeliveryError("Indisponível")
+                super().send(message)
+
+        transport = FlakyTransport()
+        mailer = Mailer(transport, rate=0, max_retries=3, backoff=0)
+        mailer.send(EmailMessage("a@example.com", "Assunto", "<p>Olá</p>"))
+        self.assertEqual(len(transport.messages), 1)
+        self.assertEqual(mailer.stats(), {"sent": 1, "retries": 2, "failed": 0})
+
+if __name__ == "__main__":
+    unittest.main()
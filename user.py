@@ -11,3 +11,6 @@ class User(Base):
     hashed_password = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Incrementada a cada alteração nas tarefas do usuário (ETag de GET /tasks)
+    tasks_version = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_modified_at = Column(DateTime(timezone=True))
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.utils.auth import get_password_hash_async, verify_password_async
+
+# Variantes assíncronas das operações de crud/user.py
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Busca um usuário pelo email."""
+    result = await db.scalars(select(User).where(User.email == email))
+    return result.first()
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Busca um usuário pelo ID."""
+    return await db.get(User, user_id)
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """Cria um novo usuário."""
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = User(name=user.name, email=user.email, hashed_password=hashed_password)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Autentica um usuário."""
+    user = await get_user_by_email(db, email)
+    if user is None:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from app.models.user import User
+
+# Configuração do cache de autenticação
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+def _snapshot(user: User) -> User:
+    """Cópia desacoplada da sessão com os dados públicos do usuário."""
+    return User(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+class TokenCache:
+    """Cache LRU com TTL de tokens JWT já verificados e do usuário correspondente.
+
+    Cada entrada expira no que vier primeiro: o TTL configurado ou o `exp` do token.
+    """
+
+    def __init__(self, maxsize: int = AUTH_CACHE_MAXSIZE, ttl: float = AUTH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (expira_em, subject, usuário)
+        self._by_subject = {}  # subject -> tokens em cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remove(self, token):
+        _, subject, _ = self._entries.pop(token)
+        tokens = self._by_subject.get(subject)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_subject[subject]
+
+    def get(self, token: str) -> Optional[User]:
+        """Retorna o usuário do token em cache, ou None."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.time():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, token: str, subject: str, user: User, token_exp: Optional[float] = None):
+        """Armazena o usuário resolvido para um token já verificado."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, subject, _snapshot(user))
+            self._by_subject.setdefault(subject, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_token(self, token: str):
+        """Remove um token do cache (ex.: logout)."""
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+
+    def invalidate_subject(self, subject: str):
+        """Remove todos os tokens de um usuário (ex.: usuário alterado ou excluído)."""
+        with self._lock:
+            for token in list(self._by_subject.get(subject, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def stats(self) -> dict:
+        """Contadores de acerto/falha do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+token_cache = TokenCache()
+
+# Invalidação automática quando um usuário é alterado ou excluído
+@event.listens_for(User, "after_update")
+def _invalidate_updated_user(mapper, connection, target):
+    token_cache.invalidate_subject(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        token_cache.invalidate_subject(old_email)
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    token_cache.invalidate_subject(target.email)